@@ -0,0 +1,88 @@
+"""
+Compares how a WSGI and an ASGI deployment handle concurrent read requests.
+
+Start both deployments against the same database, e.g.:
+    gunicorn transaction_system.wsgi -w 1 --threads 8 -b 127.0.0.1:8001
+    uvicorn transaction_system.asgi:application --workers 1 --port 8002
+
+then run:
+    python -m benchmarks.asgi_concurrency --path /transactions/?page=2 \\
+        --target wsgi=http://127.0.0.1:8001 --target asgi=http://127.0.0.1:8002 --concurrency 1 16 64
+
+`asgi.py` enables `ASYNC_VIEWS`, so the ASGI deployment serves the list, detail and report endpoints with
+async views. The servers are not project dependencies, install them to run the comparison. Requests are sent
+from a thread per connection with keep-alive, the token is read from `API_AUTH_TOKEN`.
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+def run_client(base_url, path, count, token, latencies, failures):
+    url = urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - started)
+            if response.status != 200:
+                failures.append(response.status)
+    finally:
+        connection.close()
+
+
+def run(base_url, path, concurrency, requests, token):
+    latencies: list[float] = []
+    failures: list[int] = []
+    per_client = max(1, requests // concurrency)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(run_client, base_url, path, per_client, token, latencies, failures)
+            for _ in range(concurrency)
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+    return elapsed, latencies, failures
+
+
+def percentile(values, fraction):
+    return statistics.quantiles(values, n=100)[int(fraction * 100) - 1] if len(values) > 1 else values[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, help="label=base url, can be repeated.")
+    parser.add_argument("--path", default="/transactions/")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per target and concurrency level.")
+    args = parser.parse_args()
+
+    token = os.environ.get("API_AUTH_TOKEN", "")
+    targets = [target.split("=", 1) for target in args.target]
+
+    print(f"{'target':>8} {'clients':>8} {'req/sec':>10} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for concurrency in args.concurrency:
+        for label, base_url in targets:
+            # Warm up connections, caches and the server's thread pool before measuring.
+            run(base_url, args.path, concurrency, concurrency, token)
+            elapsed, latencies, failures = run(base_url, args.path, concurrency, args.requests, token)
+            print(
+                f"{label:>8} {concurrency:>8} {len(latencies) / elapsed:>10,.0f} "
+                f"{percentile(latencies, 0.5) * 1000:>8.1f} {percentile(latencies, 0.95) * 1000:>8.1f} "
+                f"{len(failures):>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import os
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from benchmarks.conftest import BENCH_UPLOAD_ROWS
+from benchmarks.parse_scaling import make_rows
+
+# Slowest acceptable upload throughput, the run fails below it.
+MIN_UPLOAD_ROWS_PER_SECOND = float(os.getenv("BENCH_MIN_UPLOAD_ROWS_PER_SECOND", "1000"))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("backend", ["batch", "copy"])
+def bench_upload_csv(bench, auth_client, make_csv_file, settings, backend):
+    if backend == "copy" and connection.vendor != "postgresql":
+        pytest.skip("COPY requires PostgreSQL")
+    settings.TRANSACTIONS_INGEST_BACKEND = backend
+    url = reverse("upload_transactions_csv")
+
+    def upload(file):
+        response = auth_client.post(url, {"file": file})
+        assert response.status_code == 201
+        assert response.json()["inserted"] == BENCH_UPLOAD_ROWS
+
+    result = bench.measure(
+        f"upload_csv[{backend}]",
+        upload,
+        repeat=5,
+        rows=BENCH_UPLOAD_ROWS,
+        setup=lambda: make_csv_file(make_rows(BENCH_UPLOAD_ROWS)),
+    )
+    assert result["rows_per_sec"] > MIN_UPLOAD_ROWS_PER_SECOND
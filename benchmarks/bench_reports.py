@@ -0,0 +1,36 @@
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+
+RANGES = {
+    "all": "",
+    "month": "?from=2025-06-01&to=2025-06-30",
+    "partial_days": "?from=2025-06-01T06:00:00&to=2025-06-30T18:00:00",
+}
+
+
+def clear_report_cache():
+    caches["reports"].clear()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("date_range", RANGES)
+class BenchReports:
+
+    def bench_customer_summary(self, bench, auth_client, dataset, date_range):
+        customer_id = dataset.values_list("customer_id", flat=True).first()
+        url = reverse("customer_summary", args=[customer_id]) + RANGES[date_range]
+
+        def get():
+            assert auth_client.get(url).status_code == 200
+
+        bench.measure(f"customer_summary[{date_range}]", get, setup=clear_report_cache)
+
+    def bench_product_summary(self, bench, auth_client, dataset, date_range):
+        product_id = dataset.values_list("product_id", flat=True).first()
+        url = reverse("product_summary", args=[product_id]) + RANGES[date_range]
+
+        def get():
+            assert auth_client.get(url).status_code == 200
+
+        bench.measure(f"product_summary[{date_range}]", get, setup=clear_report_cache)
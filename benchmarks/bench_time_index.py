@@ -0,0 +1,65 @@
+import io
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+
+from benchmarks.conftest import BENCH_UPLOAD_ROWS
+from benchmarks.parse_scaling import make_rows
+from transactions.indexes import time_range_indexes
+from transactions.ingest import ingest_rows
+from transactions.models import Transaction
+
+DAY = (datetime(2025, 7, 1, tzinfo=dt_timezone.utc), datetime(2025, 7, 2, tzinfo=dt_timezone.utc))
+
+pytestmark = pytest.mark.skipif(connection.vendor != "postgresql", reason="BRIN indexes require PostgreSQL")
+
+
+def index_bytes():
+    """
+    Returns the size of the time range indexes, summed over the partitions of the transaction table.
+    """
+    with connection.cursor() as cursor:
+        total = 0
+        for index in time_range_indexes(Transaction):
+            cursor.execute("SELECT coalesce(sum(pg_relation_size(relid)), 0) FROM pg_partition_tree(%s)", [index.name])
+            total += int(cursor.fetchone()[0])
+    return total
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("index_type", ["btree", "brin"])
+class BenchTimeIndex:
+    """
+    Compares B-tree and BRIN time range indexes. The indexes are rebuilt inside the benchmark's transaction,
+    which is rolled back afterwards.
+    """
+
+    @pytest.fixture(autouse=True)
+    def time_indexes(self, settings, dataset, index_type):
+        settings.TRANSACTIONS_TIME_INDEX_TYPE = index_type
+        call_command("rebuild_time_indexes", stdout=io.StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Transaction._meta.db_table}")
+
+    def bench_copy_ingest(self, bench, index_type):
+        def load(rows):
+            assert ingest_rows(rows, backend="copy").inserted == BENCH_UPLOAD_ROWS
+
+        result = bench.measure(
+            f"time_index_ingest[{index_type}]",
+            load,
+            repeat=5,
+            rows=BENCH_UPLOAD_ROWS,
+            setup=lambda: list(make_rows(BENCH_UPLOAD_ROWS)),
+        )
+        result["index_bytes"] = index_bytes()
+
+    def bench_day_range_sum(self, bench, index_type):
+        queryset = Transaction.objects.filter(timestamp__gte=DAY[0], timestamp__lt=DAY[1])
+
+        result = bench.measure(f"time_index_day_range[{index_type}]", lambda: queryset.aggregate(Sum("amount")))
+        result["index_bytes"] = index_bytes()
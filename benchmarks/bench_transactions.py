@@ -0,0 +1,56 @@
+import random
+
+import pytest
+from django.urls import reverse
+
+from transactions.cache import detail_cache
+from transactions.pagination import NEXT, encode_cursor
+
+
+def get_ok(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.django_db
+class BenchTransactionList:
+
+    def bench_first_page(self, bench, auth_client, dataset):
+        url = reverse("transactions_list")
+        bench.measure("list[first_page]", lambda: get_ok(auth_client, url), rows=50)
+
+    def bench_deep_page(self, bench, auth_client, dataset):
+        url = reverse("transactions_list") + f"?page={dataset.count() // 50 // 2}"
+        bench.measure("list[deep_page]", lambda: get_ok(auth_client, url), rows=50)
+
+    def bench_deep_cursor(self, bench, auth_client, dataset):
+        middle = dataset[dataset.count() // 2]
+        url = reverse("transactions_list") + f"?cursor={encode_cursor(middle, NEXT)}"
+        bench.measure("list[deep_cursor]", lambda: get_ok(auth_client, url), rows=50)
+
+    def bench_filtered_page(self, bench, auth_client, dataset):
+        customer_id = dataset.values_list("customer_id", flat=True).first()
+        url = reverse("transactions_list") + f"?customer_id={customer_id}&from=2025-06-01"
+        bench.measure("list[customer_filter]", lambda: get_ok(auth_client, url), rows=50)
+
+
+@pytest.mark.django_db
+class BenchTransactionDetail:
+
+    def ids(self, dataset):
+        ids = list(dataset.values_list("transaction_id", flat=True)[:1000])
+        return random.Random(0).choices(ids, k=1000)
+
+    def bench_detail_uncached(self, bench, auth_client, dataset):
+        urls = iter(reverse("transaction_detail", args=[transaction_id]) for transaction_id in self.ids(dataset))
+
+        def setup():
+            detail_cache.clear()
+            return next(urls)
+
+        bench.measure("detail[uncached]", lambda url: get_ok(auth_client, url), rows=1, setup=setup)
+
+    def bench_detail_cached(self, bench, auth_client, dataset):
+        url = reverse("transaction_detail", args=[self.ids(dataset)[0]])
+        bench.measure("detail[cached]", lambda: get_ok(auth_client, url), rows=1)
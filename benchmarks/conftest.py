@@ -0,0 +1,189 @@
+"""
+Pytest setup for the benchmark suite.
+
+Run with:
+    pytest benchmarks -s
+
+Benchmarks live in `bench_*.py` files, which the default test run does not collect. Dataset sizes and the
+output file are configured with environment variables:
+    BENCH_ROWS (20000): transactions loaded before the read benchmarks.
+    BENCH_UPLOAD_ROWS (5000): rows in each uploaded CSV file.
+    BENCH_REPEAT (30): timed calls per read benchmark.
+    BENCH_OUTPUT (benchmarks/results.json): where the results are written.
+    BENCH_MIN_UPLOAD_ROWS_PER_SECOND (1000): upload throughput below which the upload benchmarks fail.
+"""
+
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+BENCH_ROWS = int(os.getenv("BENCH_ROWS", "20000"))
+BENCH_UPLOAD_ROWS = int(os.getenv("BENCH_UPLOAD_ROWS", "5000"))
+BENCH_REPEAT = int(os.getenv("BENCH_REPEAT", "30"))
+BENCH_OUTPUT = Path(os.getenv("BENCH_OUTPUT", Path(__file__).parent / "results.json"))
+
+
+def pytest_configure(config):
+    # The generated rows have naive timestamps, like the sample CSV files.
+    config.addinivalue_line("filterwarnings", "ignore:DateTimeField .* received a naive datetime:RuntimeWarning")
+
+
+class BenchCollector:
+    """
+    Collects `Bench*` classes and `bench_*` functions instead of the `python_classes`/`python_functions`
+    patterns from pytest.ini, which stay the defaults for the tests.
+    """
+
+    def classnamefilter(self, name):
+        return name.startswith("Bench")
+
+    def funcnamefilter(self, name):
+        return name.startswith("bench_")
+
+
+class BenchModule(BenchCollector, pytest.Module):
+    pass
+
+
+class BenchClass(BenchCollector, pytest.Class):
+    pass
+
+
+def pytest_collect_file(file_path, parent):
+    if file_path.suffix == ".py" and file_path.name.startswith("bench_"):
+        return BenchModule.from_parent(parent, path=file_path)
+    return None
+
+
+def pytest_pycollect_makeitem(collector, name, obj):
+    if isinstance(collector, BenchModule) and inspect.isclass(obj) and collector.istestclass(obj, name):
+        return BenchClass.from_parent(collector, name=name, obj=obj)
+    return None
+
+
+def percentile(values, fraction):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(fraction * 100) - 1]
+
+
+class BenchmarkRecorder:
+    """
+    Times benchmark calls and collects the results of the session.
+    """
+
+    def __init__(self):
+        self.results = {}
+
+    def measure(self, name, func, repeat=BENCH_REPEAT, rows=None, setup=None):
+        """
+        Calls `func` `repeat` times and records its latency, throughput and query count.
+
+        Args:
+            name: Result name, unique in the suite.
+            func: Callable to time, gets the value returned by `setup` unless it is None.
+            repeat: Number of timed calls, one untimed warm-up call comes first. Queries are counted on the
+                first timed call.
+            rows: Rows processed by one call, used to report rows/sec.
+            setup: Untimed callable run before every call, e.g. to build an upload or clear caches.
+        """
+
+        def call():
+            value = setup() if setup else None
+            args = () if value is None else (value,)
+            started = time.perf_counter()
+            func(*args)
+            return time.perf_counter() - started
+
+        call()
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            timings = [call()]
+        # `captured_queries` reads the connection's log lazily, count them before the next request resets it.
+        query_count = len(queries)
+        timings += [call() for _ in range(repeat - 1)]
+
+        result = {
+            "calls": repeat,
+            "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+            "p50_ms": round(percentile(timings, 0.5) * 1000, 3),
+            "p95_ms": round(percentile(timings, 0.95) * 1000, 3),
+            "queries": query_count,
+        }
+        if rows:
+            result["rows_per_call"] = rows
+            result["rows_per_sec"] = round(rows / statistics.fmean(timings), 1)
+        self.results[name] = result
+        return result
+
+    def write(self, path):
+        try:
+            commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+        except OSError:
+            commit = None
+        data = {
+            "meta": {
+                "commit": commit or None,
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "rows": BENCH_ROWS,
+                "upload_rows": BENCH_UPLOAD_ROWS,
+                "repeat": BENCH_REPEAT,
+            },
+            "results": dict(sorted(self.results.items())),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+recorder = BenchmarkRecorder()
+
+
+@pytest.fixture(scope="session")
+def bench():
+    return recorder
+
+
+@pytest.fixture(scope="session")
+def dataset(django_db_setup, django_db_blocker):
+    """
+    Loads `BENCH_ROWS` transactions once per session, they stay in the test database for every benchmark.
+    """
+    from benchmarks.parse_scaling import make_rows
+    from transactions.ingest import ingest_rows
+    from transactions.models import Transaction
+
+    with django_db_blocker.unblock():
+        if Transaction.objects.count() < BENCH_ROWS:
+            backend = "copy" if connection.vendor == "postgresql" else "batch"
+            ingest_rows(make_rows(BENCH_ROWS), backend=backend)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Transaction._meta.db_table}")
+        yield Transaction.objects.order_by("timestamp", "transaction_id")
+
+
+def pytest_sessionfinish(session):
+    if recorder.results:
+        recorder.write(BENCH_OUTPUT)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not recorder.results:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'name':<40} {'p50 ms':>9} {'p95 ms':>9} {'rows/sec':>12} {'queries':>8}")
+    for name, result in sorted(recorder.results.items()):
+        rows_per_sec = f"{result['rows_per_sec']:,.0f}" if "rows_per_sec" in result else "-"
+        terminalreporter.write_line(
+            f"{name:<40} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {rows_per_sec:>12} {result['queries']:>8}"
+        )
+    terminalreporter.write_line(f"results written to {BENCH_OUTPUT}")
@@ -0,0 +1,61 @@
+"""
+Measures how CSV row parsing and validation scales with the number of ingest worker processes.
+
+Usage:
+    python -m benchmarks.parse_scaling --rows 200000 --workers 1 2 4 8
+
+Only the parsing stage is timed, no database is needed.
+"""
+
+import argparse
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import django
+
+
+def make_rows(count):
+    customers = [str(uuid.uuid4()) for _ in range(100)]
+    products = [str(uuid.uuid4()) for _ in range(100)]
+    start = datetime(2025, 7, 7, 15, 47, 1, 221109)
+    for i in range(count):
+        yield {
+            "transaction_id": str(uuid.uuid4()),
+            "timestamp": (start - timedelta(minutes=i)).isoformat(),
+            "amount": f"{100 + i % 500 / 4:.2f}",
+            "currency": "USD" if i % 3 else "EUR",
+            "customer_id": customers[i % len(customers)],
+            "product_id": products[i % len(products)],
+            "quantity": str(i % 10 + 1),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "transaction_system.settings")
+    django.setup()
+    from transactions.ingest import parse_chunks
+
+    rows = list(make_rows(args.rows))
+    baseline = None
+    print(f"{'workers':>8} {'seconds':>9} {'rows/sec':>12} {'speedup':>8}")
+    for workers in args.workers:
+        started = time.perf_counter()
+        parsed = sum(len(chunk) for chunk in parse_chunks(rows, args.chunk_size, workers))
+        elapsed = time.perf_counter() - started
+        assert parsed == args.rows
+
+        rate = parsed / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} {elapsed:>9.2f} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares serializing a page of transactions through model instances with the `values_list` row serializer.
+
+Usage:
+    python -m benchmarks.serializer --rows 50 --repeat 20000
+
+Both paths start from the database row tuples, the model path builds instances with `Model.from_db` as the
+ORM does, so no database is needed. The two outputs are checked to be byte-identical.
+"""
+
+import argparse
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+import django
+
+
+def make_rows(count):
+    start = datetime(2025, 7, 7, 15, 47, 1, 221109, tzinfo=dt_timezone.utc)
+    return [
+        (
+            uuid.uuid4(),
+            start - timedelta(minutes=i),
+            Decimal(f"{100 + i % 500 / 4:.2f}"),
+            "USD" if i % 3 else "EUR",
+            uuid.uuid4(),
+            uuid.uuid4(),
+            i % 10 + 1,
+            start,
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50, help="Rows per page.")
+    parser.add_argument("--repeat", type=int, default=20_000, help="Number of pages to serialize.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "transaction_system.settings")
+    django.setup()
+    from django.http import JsonResponse
+
+    from transactions.models import Transaction
+    from transactions.serializers import json_response, serialize_row, serialize_transaction
+
+    # Models are loaded with every column, rows only with the serialized ones.
+    field_names = [field.attname for field in Transaction._meta.concrete_fields]
+    model_rows = make_rows(args.rows)
+    value_rows = [row[:-1] for row in model_rows]
+
+    def model_page():
+        objects = [Transaction.from_db("default", field_names, row) for row in model_rows]
+        return JsonResponse({"transactions": [serialize_transaction(obj) for obj in objects]}).content
+
+    def row_page():
+        return json_response({"transactions": [serialize_row(row) for row in value_rows]}).content
+
+    assert model_page() == row_page()
+
+    print(f"{'path':>8} {'seconds':>9} {'pages/sec':>12} {'speedup':>8}")
+    baseline = None
+    for name, page in (("model", model_page), ("rows", row_page)):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            page()
+        elapsed = time.perf_counter() - started
+
+        rate = args.repeat / elapsed
+        baseline = baseline or rate
+        print(f"{name:>8} {elapsed:>9.2f} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import csv
+import io
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+
+from reports.cache import reset_cache_stats
+from transactions.cache import detail_cache
+from transactions.models import TRANSACTION_FIELDS
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    reset_cache_stats()
+    detail_cache.clear()
+
+
+@pytest.fixture
+def auth_client(client):
+    client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {settings.API_AUTH_TOKEN}"
+    return client
+
+
+@pytest.fixture
+def make_csv_file():
+    """
+    Returns a factory writing rows to an in-memory CSV file that can be posted to the upload endpoint.
+    """
+
+    def make(rows, name="transactions.csv"):
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=TRANSACTION_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+        csv_file = io.BytesIO(output.getvalue().encode("utf-8"))
+        csv_file.name = name
+        return csv_file
+
+    return make
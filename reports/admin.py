@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import DailyTransactionRollup
+
+
+@admin.register(DailyTransactionRollup)
+class DailyTransactionRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "day",
+        "customer_id",
+        "product_id",
+        "currency",
+        "total_amount",
+        "total_quantity",
+        "transaction_count",
+        "last_timestamp",
+    )
+    search_fields = ("customer_id", "product_id")
+    list_filter = ("currency", "day")
+    ordering = ("-day",)
@@ -0,0 +1,150 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+
+from reports.models import ReportVersion
+
+CUSTOMER = "customer"
+PRODUCT = "product"
+# Version shared by all reports, bumped when the rollups are rebuilt.
+ALL = "all"
+ALL_ID = uuid.UUID(int=0)
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def report_cache():
+    return caches[settings.REPORTS_CACHE_ALIAS]
+
+
+def versions(kind, entity_id):
+    return ReportVersion.objects.filter(Q(kind=kind, entity_id=entity_id) | Q(kind=ALL)).values_list("kind", "version")
+
+
+def version_string(rows, kind):
+    rows = dict(rows)
+    return f"{rows.get(ALL, 0)}.{rows.get(kind, 0)}"
+
+
+def current_version(kind, entity_id):
+    """
+    Returns the version of the reports of a customer or product, read from `ReportVersion` with one query.
+
+    Combines the entity's own version with the one shared by all reports, both are 0 until first bumped.
+    """
+    return version_string(versions(kind, entity_id), kind)
+
+
+async def acurrent_version(kind, entity_id):
+    """
+    Async version of `current_version`.
+    """
+    return version_string([row async for row in versions(kind, entity_id)], kind)
+
+
+def report_key(kind, entity_id, version, start, end):
+    start = start.isoformat() if start else ""
+    end = end.isoformat() if end else ""
+    return f"reports:{kind}:{entity_id}:{version}:{start}:{end}"
+
+
+def cached_report(kind, entity_id, start, end, compute):
+    """
+    Returns the report for an entity and date range from the cache, calling `compute()` on a miss.
+
+    Entries are keyed by the entity's version counter, `invalidate_reports` bumps it on writes, which
+    makes every cached report of that entity unreachable at once.
+    """
+    cache = report_cache()
+    key = report_key(kind, entity_id, current_version(kind, entity_id), start, end)
+
+    data = cache.get(key)
+    if data is not None:
+        record("hits")
+        return data
+
+    record("misses")
+    data = compute()
+    cache.set(key, data)
+    return data
+
+
+async def acached_report(kind, entity_id, start, end, compute):
+    """
+    Async version of `cached_report`, `compute` is a coroutine function.
+    """
+    cache = report_cache()
+    key = report_key(kind, entity_id, await acurrent_version(kind, entity_id), start, end)
+
+    data = await cache.aget(key)
+    if data is not None:
+        record("hits")
+        return data
+
+    record("misses")
+    data = await compute()
+    await cache.aset(key, data)
+    return data
+
+
+def bump_versions(customer_ids=(), product_ids=(), all_reports=False):
+    """
+    Sets the version of the given entities to the current time with a single upsert.
+
+    Rows are written in a fixed order, so concurrent bumps of overlapping entities cannot deadlock.
+    """
+    keys = [(CUSTOMER, entity_id) for entity_id in set(customer_ids)]
+    keys += [(PRODUCT, entity_id) for entity_id in set(product_ids)]
+    if all_reports:
+        keys.append((ALL, ALL_ID))
+    version = time.time_ns()
+    ReportVersion.objects.bulk_create(
+        [ReportVersion(kind=kind, entity_id=entity_id, version=version) for kind, entity_id in sorted(keys)],
+        update_conflicts=True,
+        unique_fields=["kind", "entity_id"],
+        update_fields=["version"],
+    )
+
+
+def invalidate_reports(customer_ids=(), product_ids=()):
+    """
+    Invalidates the cached reports of the given customers and products once the current transaction commits.
+
+    Bumping before the commit would let a concurrent request cache the old totals under the new version.
+    """
+    customer_ids, product_ids = set(customer_ids), set(product_ids)
+    if customer_ids or product_ids:
+        transaction.on_commit(lambda: bump_versions(customer_ids, product_ids))
+
+
+def invalidate_all_reports():
+    """
+    Invalidates every cached report once the current transaction commits, e.g. after the rollups are rebuilt.
+    """
+    transaction.on_commit(lambda: bump_versions(all_reports=True))
+
+
+def record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def cache_stats():
+    """
+    Returns the hit/miss counters of this process.
+    """
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 4) if total else None}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from reports.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recomputes the daily report rollups from existing transactions, e.g. after a backfill."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="from_date", help="First day to rebuild, YYYY-MM-DD.")
+        parser.add_argument("--to", dest="to_date", help="Last day to rebuild, YYYY-MM-DD.")
+
+    def handle(self, *args, **options):
+        dates = {}
+        for name in ("from_date", "to_date"):
+            try:
+                # None when the value is not shaped like a date, ValueError when it is but does not exist.
+                dates[name] = parse_date(options[name]) if options[name] else None
+            except ValueError:
+                dates[name] = None
+            if options[name] and dates[name] is None:
+                raise CommandError(f"Invalid date '{options[name]}', expected YYYY-MM-DD.")
+
+        written = rebuild_rollups(**dates)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} rollup rows."))
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:18
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def backfill_rollups(apps, schema_editor):
+    Transaction = apps.get_model("transactions", "Transaction")
+    DailyTransactionRollup = apps.get_model("reports", "DailyTransactionRollup")
+    db_alias = schema_editor.connection.alias
+    totals = (
+        Transaction.objects.using(db_alias)
+        .annotate(day=TruncDate("timestamp", tzinfo=timezone.get_default_timezone()))
+        .values("customer_id", "product_id", "day", "currency")
+        .annotate(
+            total_amount=Sum("amount"),
+            total_quantity=Sum("quantity"),
+            transaction_count=Count("transaction_id"),
+            last_timestamp=Max("timestamp"),
+        )
+        .order_by()
+    )
+    DailyTransactionRollup.objects.using(db_alias).bulk_create(
+        (DailyTransactionRollup(**total) for total in totals.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("transactions", "0006_importjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyTransactionRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("customer_id", models.UUIDField()),
+                ("product_id", models.UUIDField()),
+                ("day", models.DateField()),
+                ("currency", models.CharField(choices=[("USD", "US Dollar"), ("EUR", "Euro")], max_length=3)),
+                ("total_amount", models.DecimalField(decimal_places=2, max_digits=20)),
+                ("total_quantity", models.PositiveBigIntegerField()),
+                ("transaction_count", models.PositiveIntegerField()),
+                ("last_timestamp", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["customer_id", "day"], name="reports_dai_custome_27398c_idx"),
+                    models.Index(fields=["product_id", "day"], name="reports_dai_product_98b8a8_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("customer_id", "product_id", "day", "currency"), name="unique_daily_transaction_rollup"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+from django.db import models
+
+from transactions.models import Transaction
+
+
+class DailyTransactionRollup(models.Model):
+    """
+    Transaction totals per customer, product, day and currency.
+
+    Maintained incrementally by the ingest pipeline and the `Transaction` signals in `reports.signals`,
+    `manage.py rebuild_rollups` recomputes it from scratch. Summing rows for a customer (or a product) over
+    a day range answers the summary reports without touching `Transaction`, and because each row is a
+    single customer/product pair, distinct counts stay exact.
+    """
+
+    customer_id = models.UUIDField()
+    product_id = models.UUIDField()
+    day = models.DateField()
+    currency = models.CharField(max_length=3, choices=Transaction.CURRENCY_CHOICES)
+
+    total_amount = models.DecimalField(max_digits=20, decimal_places=2)
+    total_quantity = models.PositiveBigIntegerField()
+    transaction_count = models.PositiveIntegerField()
+    last_timestamp = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["customer_id", "product_id", "day", "currency"], name="unique_daily_transaction_rollup"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["customer_id", "day"]),
+            models.Index(fields=["product_id", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.customer_id}/{self.product_id} - {self.total_amount} {self.currency}"
+
+
+class ReportVersion(models.Model):
+    """
+    Version of the cached reports of a customer or a product, see `reports.cache`.
+
+    Kept in the database rather than in the report cache, so a write made by any process, e.g. the import
+    worker or a management command, invalidates the reports cached by every web process.
+    """
+
+    kind = models.CharField(max_length=16)
+    entity_id = models.UUIDField()
+    version = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "entity_id"], name="unique_report_version"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.entity_id} - {self.version}"
@@ -0,0 +1,206 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Sum
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from reports.cache import invalidate_all_reports
+from reports.models import DailyTransactionRollup
+from transactions.models import Transaction
+
+UPSERT_CHUNK_SIZE = 1000
+
+ROLLUP_COLUMNS = (
+    "customer_id",
+    "product_id",
+    "day",
+    "currency",
+    "total_amount",
+    "total_quantity",
+    "transaction_count",
+    "last_timestamp",
+)
+
+
+def rollup_day(timestamp):
+    if timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    return timezone.localdate(timestamp)
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def upsert_sql(source):
+    """
+    Returns an INSERT that adds the rows produced by `source` to the rollups, incrementing existing totals.
+
+    Args:
+        source: `VALUES (...)` list or `SELECT` producing rows in `ROLLUP_COLUMNS` order.
+    """
+    table = connection.ops.quote_name(DailyTransactionRollup._meta.db_table)
+    return f"""
+        INSERT INTO {table} AS rollup ({", ".join(ROLLUP_COLUMNS)})
+        {source}
+        ON CONFLICT (customer_id, product_id, day, currency) DO UPDATE SET
+            total_amount = rollup.total_amount + EXCLUDED.total_amount,
+            total_quantity = rollup.total_quantity + EXCLUDED.total_quantity,
+            transaction_count = rollup.transaction_count + EXCLUDED.transaction_count,
+            last_timestamp = GREATEST(rollup.last_timestamp, EXCLUDED.last_timestamp)
+    """
+
+
+def aggregate_sql(source):
+    """
+    Returns a SELECT grouping transaction rows from `source` (a table or CTE name) into rollup rows.
+
+    The query takes the name of the current time zone as its first parameter, days are cut in that zone.
+    """
+    return f"""
+        SELECT
+            customer_id, product_id, (timestamp AT TIME ZONE %s)::date, currency,
+            SUM(amount), SUM(quantity), COUNT(*), MAX(timestamp)
+        FROM {source}
+        GROUP BY 1, 2, 3, 4
+    """
+
+
+def apply_transactions(transactions):
+    """
+    Adds newly inserted transactions to the rollups, one upsert statement per 1000 touched rollup rows.
+
+    `INSERT ... ON CONFLICT` is PostgreSQL syntax, other databases update the rollup rows one by one.
+    """
+    totals: dict[tuple, list] = {}
+    for transaction_obj in transactions:
+        timestamp = transaction_obj.timestamp
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp)
+        day = timezone.localdate(timestamp)
+        key = (transaction_obj.customer_id, transaction_obj.product_id, day, transaction_obj.currency)
+        total = totals.setdefault(key, [Decimal(0), 0, 0, timestamp])
+        total[0] += transaction_obj.amount
+        total[1] += transaction_obj.quantity
+        total[2] += 1
+        total[3] = max(total[3], timestamp)
+
+    # Upserting in key order keeps concurrent uploads from deadlocking on the same rollup rows.
+    rows = [(*key, *total) for key, total in sorted(totals.items())]
+    if connection.vendor != "postgresql":
+        _apply_rows_with_orm(rows)
+        return
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            end = start + UPSERT_CHUNK_SIZE
+            chunk = rows[start:end]
+            placeholders = ", ".join(["(" + ", ".join(["%s"] * len(ROLLUP_COLUMNS)) + ")"] * len(chunk))
+            cursor.execute(upsert_sql(f"VALUES {placeholders}"), [value for row in chunk for value in row])
+
+
+def _apply_rows_with_orm(rows):
+    with transaction.atomic():
+        for customer_id, product_id, day, currency, amount, quantity, count, last_timestamp in rows:
+            updated = DailyTransactionRollup.objects.filter(
+                customer_id=customer_id, product_id=product_id, day=day, currency=currency
+            ).update(
+                total_amount=F("total_amount") + amount,
+                total_quantity=F("total_quantity") + quantity,
+                transaction_count=F("transaction_count") + count,
+                last_timestamp=Greatest("last_timestamp", last_timestamp),
+            )
+            if not updated:
+                DailyTransactionRollup.objects.create(
+                    customer_id=customer_id,
+                    product_id=product_id,
+                    day=day,
+                    currency=currency,
+                    total_amount=amount,
+                    total_quantity=quantity,
+                    transaction_count=count,
+                    last_timestamp=last_timestamp,
+                )
+
+
+def aggregate_transactions(queryset):
+    """
+    Groups a `Transaction` queryset into dicts with the fields of `DailyTransactionRollup`, days are cut in
+    the current time zone. Works on every database, `aggregate_sql` is the PostgreSQL equivalent.
+    """
+    return (
+        queryset.annotate(day=TruncDate("timestamp", tzinfo=timezone.get_current_timezone()))
+        .values("customer_id", "product_id", "day", "currency")
+        .annotate(
+            total_amount=Sum("amount"),
+            total_quantity=Sum("quantity"),
+            transaction_count=Count("transaction_id"),
+            last_timestamp=Max("timestamp"),
+        )
+        .order_by()
+    )
+
+
+def refresh_rollups(customer_id, product_id, day):
+    """
+    Recomputes the rollup rows of one customer, product and day from `Transaction`.
+
+    Used when transactions are changed or deleted, where the previous totals cannot be adjusted incrementally.
+    """
+    start, end = day_bounds(day)
+    totals = aggregate_transactions(
+        Transaction.objects.filter(
+            customer_id=customer_id, product_id=product_id, timestamp__gte=start, timestamp__lt=end
+        )
+    )
+    with transaction.atomic():
+        DailyTransactionRollup.objects.filter(customer_id=customer_id, product_id=product_id, day=day).delete()
+        DailyTransactionRollup.objects.bulk_create(DailyTransactionRollup(**total) for total in totals)
+
+
+def rebuild_rollups(from_date=None, to_date=None):
+    """
+    Recomputes the rollups from `Transaction` with a single INSERT ... SELECT, optionally limited to a day range.
+    Databases other than PostgreSQL aggregate with the ORM and insert the rows in chunks. Every cached report
+    is invalidated once the rollups are committed.
+
+    Returns:
+        Number of rollup rows written.
+    """
+    rollups = DailyTransactionRollup.objects.all()
+    conditions, params = [], []
+    if from_date:
+        rollups = rollups.filter(day__gte=from_date)
+        conditions.append("timestamp >= %s")
+        params.append(day_bounds(from_date)[0])
+    if to_date:
+        rollups = rollups.filter(day__lte=to_date)
+        conditions.append("timestamp < %s")
+        params.append(day_bounds(to_date)[1])
+
+    table = connection.ops.quote_name(Transaction._meta.db_table)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    source = f"(SELECT * FROM {table} {where}) AS transactions"
+
+    if connection.vendor != "postgresql":
+        transactions = Transaction.objects.all()
+        if from_date:
+            transactions = transactions.filter(timestamp__gte=day_bounds(from_date)[0])
+        if to_date:
+            transactions = transactions.filter(timestamp__lt=day_bounds(to_date)[1])
+        with transaction.atomic():
+            rollups.delete()
+            created = DailyTransactionRollup.objects.bulk_create(
+                (DailyTransactionRollup(**total) for total in aggregate_transactions(transactions).iterator()),
+                batch_size=UPSERT_CHUNK_SIZE,
+            )
+            invalidate_all_reports()
+        return len(created)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        rollups.delete()
+        cursor.execute(upsert_sql(aggregate_sql(source)), [timezone.get_current_timezone_name(), *params])
+        invalidate_all_reports()
+        return cursor.rowcount
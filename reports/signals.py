@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from reports.cache import invalidate_reports
+from reports.rollups import apply_transactions, refresh_rollups, rollup_day
+from transactions.models import Transaction
+
+
+def rollup_key(customer_id, product_id, timestamp):
+    return customer_id, product_id, rollup_day(timestamp)
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_rollup_key(sender, instance, raw, **kwargs):
+    if raw or instance._state.adding:
+        return
+    previous = Transaction.objects.filter(pk=instance.pk).values_list("customer_id", "product_id", "timestamp").first()
+    instance._previous_rollup_key = rollup_key(*previous) if previous else None
+
+
+@receiver(post_save, sender=Transaction)
+def update_rollups_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    invalidate_reports([instance.customer_id], [instance.product_id])
+    if created:
+        apply_transactions([instance])
+        return
+
+    keys = {rollup_key(instance.customer_id, instance.product_id, instance.timestamp)}
+    if previous_key := getattr(instance, "_previous_rollup_key", None):
+        keys.add(previous_key)
+        invalidate_reports([previous_key[0]], [previous_key[1]])
+    for key in keys:
+        refresh_rollups(*key)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    invalidate_reports([instance.customer_id], [instance.product_id])
+    refresh_rollups(*rollup_key(instance.customer_id, instance.product_id, instance.timestamp))
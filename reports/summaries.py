@@ -0,0 +1,145 @@
+from datetime import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Case, Count, DecimalField, F, Max, Sum, Value, When
+from django.utils import timezone
+
+from reports.models import DailyTransactionRollup
+from transactions.models import Transaction
+
+EXCHANGE_RATES = {
+    "PLN": Decimal("1"),
+    "EUR": Decimal("4.3"),
+    "USD": Decimal("4.0"),
+}
+
+PLN = DecimalField(max_digits=24, decimal_places=4)
+
+
+def is_day_boundary(moment):
+    return moment is None or timezone.localtime(moment).time() == time.min
+
+
+def summary_rows(start=None, end=None, **lookup):
+    """
+    Returns the rows the summary reports aggregate, filtered by `lookup` and an optional `[start, end)` range.
+
+    With `REPORTS_USE_ROLLUPS` these are the daily rollups, otherwise, or when the range does not start and
+    end at midnight, every matching transaction. Transactions are annotated with the rollup column names,
+    so both querysets can be aggregated the same way.
+    """
+    if settings.REPORTS_USE_ROLLUPS and is_day_boundary(start) and is_day_boundary(end):
+        rows = DailyTransactionRollup.objects.filter(**lookup)
+        if start:
+            rows = rows.filter(day__gte=timezone.localdate(start))
+        if end:
+            rows = rows.filter(day__lt=timezone.localdate(end))
+        return rows
+
+    rows = Transaction.objects.filter(**lookup).annotate(
+        total_amount=F("amount"), total_quantity=F("quantity"), last_timestamp=F("timestamp")
+    )
+    if start:
+        rows = rows.filter(timestamp__gte=start)
+    if end:
+        rows = rows.filter(timestamp__lt=end)
+    return rows
+
+
+def total_in_pln():
+    """
+    Aggregate of `total_amount` converted to PLN with `EXCHANGE_RATES`, evaluated by the database in numeric precision.
+    """
+    rate = Case(
+        *[When(currency=currency, then=Value(rate)) for currency, rate in EXCHANGE_RATES.items()],
+        default=Value(Decimal("1")),
+        output_field=PLN,
+    )
+    return Sum(F("total_amount") * rate, output_field=PLN)
+
+
+def round_pln(total):
+    return float(round(total, 2))
+
+
+def customer_aggregates():
+    return {
+        "total_spent": total_in_pln(),
+        "unique_products": Count("product_id", distinct=True),
+        "last_transaction_date": Max("last_timestamp"),
+    }
+
+
+def customer_summary(customer_id, totals):
+    if totals["total_spent"] is None:
+        return {
+            "customer_id": str(customer_id),
+            "total_spent_pln": 0,
+            "unique_products": 0,
+            "last_transaction_date": None,
+        }
+
+    return {
+        "customer_id": str(customer_id),
+        "total_spent_pln": round_pln(totals["total_spent"]),
+        "unique_products": totals["unique_products"],
+        "last_transaction_date": totals["last_transaction_date"],
+    }
+
+
+def customer_summary_data(customer_id, start=None, end=None):
+    """
+    Computes the customer summary with a single aggregate query.
+    """
+    totals = summary_rows(start, end, customer_id=customer_id).aggregate(**customer_aggregates())
+    return customer_summary(customer_id, totals)
+
+
+async def acustomer_summary_data(customer_id, start=None, end=None):
+    """
+    Async version of `customer_summary_data`.
+    """
+    totals = await summary_rows(start, end, customer_id=customer_id).aaggregate(**customer_aggregates())
+    return customer_summary(customer_id, totals)
+
+
+def product_aggregates():
+    return {
+        "quantity_sold": Sum("total_quantity"),
+        "total_revenue": total_in_pln(),
+        "unique_customers": Count("customer_id", distinct=True),
+    }
+
+
+def product_summary(product_id, totals):
+    if totals["total_revenue"] is None:
+        return {
+            "product_id": str(product_id),
+            "total_quantity_sold": 0,
+            "total_revenue_pln": 0,
+            "unique_customers": 0,
+        }
+
+    return {
+        "product_id": str(product_id),
+        "total_quantity_sold": totals["quantity_sold"],
+        "total_revenue_pln": round_pln(totals["total_revenue"]),
+        "unique_customers": totals["unique_customers"],
+    }
+
+
+def product_summary_data(product_id, start=None, end=None):
+    """
+    Computes the product summary with a single aggregate query.
+    """
+    totals = summary_rows(start, end, product_id=product_id).aggregate(**product_aggregates())
+    return product_summary(product_id, totals)
+
+
+async def aproduct_summary_data(product_id, start=None, end=None):
+    """
+    Async version of `product_summary_data`.
+    """
+    totals = await summary_rows(start, end, product_id=product_id).aaggregate(**product_aggregates())
+    return product_summary(product_id, totals)
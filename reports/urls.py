@@ -1,8 +1,16 @@
 from django.urls import URLPattern, path
 
-from .views import customer_summary, product_summary
+from .views import acustomer_summary, aproduct_summary, customer_summary, product_summary, report_cache_stats
 
 urlpatterns: list[URLPattern] = [
     path("customer-summary/<uuid:customer_id>/", customer_summary, name="customer_summary"),
     path("product-summary/<uuid:product_id>/", product_summary, name="product_summary"),
+    path("cache-stats/", report_cache_stats, name="report_cache_stats"),
+]
+
+# Served by `transaction_system.async_urls` when `ASYNC_VIEWS` is enabled.
+async_urlpatterns: list[URLPattern] = [
+    path("customer-summary/<uuid:customer_id>/", acustomer_summary, name="customer_summary"),
+    path("product-summary/<uuid:product_id>/", aproduct_summary, name="product_summary"),
+    path("cache-stats/", report_cache_stats, name="report_cache_stats"),
 ]
@@ -1,9 +1,38 @@
-from django.utils.dateparse import parse_date
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+def parse_timestamp(value, end=False):
+    """
+    Parses a YYYY-MM-DD date or an ISO 8601 datetime into an aware datetime.
+
+    A date marks the start of that day, or with `end` the start of the next day, so that it can be
+    used as an exclusive upper bound. Returns None for missing or invalid values.
+    """
+    if not value:
+        return None
+    try:
+        if day := parse_date(value):
+            if end:
+                day += timedelta(days=1)
+            return timezone.make_aware(datetime.combine(day, time.min))
+        moment = parse_datetime(value)
+    except ValueError:
+        return None
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
 
 
 def parse_date_range(request):
-    from_date_str = request.GET.get("from")
-    to_date_str = request.GET.get("to")
-    from_date = parse_date(from_date_str) if from_date_str else None
-    to_date = parse_date(to_date_str) if to_date_str else None
-    return from_date, to_date
+    """
+    Returns the `from`/`to` query parameters as a half-open `[start, end)` range of aware datetimes.
+
+    Dates are inclusive, `to=2025-07-31` ends right before August 1st. Filtering with
+    `timestamp__gte=start, timestamp__lt=end` compares the raw column, so the timestamp indexes can be used.
+    """
+    start = parse_timestamp(request.GET.get("from"))
+    end = parse_timestamp(request.GET.get("to"), end=True)
+    return start, end
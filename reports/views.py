@@ -1,20 +1,19 @@
 from logging import getLogger
 
-from django.db.models import Max, Sum
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 
+from reports.cache import CUSTOMER, PRODUCT, acached_report, cache_stats, cached_report
+from reports.summaries import (
+    acustomer_summary_data,
+    aproduct_summary_data,
+    customer_summary_data,
+    product_summary_data,
+)
 from reports.utils import parse_date_range
-from transactions.models import Transaction
 
 logger = getLogger(__name__)
 
-EXCHANGE_RATES = {
-    "PLN": 1,
-    "EUR": 4.3,
-    "USD": 4.0,
-}
-
 
 @require_GET
 def customer_summary(request, customer_id):
@@ -22,8 +21,8 @@ def customer_summary(request, customer_id):
     Returns a transaction summary for a given customer within an optional date range.
 
     Query Parameters:
-        from (str, optional): Start date in YYYY-MM-DD or ISO 8601 format.
-        to (str, optional): End date in YYYY-MM-DD or ISO 8601 format.
+        from (str, optional): Start date in YYYY-MM-DD or ISO 8601 format, inclusive.
+        to (str, optional): End date in YYYY-MM-DD (inclusive) or ISO 8601 format (exclusive).
 
     Responses:
         200 OK:
@@ -37,40 +36,9 @@ def customer_summary(request, customer_id):
             Returned if the customer with the given ID does not exist.
     """
 
-    from_date, to_date = parse_date_range(request)
-    transactions = Transaction.objects.filter(customer_id=customer_id)
-
-    if from_date:
-        transactions = transactions.filter(timestamp__date__gte=from_date)
-    if to_date:
-        transactions = transactions.filter(timestamp__date__lte=to_date)
-
-    if not transactions.exists():
-        return JsonResponse(
-            {
-                "customer_id": str(customer_id),
-                "total_spent_pln": 0,
-                "unique_products": 0,
-                "last_transaction_date": None,
-            }
-        )
-
-    total_spent = 0
-    for t in transactions:
-        rate = EXCHANGE_RATES.get(t.currency, 1)
-        total_spent += float(t.amount) * rate
-
-    unique_products = transactions.values("product_id").distinct().count()
-    last_transaction_date = transactions.aggregate(last=Max("timestamp"))["last"]
-
-    return JsonResponse(
-        {
-            "customer_id": str(customer_id),
-            "total_spent_pln": round(total_spent, 2),
-            "unique_products": unique_products,
-            "last_transaction_date": last_transaction_date,
-        }
-    )
+    start, end = parse_date_range(request)
+    data = cached_report(CUSTOMER, customer_id, start, end, lambda: customer_summary_data(customer_id, start, end))
+    return JsonResponse(data)
 
 
 @require_GET
@@ -79,8 +47,8 @@ def product_summary(request, product_id):
     Returns a transaction summary for a given product within an optional date range.
 
     Query Parameters:
-        from (str, optional): Start date in YYYY-MM-DD or ISO 8601 format.
-        to (str, optional): End date in YYYY-MM-DD or ISO 8601 format.
+        from (str, optional): Start date in YYYY-MM-DD or ISO 8601 format, inclusive.
+        to (str, optional): End date in YYYY-MM-DD (inclusive) or ISO 8601 format (exclusive).
 
     Responses:
         200 OK:
@@ -93,38 +61,44 @@ def product_summary(request, product_id):
         404 Not Found:
             Returned if the product with the given ID does not exist.
     """
-    from_date, to_date = parse_date_range(request)
-    transactions = Transaction.objects.filter(product_id=product_id)
+    start, end = parse_date_range(request)
+    data = cached_report(PRODUCT, product_id, start, end, lambda: product_summary_data(product_id, start, end))
+    return JsonResponse(data)
 
-    if from_date:
-        transactions = transactions.filter(timestamp__date__gte=from_date)
-    if to_date:
-        transactions = transactions.filter(timestamp__date__lte=to_date)
 
-    if not transactions.exists():
-        return JsonResponse(
-            {
-                "product_id": str(product_id),
-                "total_quantity_sold": 0,
-                "total_revenue_pln": 0,
-                "unique_customers": 0,
-            }
-        )
+@require_GET
+async def acustomer_summary(request, customer_id):
+    """
+    Async version of `customer_summary`, served when `ASYNC_VIEWS` is enabled.
+    """
+    start, end = parse_date_range(request)
+    data = await acached_report(
+        CUSTOMER, customer_id, start, end, lambda: acustomer_summary_data(customer_id, start, end)
+    )
+    return JsonResponse(data)
 
-    total_quantity = transactions.aggregate(total=Sum("quantity"))["total"] or 0
 
-    total_revenue = 0
-    for t in transactions:
-        rate = EXCHANGE_RATES.get(t.currency, 1)
-        total_revenue += float(t.amount) * rate
+@require_GET
+async def aproduct_summary(request, product_id):
+    """
+    Async version of `product_summary`, served when `ASYNC_VIEWS` is enabled.
+    """
+    start, end = parse_date_range(request)
+    data = await acached_report(PRODUCT, product_id, start, end, lambda: aproduct_summary_data(product_id, start, end))
+    return JsonResponse(data)
 
-    unique_customers = transactions.values("customer_id").distinct().count()
 
-    return JsonResponse(
-        {
-            "product_id": str(product_id),
-            "total_quantity_sold": total_quantity,
-            "total_revenue_pln": round(total_revenue, 2),
-            "unique_customers": unique_customers,
-        }
-    )
+@require_GET
+def report_cache_stats(request):
+    """
+    Returns the report cache counters of the process that serves the request.
+
+    Responses:
+        200 OK:
+            {
+                "hits": int,
+                "misses": int,
+                "hit_ratio": float | null
+            }
+    """
+    return JsonResponse(cache_stats())
@@ -0,0 +1,123 @@
+from uuid import uuid4
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from transaction_system import middleware
+from transaction_system.middleware import AdmissionControlMiddleware
+
+AUTHORIZATION = f"Bearer {settings.API_AUTH_TOKEN}"
+
+
+def show_statement_timeout():
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW statement_timeout")
+        return cursor.fetchone()[0]
+
+
+class TestAdmissionControlMiddleware:
+
+    @pytest.fixture(autouse=True)
+    def limits(self, settings):
+        settings.ADMISSION_CONTROL = {"customer_summary": {"max_concurrent": 1}}
+        settings.ADMISSION_RETRY_AFTER = 3
+        self.url = reverse("customer_summary", args=[uuid4()])
+
+    def test_rejects_requests_over_the_limit(self):
+        nested = []
+
+        def view(request):
+            nested.append(middleware(RequestFactory().get(self.url)))
+            return HttpResponse()
+
+        middleware = AdmissionControlMiddleware(view)
+        first = middleware(RequestFactory().get(self.url))
+
+        assert first.status_code == 200
+        assert nested[0].status_code == 503
+        assert nested[0]["Retry-After"] == "3"
+        assert middleware(RequestFactory().get(self.url)).status_code == 200
+
+    def test_other_routes_are_not_limited(self):
+        detail_url = reverse("transaction_detail", args=[uuid4()])
+        nested = []
+
+        def view(request):
+            if request.path == self.url:
+                nested.append(middleware(RequestFactory().get(detail_url)))
+            return HttpResponse()
+
+        middleware = AdmissionControlMiddleware(view)
+        middleware(RequestFactory().get(self.url))
+
+        assert nested[0].status_code == 200
+
+    def test_async_requests_are_limited(self):
+        nested = []
+
+        async def view(request):
+            nested.append(await middleware(RequestFactory().get(self.url)))
+            return HttpResponse()
+
+        middleware = AdmissionControlMiddleware(view)
+        first = async_to_sync(middleware)(RequestFactory().get(self.url))
+
+        assert first.status_code == 200
+        assert nested[0].status_code == 503
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="statement_timeout requires PostgreSQL")
+@pytest.mark.django_db(transaction=True)
+class TestStatementTimeout:
+
+    def test_timeout_is_set_while_the_view_runs(self, settings):
+        settings.ADMISSION_CONTROL = {"customer_summary": {"statement_timeout_ms": 1500}}
+        seen = []
+
+        def view(request):
+            seen.append(show_statement_timeout())
+            return HttpResponse()
+
+        AdmissionControlMiddleware(view)(RequestFactory().get(reverse("customer_summary", args=[uuid4()])))
+
+        assert seen == ["1500ms"]
+        assert show_statement_timeout() == "0"
+
+    def test_timeout_is_applied_when_the_view_connects(self, settings):
+        settings.ADMISSION_CONTROL = {"customer_summary": {"statement_timeout_ms": 1500}}
+        connection.close()
+        seen = []
+
+        def view(request):
+            seen.append(connection.connection is None)
+            seen.append(show_statement_timeout())
+            return HttpResponse()
+
+        AdmissionControlMiddleware(view)(RequestFactory().get(reverse("customer_summary", args=[uuid4()])))
+
+        assert seen == [True, "1500ms"]
+        assert show_statement_timeout() == "0"
+
+    def test_slow_query_returns_503(self, client, settings, monkeypatch):
+        settings.ADMISSION_CONTROL = {"customer_summary": {"statement_timeout_ms": 10}}
+
+        def slow_summary(*args, **kwargs):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(1)")
+
+        monkeypatch.setattr("reports.views.customer_summary_data", slow_summary)
+        resolved = []
+        monkeypatch.setattr(middleware, "resolve", lambda *args: resolved.append(args) or resolve(*args))
+
+        response = client.get(reverse("customer_summary", args=[uuid4()]), HTTP_AUTHORIZATION=AUTHORIZATION)
+
+        assert response.status_code == 503
+        assert response["Retry-After"] == "1"
+        assert response.json() == {"error": "Query time budget exceeded, narrow the date range or retry later."}
+        assert show_statement_timeout() == "0"
+        assert len(resolved) == 1
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.urls import resolve, reverse
+
+from transaction_system.middleware import AuthorizationTokenMiddleware
+from transactions.models import Transaction
+
+AUTHORIZATION = f"Bearer {settings.API_AUTH_TOKEN}"
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.customer_id = uuid4()
+        self.product_id = uuid4()
+        start = datetime(2025, 7, 1, 12, tzinfo=dt_timezone.utc)
+        self.transactions = [
+            Transaction.objects.create(
+                timestamp=start + timedelta(hours=i * 7),
+                amount=Decimal(f"{i + 1}.25"),
+                currency="EUR" if i % 2 else "USD",
+                customer_id=self.customer_id,
+                product_id=self.product_id if i % 3 else uuid4(),
+                quantity=i + 1,
+            )
+            for i in range(60)
+        ]
+
+    def urls(self):
+        return [
+            reverse("transactions_list"),
+            reverse("transactions_list") + "?page=2",
+            reverse("transactions_list") + "?page=last&customer_id=" + str(self.customer_id),
+            reverse("transactions_list") + "?page=9",
+            reverse("transactions_list") + "?page=abc",
+            reverse("transactions_list") + "?cursor=",
+            reverse("transactions_list") + "?cursor=invalid",
+            reverse("transaction_detail", args=[self.transactions[5].transaction_id]),
+            reverse("transaction_detail", args=[uuid4()]),
+            reverse("customer_summary", args=[self.customer_id]),
+            reverse("customer_summary", args=[self.customer_id]) + "?from=2025-07-02&to=2025-07-05T10:00:00",
+            reverse("product_summary", args=[self.product_id]) + "?from=2025-07-02",
+        ]
+
+    def test_async_views_are_served_with_async_urls(self, settings):
+        settings.ROOT_URLCONF = "transaction_system.async_urls"
+
+        for url in self.urls():
+            assert iscoroutinefunction(resolve(url.split("?")[0]).func), url
+
+    def test_async_views_match_sync_views(self, client, async_client, settings):
+        sync_responses = [client.get(url, HTTP_AUTHORIZATION=AUTHORIZATION) for url in self.urls()]
+
+        settings.ROOT_URLCONF = "transaction_system.async_urls"
+        async_responses = [async_to_sync(async_client.get)(url, AUTHORIZATION=AUTHORIZATION) for url in self.urls()]
+
+        for url, sync_response, async_response in zip(self.urls(), sync_responses, async_responses):
+            assert async_response.status_code == sync_response.status_code, url
+            if sync_response.status_code != 404:
+                assert async_response.content == sync_response.content, url
+
+    def test_cursor_pagination_walks_all_rows(self, async_client, settings):
+        settings.ROOT_URLCONF = "transaction_system.async_urls"
+        url = reverse("transactions_list") + "?cursor="
+        seen = []
+        while url:
+            data = async_to_sync(async_client.get)(url, AUTHORIZATION=AUTHORIZATION).json()
+            seen += [row["transaction_id"] for row in data["transactions"]]
+            url = data["next_cursor"] and reverse("transactions_list") + "?cursor=" + data["next_cursor"]
+
+        assert len(seen) == len(set(seen)) == 60
+
+    def test_export_is_streamed_with_an_async_iterator(self, client, async_client, settings):
+        settings.TRANSACTIONS_EXPORT_CHUNK_SIZE = 25
+        url = reverse("export_transactions") + "?format=ndjson&customer_id=" + str(self.customer_id)
+        expected = b"".join(client.get(url, HTTP_AUTHORIZATION=AUTHORIZATION).streaming_content)
+
+        settings.ROOT_URLCONF = "transaction_system.async_urls"
+        response = async_to_sync(async_client.get)(url, AUTHORIZATION=AUTHORIZATION)
+
+        async def read(response):
+            return [chunk async for chunk in response.streaming_content]
+
+        # A sync iterator would be read into a list by the ASGI handler before the first chunk is sent.
+        assert response.is_async
+        chunks = async_to_sync(read)(response)
+        assert len(chunks) == 3
+        assert b"".join(chunks) == expected
+
+    def test_async_middleware_rejects_missing_token(self, async_client, settings):
+        settings.ROOT_URLCONF = "transaction_system.async_urls"
+
+        response = async_to_sync(async_client.get)(reverse("transactions_list"))
+
+        assert response.status_code == 403
+
+    def test_middleware_adapts_to_get_response(self):
+        async def async_view(request):
+            pass
+
+        assert iscoroutinefunction(AuthorizationTokenMiddleware(async_view))
+        assert not iscoroutinefunction(AuthorizationTokenMiddleware(lambda request: None))
@@ -58,3 +58,16 @@ class TestCustomerSummaryView:
         assert response.status_code == 200
         data = response.json()
         assert data["unique_products"] == 0
+
+    @pytest.mark.parametrize("use_rollups", [True, False])
+    def test_customer_summary_runs_single_report_query(
+        self, auth_client, settings, django_assert_num_queries, use_rollups
+    ):
+        settings.REPORTS_USE_ROLLUPS = use_rollups
+        url = reverse("customer_summary", args=[self.customer_id]) + "?from=2000-01-01&to=2100-01-01"
+
+        # The report versions and the report itself.
+        with django_assert_num_queries(2):
+            response = auth_client.get(url)
+
+        assert response.status_code == 200
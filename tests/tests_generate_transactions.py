@@ -0,0 +1,85 @@
+import csv
+import io
+from collections import Counter
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from reports.models import DailyTransactionRollup
+from transactions.ingest import ingest_rows
+from transactions.models import Transaction
+from transactions.synthetic import generate_rows, parse_currency_mix
+
+
+class TestGenerateRows:
+
+    def test_same_seed_gives_same_rows(self):
+        assert list(generate_rows(500, seed=7)) == list(generate_rows(500, seed=7))
+        assert list(generate_rows(500, seed=7)) != list(generate_rows(500, seed=8))
+
+    def test_rows_follow_the_arguments(self):
+        rows = list(generate_rows(2000, customers=20, products=10, days=30, currency_mix={"EUR": 1}, chunk_size=300))
+
+        assert len(rows) == 2000
+        assert len({row[0] for row in rows}) == 2000
+        assert len({row[4] for row in rows}) <= 20
+        assert len({row[5] for row in rows}) <= 10
+        assert {row[3] for row in rows} == {"EUR"}
+        assert (max(row[1] for row in rows) - min(row[1] for row in rows)).days < 30
+
+    def test_skew_concentrates_transactions(self):
+        def top_customer_share(skew):
+            counts = Counter(row[4] for row in generate_rows(5000, customers=100, skew=skew))
+            return counts.most_common(1)[0][1] / 5000
+
+        assert top_customer_share(1.5) > 0.2
+        assert top_customer_share(0) < 0.05
+
+    @pytest.mark.parametrize("value", ["GBP=1", "USD", "USD=-1,EUR=1", "USD=0"])
+    def test_invalid_currency_mix(self, value):
+        with pytest.raises(ValueError):
+            parse_currency_mix(value)
+
+
+@pytest.mark.django_db
+class TestGenerateTransactionsCommand:
+
+    def rollups(self):
+        return sorted(
+            DailyTransactionRollup.objects.values_list("customer_id", "product_id", "day", "currency", "total_amount")
+        )
+
+    @pytest.mark.parametrize("backend", ["batch", "copy"])
+    def test_loads_rows_and_rollups(self, backend):
+        if backend == "copy" and connection.vendor != "postgresql":
+            pytest.skip("COPY requires PostgreSQL")
+
+        call_command(
+            "generate_transactions", "--rows", "1500", "--batch-size", "400", "--backend", backend, stdout=io.StringIO()
+        )
+
+        assert Transaction.objects.count() == 1500
+        expected = self.rollups()
+        call_command("rebuild_rollups", stdout=io.StringIO())
+        assert self.rollups() == expected
+
+    def test_csv_output_matches_loaded_rows(self, tmp_path):
+        path = tmp_path / "transactions.csv"
+        call_command("generate_transactions", "--rows", "300", "--seed", "3", "--csv", str(path), stdout=io.StringIO())
+        assert not Transaction.objects.exists()
+
+        with open(path, newline="") as csv_file:
+            result = ingest_rows(csv.DictReader(csv_file))
+        uploaded = sorted(Transaction.objects.values_list("transaction_id", "timestamp", "amount", "quantity"))
+        Transaction.objects.all().delete()
+        call_command("generate_transactions", "--rows", "300", "--seed", "3", stdout=io.StringIO())
+
+        assert result.inserted == 300
+        assert sorted(Transaction.objects.values_list("transaction_id", "timestamp", "amount", "quantity")) == uploaded
+
+    def test_invalid_arguments(self):
+        with pytest.raises(CommandError):
+            call_command("generate_transactions", "--currencies", "GBP=1", stdout=io.StringIO())
+        with pytest.raises(CommandError):
+            call_command("generate_transactions", "--rows", "0", stdout=io.StringIO())
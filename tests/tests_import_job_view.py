@@ -0,0 +1,119 @@
+import gzip
+import io
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from transactions import jobs
+from transactions.ingest import ingest_rows
+from transactions.jobs import claim_next_job
+from transactions.models import ImportJob, Transaction
+
+
+@pytest.mark.django_db
+class TestImportJobView:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        self.upload_url = reverse("upload_transactions_csv") + "?async=true"
+
+    def test_async_upload_returns_job(self, auth_client, make_rows, make_csv_file):
+        response = auth_client.post(self.upload_url, {"file": make_csv_file(make_rows(1))})
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "pending"
+        assert data["status_url"] == reverse("import_job_detail", args=[data["job_id"]])
+        assert Transaction.objects.count() == 0
+
+    def test_worker_runs_job(self, auth_client, make_rows, make_csv_file):
+        rows = make_rows(3)
+        rows[1]["currency"] = "GBP"
+        rows.append(dict(rows[0]))
+        job_id = auth_client.post(self.upload_url, {"file": make_csv_file(rows)}).json()["job_id"]
+
+        call_command("run_import_worker", once=True, stdout=io.StringIO())
+
+        response = auth_client.get(reverse("import_job_detail", args=[job_id]))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "succeeded"
+        assert data["processed_rows"] == 4
+        assert data["inserted"] == 2
+        assert data["duplicates"] == 1
+        assert [error["line"] for error in data["errors"]] == [3]
+        assert data["finished_at"] is not None
+        assert Transaction.objects.count() == 2
+        assert not ImportJob.objects.get(job_id=job_id).file
+
+    def test_worker_runs_compressed_job(self, auth_client, make_rows, make_csv_file):
+        csv_file = make_csv_file(make_rows(2))
+        compressed = io.BytesIO(gzip.compress(csv_file.getvalue()))
+        compressed.name = "transactions.csv.gz"
+        job_id = auth_client.post(self.upload_url, {"file": compressed}).json()["job_id"]
+
+        call_command("run_import_worker", once=True, stdout=io.StringIO())
+
+        job = ImportJob.objects.get(job_id=job_id)
+        assert (job.status, job.inserted) == (ImportJob.STATUS_SUCCEEDED, 2)
+
+    def test_errors_are_visible_while_the_job_runs(self, auth_client, settings, monkeypatch, make_rows, make_csv_file):
+        settings.TRANSACTIONS_UPLOAD_BATCH_SIZE = 2
+        settings.TRANSACTIONS_INGEST_BACKEND = "batch"
+        settings.IMPORT_JOB_PROGRESS_ERRORS = 2
+        rows = make_rows(6)
+        for row in rows[1::2]:
+            row["currency"] = "GBP"
+        status_url = auth_client.post(self.upload_url, {"file": make_csv_file(rows)}).json()["status_url"]
+        polled = []
+
+        def ingest_and_poll(rows, on_progress):
+            def poll(result):
+                on_progress(result)
+                data = auth_client.get(status_url).json()
+                polled.append((data["status"], data["processed_rows"], data["error_count"], len(data["errors"])))
+
+            return ingest_rows(rows, on_progress=poll)
+
+        monkeypatch.setattr(jobs, "ingest_rows", ingest_and_poll)
+        with CaptureQueriesContext(connection) as queries:
+            call_command("run_import_worker", once=True, stdout=io.StringIO())
+
+        assert polled == [("running", 2, 1, 1), ("running", 4, 2, 2), ("running", 6, 3, 2)]
+        # Past the first IMPORT_JOB_PROGRESS_ERRORS, progress updates no longer rewrite the list.
+        job_updates = [query["sql"] for query in queries if query["sql"].startswith('UPDATE "transactions_importjob"')]
+        assert sum('"errors"' in sql for sql in job_updates) == 3
+        data = auth_client.get(status_url).json()
+        assert (data["status"], data["error_count"], len(data["errors"])) == ("succeeded", 3, 3)
+
+    def test_stale_running_job_is_reclaimed(self, auth_client, settings, make_rows, make_csv_file):
+        settings.IMPORT_JOB_LEASE_SECONDS = 60
+        job_id = auth_client.post(self.upload_url, {"file": make_csv_file(make_rows(1))}).json()["job_id"]
+        job = claim_next_job()
+        assert claim_next_job() is None
+
+        ImportJob.objects.filter(job_id=job_id).update(heartbeat_at=timezone.now() - timedelta(seconds=61))
+        reclaimed = claim_next_job()
+
+        assert (reclaimed.job_id, reclaimed.status, reclaimed.attempts) == (job.job_id, ImportJob.STATUS_RUNNING, 2)
+        assert reclaimed.heartbeat_at > job.heartbeat_at
+
+    def test_job_failing_its_lease_too_often_is_marked_failed(self, auth_client, settings, make_rows, make_csv_file):
+        settings.IMPORT_JOB_MAX_ATTEMPTS = 1
+        job_id = auth_client.post(self.upload_url, {"file": make_csv_file(make_rows(1))}).json()["job_id"]
+        claim_next_job()
+        ImportJob.objects.filter(job_id=job_id).update(heartbeat_at=timezone.now() - timedelta(days=1))
+
+        assert claim_next_job() is None
+        assert ImportJob.objects.get(job_id=job_id).status == ImportJob.STATUS_FAILED
+
+    def test_import_job_not_found(self, auth_client):
+        response = auth_client.get(reverse("import_job_detail", args=[uuid4()]))
+        assert response.status_code == 404
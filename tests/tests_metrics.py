@@ -0,0 +1,124 @@
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from transaction_system import metrics
+from transactions.models import Transaction
+
+AUTHORIZATION = f"Bearer {settings.API_AUTH_TOKEN}"
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    for metric in metrics.REGISTRY:
+        metric.clear()
+
+
+def metric_lines(client):
+    response = client.get(reverse("metrics"))
+    assert response.status_code == 200
+    return response.content.decode().splitlines()
+
+
+class TestHistogram:
+
+    def test_render_cumulative_buckets(self):
+        histogram = metrics.Histogram("test_seconds", "Test histogram.", ("route",), buckets=(0.1, 1))
+        try:
+            for value in (0.05, 0.1, 0.5, 3):
+                histogram.observe("a", value=value)
+
+            assert histogram.render() == [
+                "# HELP test_seconds Test histogram.",
+                "# TYPE test_seconds histogram",
+                'test_seconds_bucket{route="a",le="0.1"} 2',
+                'test_seconds_bucket{route="a",le="1"} 3',
+                'test_seconds_bucket{route="a",le="+Inf"} 4',
+                'test_seconds_sum{route="a"} 3.65',
+                'test_seconds_count{route="a"} 4',
+            ]
+        finally:
+            metrics.REGISTRY.remove(histogram)
+
+    def test_label_values_are_escaped(self):
+        counter = metrics.Counter("test_total", "Test counter.", ("path",))
+        try:
+            counter.inc('a"b\\c')
+            assert counter.render()[-1] == 'test_total{path="a\\"b\\\\c"} 1'
+        finally:
+            metrics.REGISTRY.remove(counter)
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+
+    def setup_method(self):
+        self.transaction = Transaction.objects.create(
+            timestamp=datetime(2025, 7, 1, 12, tzinfo=dt_timezone.utc),
+            amount=Decimal("10.00"),
+            currency="USD",
+            customer_id=uuid4(),
+            product_id=uuid4(),
+            quantity=1,
+        )
+
+    def test_requires_token(self, client):
+        assert client.get(reverse("metrics")).status_code == 403
+
+    def test_can_be_exempted_from_token(self, client, settings):
+        settings.AUTH_EXEMPT_PATHS = ["/metrics"]
+
+        assert client.get(reverse("metrics")).status_code == 200
+        assert client.get(reverse("transactions_list")).status_code == 403
+
+    def test_records_requests_and_queries_per_route(self, auth_client):
+        url = reverse("transaction_detail", args=[self.transaction.transaction_id])
+        auth_client.get(url)
+        auth_client.get(url)
+        auth_client.get(reverse("transaction_detail", args=[uuid4()]))
+
+        lines = metric_lines(auth_client)
+
+        assert 'http_requests_total{route="transaction_detail",method="GET",status="200"} 2' in lines
+        assert 'http_requests_total{route="transaction_detail",method="GET",status="404"} 1' in lines
+        # The second request is served from the detail cache.
+        assert 'http_request_db_queries_sum{route="transaction_detail"} 2.0' in lines
+        assert 'http_request_db_queries_count{route="transaction_detail"} 3' in lines
+        assert 'http_request_duration_seconds_count{route="transaction_detail"} 3' in lines
+        assert 'http_response_size_bytes_count{route="transaction_detail"} 3' in lines
+
+    def test_rejected_requests_are_unmatched(self, client):
+        client.get(reverse("transactions_list"))
+
+        assert metrics.REQUESTS.value("unmatched", "GET", "403") == 1
+
+    def test_async_views_count_queries(self, async_client, settings):
+        settings.ROOT_URLCONF = "transaction_system.async_urls"
+        url = reverse("transaction_detail", args=[self.transaction.transaction_id])
+
+        assert async_to_sync(async_client.get)(url, AUTHORIZATION=AUTHORIZATION).status_code == 200
+
+        assert metrics.REQUEST_QUERIES.count("transaction_detail") == 1
+        assert 'http_request_db_queries_sum{route="transaction_detail"} 1.0' in metrics.render().splitlines()
+
+    def test_records_ingest_rows(self, auth_client):
+        content = (
+            "transaction_id,timestamp,amount,currency,customer_id,product_id,quantity\n"
+            f"{uuid4()},2025-07-01T12:00:00,10.00,USD,{uuid4()},{uuid4()},1\n"
+            f"{uuid4()},2025-07-01T12:00:00,10.00,GBP,{uuid4()},{uuid4()},1\n"
+        )
+        file = SimpleUploadedFile("transactions.csv", content.encode(), content_type="text/csv")
+        auth_client.post(reverse("upload_transactions_csv"), {"file": file})
+
+        lines = metric_lines(auth_client)
+
+        assert 'transactions_ingest_rows_total{backend="batch",outcome="inserted"} 1' in lines
+        assert 'transactions_ingest_rows_total{backend="batch",outcome="error"} 1' in lines
+        assert 'transactions_ingest_duration_seconds_count{backend="batch"} 1' in lines
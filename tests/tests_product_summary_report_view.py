@@ -60,3 +60,16 @@ class TestProductSummaryView:
         assert response.status_code == 200
         data = response.json()
         assert data["total_quantity_sold"] == 0
+
+    @pytest.mark.parametrize("use_rollups", [True, False])
+    def test_product_summary_runs_single_report_query(
+        self, auth_client, settings, django_assert_num_queries, use_rollups
+    ):
+        settings.REPORTS_USE_ROLLUPS = use_rollups
+        url = reverse("product_summary", args=[self.product_id]) + "?from=2000-01-01&to=2100-01-01"
+
+        # The report versions and the report itself.
+        with django_assert_num_queries(2):
+            response = auth_client.get(url)
+
+        assert response.status_code == 200
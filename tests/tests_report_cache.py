@@ -0,0 +1,131 @@
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.urls import reverse
+
+from reports.cache import PRODUCT, bump_versions
+from reports.models import ReportVersion
+from reports.rollups import rebuild_rollups
+from transactions.ingest import ingest_rows
+from transactions.models import Transaction
+
+
+@pytest.mark.django_db
+class TestReportCache:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, django_capture_on_commit_callbacks):
+        self.customer_id = uuid4()
+        self.other_customer_id = uuid4()
+        self.product_id = uuid4()
+        with django_capture_on_commit_callbacks(execute=True):
+            for customer_id in (self.customer_id, self.other_customer_id):
+                self.create_transaction(customer_id)
+
+    def create_transaction(self, customer_id, amount="10.00"):
+        transaction = self.build_transaction(customer_id, amount)
+        transaction.save()
+        return transaction
+
+    def build_transaction(self, customer_id, amount="10.00"):
+        return Transaction(
+            timestamp=datetime(2025, 7, 1, 12, tzinfo=dt_timezone.utc),
+            amount=Decimal(amount),
+            currency="USD",
+            customer_id=customer_id,
+            product_id=self.product_id,
+            quantity=1,
+        )
+
+    def upload(self, customer_id, amount):
+        row = {
+            "transaction_id": str(uuid4()),
+            "timestamp": "2025-07-02T12:00:00+00:00",
+            "amount": amount,
+            "currency": "USD",
+            "customer_id": str(customer_id),
+            "product_id": str(self.product_id),
+            "quantity": "1",
+        }
+        return ingest_rows([row])
+
+    def test_repeated_request_is_served_from_cache(self, auth_client, django_assert_num_queries):
+        url = reverse("customer_summary", args=[self.customer_id]) + "?from=2025-07-01"
+        first = auth_client.get(url).json()
+
+        # Only the report versions are read from the database.
+        with django_assert_num_queries(1):
+            second = auth_client.get(url).json()
+
+        assert first == second
+        stats = auth_client.get(reverse("report_cache_stats")).json()
+        assert stats == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    def test_date_range_is_part_of_the_key(self, auth_client):
+        url = reverse("customer_summary", args=[self.customer_id])
+        assert auth_client.get(url).json()["total_spent_pln"] == 40.0
+        assert auth_client.get(url + "?from=2025-07-02").json()["total_spent_pln"] == 0
+
+    def test_upload_invalidates_only_affected_reports(self, auth_client, django_capture_on_commit_callbacks):
+        customer_url = reverse("customer_summary", args=[self.customer_id])
+        other_url = reverse("customer_summary", args=[self.other_customer_id])
+        product_url = reverse("product_summary", args=[self.product_id])
+        for url in (customer_url, other_url, product_url):
+            auth_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.upload(self.customer_id, "5.00")
+
+        assert auth_client.get(customer_url).json()["total_spent_pln"] == 60.0
+        assert auth_client.get(product_url).json()["total_revenue_pln"] == 100.0
+        auth_client.get(other_url)
+        assert auth_client.get(reverse("report_cache_stats")).json()["hits"] == 1
+
+    def test_deleting_transaction_invalidates_reports(self, auth_client, django_capture_on_commit_callbacks):
+        url = reverse("customer_summary", args=[self.customer_id])
+        auth_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Transaction.objects.filter(customer_id=self.customer_id).delete()
+
+        assert auth_client.get(url).json()["unique_products"] == 0
+
+    def test_rebuilding_rollups_invalidates_all_reports(self, auth_client, django_capture_on_commit_callbacks):
+        url = reverse("customer_summary", args=[self.customer_id])
+        assert auth_client.get(url).json()["total_spent_pln"] == 40.0
+        # Loaded outside the application, without updating the rollups or the report versions.
+        Transaction.objects.bulk_create([self.build_transaction(self.customer_id)])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            rebuild_rollups()
+
+        assert auth_client.get(url).json()["total_spent_pln"] == 80.0
+
+    def test_versions_are_shared_through_the_database(self, auth_client):
+        url = reverse("product_summary", args=[self.product_id])
+        auth_client.get(url)
+
+        # What a bump made by another process, e.g. the import worker, leaves behind.
+        bump_versions(product_ids=[self.product_id])
+
+        auth_client.get(url)
+        assert ReportVersion.objects.get(kind=PRODUCT, entity_id=self.product_id).version > 0
+        assert auth_client.get(reverse("report_cache_stats")).json()["hits"] == 0
+
+    def test_file_based_backend(self, auth_client, settings, tmp_path, django_capture_on_commit_callbacks):
+        settings.CACHES = {
+            **settings.CACHES,
+            "reports": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)},
+        }
+        url = reverse("product_summary", args=[self.product_id])
+
+        assert auth_client.get(url).json()["total_revenue_pln"] == 80.0
+        with django_capture_on_commit_callbacks(execute=True):
+            self.upload(self.other_customer_id, "2.50")
+        assert auth_client.get(url).json()["total_revenue_pln"] == 90.0
+        assert auth_client.get(url).json()["total_revenue_pln"] == 90.0
+
+        assert auth_client.get(reverse("report_cache_stats")).json()["hits"] == 1
@@ -0,0 +1,164 @@
+import io
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+from django.urls import reverse
+
+from reports.models import DailyTransactionRollup
+from reports.summaries import summary_rows
+from reports.utils import parse_timestamp
+from transactions.ingest import ingest_rows
+from transactions.models import Transaction
+
+
+def rollup_snapshot():
+    return sorted(
+        DailyTransactionRollup.objects.values_list(
+            "customer_id",
+            "product_id",
+            "day",
+            "currency",
+            "total_amount",
+            "total_quantity",
+            "transaction_count",
+            "last_timestamp",
+        )
+    )
+
+
+def transactions_snapshot():
+    return sorted(
+        Transaction.objects.annotate(day=TruncDate("timestamp"))
+        .values_list("customer_id", "product_id", "day", "currency")
+        .annotate(Sum("amount"), Sum("quantity"), Count("transaction_id"), Max("timestamp"))
+        .order_by()
+    )
+
+
+@pytest.mark.django_db
+class TestDailyTransactionRollups:
+
+    def setup_method(self):
+        self.customers = [uuid4() for _ in range(3)]
+        self.products = [uuid4() for _ in range(3)]
+        self.start = datetime(2025, 7, 1, 22, 0, tzinfo=dt_timezone.utc)
+
+    def make_rows(self, count):
+        return [
+            {
+                "transaction_id": str(uuid4()),
+                "timestamp": (self.start + timedelta(hours=i * 5)).isoformat(),
+                "amount": f"{10 + i}.25",
+                "currency": "USD" if i % 2 else "EUR",
+                "customer_id": str(self.customers[i % 3]),
+                "product_id": str(self.products[i % 2]),
+                "quantity": str(i + 1),
+            }
+            for i in range(count)
+        ]
+
+    def test_batch_ingest_updates_rollups(self):
+        ingest_rows(self.make_rows(20), batch_size=7, backend="batch")
+
+        assert DailyTransactionRollup.objects.exists()
+        assert rollup_snapshot() == transactions_snapshot()
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY requires PostgreSQL")
+    def test_copy_ingest_updates_rollups(self):
+        rows = self.make_rows(20)
+        ingest_rows(rows[:5], backend="copy")
+
+        ingest_rows(rows, backend="copy")
+
+        assert rollup_snapshot() == transactions_snapshot()
+
+    def test_other_databases_update_rollups_with_the_orm(self, monkeypatch):
+        if connection.vendor == "postgresql":
+            # Dispatches the rollup code to its ORM path while the queries still run on PostgreSQL.
+            monkeypatch.setattr(connection, "vendor", "other")
+        rows = self.make_rows(20)
+        ingest_rows(rows[:5], batch_size=7, backend="batch")
+        ingest_rows(rows, batch_size=7, backend="batch")
+        assert rollup_snapshot() == transactions_snapshot()
+
+        DailyTransactionRollup.objects.filter(day__gte="2025-07-02").delete()
+        call_command("rebuild_rollups", "--from", "2025-07-02", stdout=io.StringIO())
+
+        assert rollup_snapshot() == transactions_snapshot()
+
+    def test_single_saves_and_deletes_update_rollups(self):
+        transaction = Transaction.objects.create(
+            timestamp=self.start,
+            amount=Decimal("5.00"),
+            currency="USD",
+            customer_id=self.customers[0],
+            product_id=self.products[0],
+            quantity=1,
+        )
+        assert rollup_snapshot() == transactions_snapshot()
+
+        transaction.timestamp = self.start + timedelta(days=3)
+        transaction.amount = Decimal("7.50")
+        transaction.save()
+        assert rollup_snapshot() == transactions_snapshot()
+        assert DailyTransactionRollup.objects.get().day == (self.start + timedelta(days=3)).date()
+
+        transaction.delete()
+        assert rollup_snapshot() == []
+
+    def test_rebuild_command(self):
+        ingest_rows(self.make_rows(20))
+        expected = rollup_snapshot()
+        DailyTransactionRollup.objects.all().delete()
+
+        call_command("rebuild_rollups", stdout=io.StringIO())
+
+        assert rollup_snapshot() == expected
+
+    def test_rebuild_command_with_date_range(self):
+        ingest_rows(self.make_rows(20))
+        expected = rollup_snapshot()
+        DailyTransactionRollup.objects.filter(day__gte="2025-07-02", day__lte="2025-07-03").delete()
+
+        call_command("rebuild_rollups", "--from", "2025-07-02", "--to", "2025-07-03", stdout=io.StringIO())
+
+        assert rollup_snapshot() == expected
+
+    @pytest.mark.parametrize("option", ["--from", "--to"])
+    @pytest.mark.parametrize("value", ["2025-02-30", "2025-13-01", "yesterday"])
+    def test_rebuild_command_rejects_invalid_dates(self, option, value):
+        with pytest.raises(CommandError, match=f"Invalid date '{value}'"):
+            call_command("rebuild_rollups", option, value, stdout=io.StringIO())
+
+    @pytest.mark.parametrize(
+        "params",
+        ["", "?from=2025-07-02", "?from=2025-07-02&to=2025-07-03", "?from=2025-07-02T05:00:00&to=2025-07-03T10:00:00"],
+    )
+    def test_reports_match_transaction_scan(self, auth_client, settings, params):
+        ingest_rows(self.make_rows(20))
+        urls = [
+            reverse("customer_summary", args=[self.customers[0]]) + params,
+            reverse("product_summary", args=[self.products[1]]) + params,
+        ]
+
+        from_rollups = [auth_client.get(url).json() for url in urls]
+        settings.REPORTS_USE_ROLLUPS = False
+        from_transactions = [auth_client.get(url).json() for url in urls]
+
+        assert from_rollups == from_transactions
+        assert from_rollups[0]["unique_products"] > 0
+
+    def test_partial_days_fall_back_to_transactions(self, settings):
+        settings.REPORTS_USE_ROLLUPS = True
+        whole_days = summary_rows(parse_timestamp("2025-07-02"), parse_timestamp("2025-07-03", end=True))
+        partial_day = summary_rows(parse_timestamp("2025-07-02T05:00:00"), None)
+
+        assert whole_days.model is DailyTransactionRollup
+        assert partial_day.model is Transaction
@@ -0,0 +1,96 @@
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client
+from django.urls import reverse
+
+from transaction_system.middleware import SlowQueryMiddleware
+from transaction_system.slow_queries import SlowQueryLog, slow_query_log
+from transactions.models import Transaction
+
+AUTHORIZATION = f"Bearer {settings.API_AUTH_TOKEN}"
+
+
+@pytest.fixture
+def capture_all(settings):
+    settings.SLOW_QUERY_THRESHOLD_MS = 0.000001
+    slow_query_log.clear()
+    yield
+    slow_query_log.clear()
+
+
+class TestSlowQueryLog:
+
+    def test_keeps_the_newest_entries(self):
+        log = SlowQueryLog(3)
+        for i in range(5):
+            log.append({"sql": str(i)})
+
+        assert [entry["sql"] for entry in log.entries()] == ["4", "3", "2"]
+
+    def test_disabled_without_threshold(self, settings):
+        settings.SLOW_QUERY_THRESHOLD_MS = 0
+
+        with pytest.raises(MiddlewareNotUsed):
+            SlowQueryMiddleware(lambda request: HttpResponse())
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("capture_all")
+class TestSlowQueryCapture:
+
+    def setup_method(self):
+        self.transaction = Transaction.objects.create(
+            timestamp=datetime(2025, 7, 1, 12, tzinfo=dt_timezone.utc),
+            amount=Decimal("10.00"),
+            currency="USD",
+            customer_id=uuid4(),
+            product_id=uuid4(),
+            quantity=1,
+        )
+
+    def test_records_sql_params_view_and_plan(self, auth_client, django_assert_num_queries):
+        url = reverse("transaction_detail", args=[self.transaction.transaction_id])
+
+        with django_assert_num_queries(1):
+            assert auth_client.get(url).status_code == 200
+
+        [entry] = slow_query_log.entries()
+        assert entry["view"] == "transaction_detail"
+        assert entry["sql"].startswith("SELECT")
+        assert [UUID(param) for param in entry["params"]] == [self.transaction.transaction_id]
+        assert entry["duration_ms"] > 0
+        if connection.vendor == "postgresql":
+            assert "Scan" in entry["plan"]
+
+    def test_queries_outside_requests_are_not_recorded(self, auth_client):
+        auth_client.get(reverse("transactions_list"))
+        slow_query_log.clear()
+
+        Transaction.objects.count()
+
+        assert slow_query_log.entries() == []
+
+    def test_async_views_are_recorded(self, async_client, settings):
+        settings.ROOT_URLCONF = "transaction_system.async_urls"
+
+        url = reverse("customer_summary", args=[self.transaction.customer_id])
+        assert async_to_sync(async_client.get)(url, AUTHORIZATION=AUTHORIZATION).status_code == 200
+
+        assert {entry["view"] for entry in slow_query_log.entries()} == {"customer_summary"}
+
+    def test_debug_endpoint(self, auth_client):
+        auth_client.get(reverse("product_summary", args=[self.transaction.product_id]))
+
+        assert Client().get(reverse("slow_queries")).status_code == 403
+        data = auth_client.get(reverse("slow_queries")).json()
+        assert data["threshold_ms"] == 0.000001
+        assert {entry["view"] for entry in data["queries"]} == {"product_summary"}
@@ -0,0 +1,79 @@
+import importlib
+import io
+from datetime import timedelta
+
+import pytest
+from django.apps import apps as global_apps
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from transactions.indexes import index_access_method, time_index_type, time_range_indexes
+from transactions.ingest import ingest_rows
+from transactions.models import Transaction
+
+pytestmark = pytest.mark.skipif(connection.vendor != "postgresql", reason="BRIN indexes require PostgreSQL")
+
+
+def access_methods():
+    with connection.cursor() as cursor:
+        return {index.name: index_access_method(cursor, index.name) for index in time_range_indexes(Transaction)}
+
+
+@pytest.mark.django_db
+class TestTimeRangeIndexes:
+
+    def rebuild(self):
+        output = io.StringIO()
+        call_command("rebuild_time_indexes", stdout=output)
+        return output.getvalue()
+
+    def test_timestamp_and_created_at_are_indexed_with_btree_by_default(self):
+        indexed_fields = {tuple(index.fields) for index in time_range_indexes(Transaction)}
+
+        assert indexed_fields == {("timestamp",), ("created_at",)}
+        assert set(access_methods().values()) == {"btree"}
+
+    @pytest.mark.parametrize("index_type", ["btree", "brin"])
+    def test_migration_only_rebuilds_the_timestamp_index_for_another_type(self, settings, index_type):
+        settings.TRANSACTIONS_TIME_INDEX_TYPE = index_type
+        migration = importlib.import_module("transactions.migrations.0009_time_range_indexes")
+
+        with CaptureQueriesContext(connection) as queries, connection.schema_editor() as schema_editor:
+            migration.forwards(global_apps, schema_editor)
+
+        rebuilt = any("CREATE INDEX" in query["sql"] for query in queries)
+        assert rebuilt == (index_type == "brin")
+        assert access_methods()[migration.TIMESTAMP_INDEX] == index_type
+
+    def test_rebuild_switches_to_brin(self, settings):
+        settings.TRANSACTIONS_TIME_INDEX_TYPE = "brin"
+
+        assert "Rebuilt 2 indexes." in self.rebuild()
+
+        assert set(access_methods().values()) == {"brin"}
+        assert "Rebuilt 0 indexes." in self.rebuild()
+
+    def test_range_query_uses_brin_index(self, settings, make_rows):
+        settings.TRANSACTIONS_TIME_INDEX_TYPE = "brin"
+        self.rebuild()
+        ingest_rows(make_rows(10))
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Transaction._meta.db_table}")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            # `created_at` has no other index, `timestamp` is also covered by the customer/product indexes.
+            queryset = Transaction.objects.filter(created_at__gte=timezone.now() - timedelta(hours=1))
+            plan = queryset.explain()
+
+        assert "Bitmap Index Scan" in plan
+        assert "created_at" in plan
+        assert queryset.count() == 10
+
+    def test_unknown_index_type_is_rejected(self, settings):
+        settings.TRANSACTIONS_TIME_INDEX_TYPE = "hash"
+
+        with pytest.raises(ImproperlyConfigured):
+            time_index_type(connection)
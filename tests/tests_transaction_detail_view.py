@@ -5,6 +5,7 @@ import pytest
 from django.urls import reverse
 from django.utils import timezone
 
+from transactions.cache import LRUCache
 from transactions.models import Transaction
 
 
@@ -48,3 +49,63 @@ class TestTransactionDetailView:
         url = reverse("transaction_detail", args=[self.transaction.transaction_id])
         response = client.get(url)
         assert response.status_code == 403
+
+    def test_repeated_lookup_is_served_from_cache(self, auth_client, django_assert_num_queries):
+        url = reverse("transaction_detail", args=[self.transaction.transaction_id])
+        first = auth_client.get(url).content
+
+        with django_assert_num_queries(0):
+            second = auth_client.get(url).content
+
+        assert first == second
+        stats = auth_client.get(reverse("transaction_detail_cache_stats")).json()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+    def test_edit_evicts_cached_response(self, auth_client):
+        url = reverse("transaction_detail", args=[self.transaction.transaction_id])
+        auth_client.get(url)
+
+        self.transaction.amount = Decimal("25.00")
+        self.transaction.save()
+
+        assert auth_client.get(url).json()["amount"] == "25.00"
+
+    def test_delete_evicts_cached_response(self, auth_client):
+        url = reverse("transaction_detail", args=[self.transaction.transaction_id])
+        auth_client.get(url)
+
+        self.transaction.delete()
+
+        assert auth_client.get(url).status_code == 404
+
+
+class TestLRUCache:
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("transactions.cache.time.monotonic", lambda: now[0])
+        cache = LRUCache(maxsize=10, ttl=5)
+        cache.set("a", 1)
+
+        now[0] += 4
+        assert cache.get("a") == 1
+        now[0] += 2
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(maxsize=0, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") is None
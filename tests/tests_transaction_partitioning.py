@@ -0,0 +1,198 @@
+import io
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from transactions.ingest import ingest_rows
+from transactions.models import Transaction
+from transactions.partitioning import (
+    DEFAULT_PARTITION,
+    ID_TABLE,
+    convert_to_partitioned,
+    convert_to_plain,
+    existing_partitions,
+    is_partitioned,
+    partition_name,
+)
+
+pytestmark = pytest.mark.skipif(connection.vendor != "postgresql", reason="Partitioning requires PostgreSQL")
+
+
+def make_row(timestamp, transaction_id=None):
+    return {
+        "transaction_id": str(transaction_id or uuid4()),
+        "timestamp": timestamp,
+        "amount": "10.00",
+        "currency": "USD",
+        "customer_id": str(uuid4()),
+        "product_id": str(uuid4()),
+        "quantity": "1",
+    }
+
+
+def rows_in(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT count(*) FROM "{table}"')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestTransactionPartitioning:
+
+    def create_partitions(self, first_month):
+        output = io.StringIO()
+        call_command("create_transaction_partitions", "--from", first_month, "--months-ahead", "0", stdout=output)
+        return output.getvalue()
+
+    def model_fields(self, timestamp):
+        return {
+            "timestamp": timestamp,
+            "amount": Decimal("5.00"),
+            "currency": "USD",
+            "customer_id": uuid4(),
+            "product_id": uuid4(),
+            "quantity": 1,
+        }
+
+    def test_table_is_partitioned(self):
+        with connection.cursor() as cursor:
+            assert is_partitioned(cursor)
+            assert DEFAULT_PARTITION in existing_partitions(cursor)
+
+    def test_command_creates_partitions_and_moves_rows_out_of_default(self):
+        ingest_rows([make_row("2025-06-15T10:00:00+00:00"), make_row("2025-07-01T00:00:00+00:00")])
+        assert rows_in(DEFAULT_PARTITION) == 2
+
+        output = self.create_partitions("2025-06")
+
+        with connection.cursor() as cursor:
+            partitions = existing_partitions(cursor)
+        assert {partition_name(date(2025, 6, 1)), partition_name(date(2025, 7, 1))} <= partitions
+        assert f"Created {partition_name(date(2025, 6, 1))}" in output
+        assert rows_in(DEFAULT_PARTITION) == 0
+        assert rows_in(partition_name(date(2025, 7, 1))) == 1
+        assert Transaction.objects.count() == 2
+
+        assert "Created 0 partitions." in self.create_partitions("2025-06")
+
+    def test_command_rejects_invalid_month(self):
+        with pytest.raises(CommandError):
+            self.create_partitions("2025-13")
+
+    def test_range_filtered_queries_prune_partitions(self):
+        self.create_partitions("2025-05")
+
+        plan = Transaction.objects.filter(
+            timestamp__gte=datetime(2025, 7, 1, tzinfo=dt_timezone.utc),
+            timestamp__lt=datetime(2025, 7, 15, tzinfo=dt_timezone.utc),
+        ).explain()
+
+        assert partition_name(date(2025, 7, 1)) in plan
+        assert partition_name(date(2025, 6, 1)) not in plan
+        assert DEFAULT_PARTITION not in plan
+
+    @pytest.mark.parametrize("backend", ["batch", "copy"])
+    def test_duplicate_id_in_another_partition_is_rejected(self, backend):
+        self.create_partitions("2025-06")
+        transaction_id = uuid4()
+        ingest_rows([make_row("2025-06-15T10:00:00+00:00", transaction_id)], backend=backend)
+
+        result = ingest_rows(
+            [make_row("2025-07-15T10:00:00+00:00", transaction_id), make_row("2025-07-16T10:00:00+00:00")],
+            backend=backend,
+        )
+
+        assert (result.inserted, result.duplicates, result.errors) == (1, 1, [])
+        assert Transaction.objects.filter(transaction_id=transaction_id).count() == 1
+
+    def test_duplicate_ids_within_a_batch_are_rejected(self):
+        transaction_id = uuid4()
+        rows = [
+            make_row("2025-06-15T10:00:00+00:00", transaction_id),
+            make_row("2025-07-15T10:00:00+00:00", transaction_id),
+        ]
+
+        result = ingest_rows(rows, backend="batch")
+
+        assert (result.inserted, result.duplicates, result.errors) == (1, 1, [])
+
+    def test_duplicate_id_with_another_timestamp_is_rejected(self):
+        self.create_partitions("2025-06")
+        transaction_obj = Transaction.objects.create(**self.model_fields(datetime(2025, 6, 15, tzinfo=dt_timezone.utc)))
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Transaction.objects.create(
+                transaction_id=transaction_obj.transaction_id,
+                **self.model_fields(datetime(2025, 7, 15, tzinfo=dt_timezone.utc)),
+            )
+
+        assert Transaction.objects.get(pk=transaction_obj.pk).timestamp == transaction_obj.timestamp
+
+    def test_ids_are_released_by_delete_and_truncate(self):
+        timestamp = datetime(2025, 6, 15, tzinfo=dt_timezone.utc)
+        transaction_obj = Transaction.objects.create(**self.model_fields(timestamp))
+        transaction_obj.delete()
+        Transaction.objects.create(transaction_id=transaction_obj.transaction_id, **self.model_fields(timestamp))
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE "{Transaction._meta.db_table}"')
+        Transaction.objects.create(transaction_id=transaction_obj.transaction_id, **self.model_fields(timestamp))
+
+        assert rows_in(ID_TABLE) == 1
+
+    def test_partitions_created_later_keep_ids_unique(self):
+        transaction_id = uuid4()
+        ingest_rows([make_row("2025-06-15T10:00:00+00:00", transaction_id)])
+        self.create_partitions("2025-06")
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Transaction.objects.create(
+                transaction_id=transaction_id, **self.model_fields(datetime(2025, 8, 1, tzinfo=dt_timezone.utc))
+            )
+        assert rows_in(ID_TABLE) == 1
+
+    def test_conversion_leaves_outliers_in_the_default_partition(self):
+        with connection.cursor() as cursor:
+            convert_to_plain(cursor)
+        now = timezone.now()
+        rows = [make_row(now.isoformat()), make_row("1990-01-01T00:00:00+00:00"), make_row("2999-01-01T00:00:00+00:00")]
+        ingest_rows(rows)
+
+        with connection.cursor() as cursor:
+            convert_to_partitioned(cursor, months_ahead=1, months_back=2)
+            partitions = existing_partitions(cursor)
+
+        # Two months back, the current month, one month ahead and the default partition.
+        assert len(partitions) == 5
+        assert partition_name(now.date()) in partitions
+        assert rows_in(DEFAULT_PARTITION) == 2
+        assert rows_in(ID_TABLE) == 3
+
+    def test_model_api_moves_rows_between_partitions(self):
+        self.create_partitions("2025-06")
+        transaction_obj = Transaction.objects.create(
+            timestamp=datetime(2025, 6, 15, tzinfo=dt_timezone.utc),
+            amount=Decimal("5.00"),
+            currency="USD",
+            customer_id=uuid4(),
+            product_id=uuid4(),
+            quantity=1,
+        )
+
+        transaction_obj.timestamp = datetime(2025, 7, 15, tzinfo=dt_timezone.utc)
+        transaction_obj.save()
+
+        assert Transaction.objects.get(pk=transaction_obj.pk).timestamp == transaction_obj.timestamp
+        assert rows_in(partition_name(date(2025, 6, 1))) == 0
+        assert rows_in(partition_name(date(2025, 7, 1))) == 1
+        assert rows_in(ID_TABLE) == 1
+
+        transaction_obj.delete()
+        assert not Transaction.objects.exists()
+        assert rows_in(ID_TABLE) == 0
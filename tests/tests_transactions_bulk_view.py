@@ -0,0 +1,180 @@
+import json
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from transactions.models import Transaction
+
+
+def make_record(**overrides):
+    record = {
+        "transaction_id": str(uuid4()),
+        "timestamp": datetime(2025, 7, 1, 12, tzinfo=dt_timezone.utc).isoformat(),
+        "amount": "10.00",
+        "currency": "USD",
+        "customer_id": str(uuid4()),
+        "product_id": str(uuid4()),
+        "quantity": 1,
+    }
+    record.update(overrides)
+    return record
+
+
+def ndjson(records):
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+@pytest.mark.django_db
+class TestBulkIngestView:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.url = reverse("bulk_ingest_transactions")
+
+    def post(self, client, body, content_type="application/json"):
+        return client.post(self.url, data=body, content_type=content_type)
+
+    def test_json_array(self, auth_client):
+        records = [make_record(), make_record(amount=12.5)]
+
+        response = self.post(auth_client, json.dumps(records))
+
+        assert response.status_code == 201
+        assert response.json() == {"received": 2, "inserted": 2, "duplicates": 0, "errors": []}
+        assert Transaction.objects.get(transaction_id=records[1]["transaction_id"]).amount == Decimal("12.50")
+
+    def test_ndjson(self, auth_client):
+        records = [make_record() for _ in range(5)]
+
+        response = self.post(auth_client, ndjson(records), content_type="application/x-ndjson")
+
+        assert response.status_code == 201
+        assert response.json()["inserted"] == 5
+        assert Transaction.objects.count() == 5
+
+    def test_amounts_are_not_rounded_through_floats(self, auth_client):
+        record = make_record()
+        body = json.dumps([record]).replace('"10.00"', "1234567890.15")
+
+        self.post(auth_client, body)
+
+        assert Transaction.objects.get().amount == Decimal("1234567890.15")
+
+    def test_errors_are_reported_per_record_and_duplicates_counted(self, auth_client):
+        existing = make_record()
+        self.post(auth_client, json.dumps([existing]))
+        records = [make_record(), make_record(currency="GBP"), existing, "not an object", make_record(quantity=None)]
+
+        response = self.post(auth_client, ndjson(records))
+
+        data = response.json()
+        assert (data["received"], data["inserted"], data["duplicates"]) == (5, 1, 1)
+        assert [error["index"] for error in data["errors"]] == [1, 3, 4]
+        assert data["errors"][0]["record"] == {**records[1], "quantity": "1"}
+        assert data["errors"][1]["error"] == "['Record must be a JSON object.']"
+
+    def test_booleans_are_not_numbers(self, auth_client):
+        records = [make_record(quantity=True), make_record(amount=False), make_record(quantity=[1])]
+
+        response = self.post(auth_client, json.dumps(records))
+
+        assert response.json()["inserted"] == 0
+        assert [error["error"] for error in response.json()["errors"]] == [
+            "['quantity must be a number or a string, not bool.']",
+            "['amount must be a number or a string, not bool.']",
+            "['quantity must be a number or a string, not list.']",
+        ]
+        assert not Transaction.objects.exists()
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="Rollups are upserted per batch on PostgreSQL only")
+    def test_batches_are_streamed_into_the_pipeline(self, auth_client, settings, django_assert_max_num_queries):
+        settings.TRANSACTIONS_UPLOAD_BATCH_SIZE = 50
+        settings.TRANSACTIONS_INGEST_BACKEND = "batch"
+        records = [make_record() for _ in range(200)]
+
+        # One duplicate check, one INSERT and one rollup upsert per batch, plus the SAVEPOINT/RELEASE pair.
+        with django_assert_max_num_queries(4 * 5):
+            response = self.post(auth_client, json.dumps(records))
+
+        assert response.json()["inserted"] == 200
+
+    def test_body_larger_than_data_upload_limit(self, auth_client, settings):
+        settings.DATA_UPLOAD_MAX_MEMORY_SIZE = 1024
+        records = [make_record() for _ in range(50)]
+
+        response = self.post(auth_client, json.dumps(records))
+
+        assert response.status_code == 201
+        assert response.json()["inserted"] == 50
+
+    @pytest.mark.parametrize("body", ["[{}", '[{"a": 1} {"b": 2}]', '{"a": 1}\n{oops}\n', "[1,]"])
+    def test_invalid_json(self, auth_client, body):
+        response = self.post(auth_client, body)
+
+        assert response.status_code == 400
+        assert "error" in response.json()
+
+    def test_utf8_byte_order_mark_is_skipped(self, auth_client):
+        body = "\ufeff" + json.dumps([make_record()])
+
+        response = self.post(auth_client, body.encode("utf-8"))
+
+        assert response.status_code == 201
+        assert response.json()["inserted"] == 1
+
+    def test_body_not_utf8_reports_what_was_stored(self, auth_client, settings):
+        settings.TRANSACTIONS_UPLOAD_BATCH_SIZE = 2
+        settings.TRANSACTIONS_INGEST_BACKEND = "batch"
+        # The invalid byte starts the second chunk read from the body, after the records have been stored.
+        body = ndjson([make_record(), make_record()]).ljust(64 * 1024, "\n").encode() + b'{"currency": "\xff"}\n'
+
+        response = self.post(auth_client, body, content_type="application/x-ndjson")
+
+        assert response.status_code == 400
+        assert response.json() == {
+            "error": "Body is not valid UTF-8: invalid start byte.",
+            "received": 2,
+            "inserted": 2,
+            "duplicates": 0,
+            "errors": [],
+        }
+
+    @pytest.mark.parametrize("backend", ["batch", "copy"])
+    def test_invalid_json_reports_what_was_stored(self, auth_client, settings, backend):
+        if backend == "copy" and connection.vendor != "postgresql":
+            pytest.skip("COPY requires PostgreSQL")
+        settings.TRANSACTIONS_UPLOAD_BATCH_SIZE = 2
+        settings.TRANSACTIONS_INGEST_BACKEND = backend
+        records = [make_record(), make_record(currency="GBP"), make_record(), make_record()]
+
+        response = self.post(auth_client, ndjson(records) + "{oops}\n", content_type="application/x-ndjson")
+
+        assert response.status_code == 400
+        data = response.json()
+        stored = Transaction.objects.count()
+        assert (data["inserted"], stored) == ((3, 3) if backend == "batch" else (0, 0))
+        assert data["received"] == (4 if backend == "batch" else 0)
+        assert [error["index"] for error in data["errors"]] == ([1] if backend == "batch" else [])
+        assert "error" in data
+
+    def test_record_size_limit(self, auth_client, settings):
+        settings.TRANSACTIONS_BULK_MAX_RECORD_SIZE = 100
+
+        response = self.post(auth_client, json.dumps([make_record(currency="x" * 200)]))
+
+        assert response.status_code == 400
+        assert response.json() == {
+            "error": "Record 0 is longer than 100 characters.",
+            "received": 0,
+            "inserted": 0,
+            "duplicates": 0,
+            "errors": [],
+        }
+
+    def test_get_not_allowed(self, auth_client):
+        assert auth_client.get(self.url).status_code == 405
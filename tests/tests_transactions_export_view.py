@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from transactions.export import export_chunks
+from transactions.ingest import ingest_rows
+from transactions.models import Transaction
+
+
+@pytest.mark.django_db
+class TestExportTransactionsView:
+
+    def setup_method(self):
+        self.url = reverse("export_transactions")
+        self.customer_id = uuid4()
+        start = datetime(2025, 7, 1, 12, tzinfo=dt_timezone.utc)
+        self.transactions = [
+            Transaction.objects.create(
+                timestamp=start + timedelta(days=i),
+                amount=Decimal(f"{i + 1}.50"),
+                currency="USD",
+                customer_id=self.customer_id if i % 2 else uuid4(),
+                product_id=uuid4(),
+                quantity=i + 1,
+            )
+            for i in range(5)
+        ]
+
+    def content(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export(self, auth_client):
+        response = auth_client.get(self.url)
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        assert [row["transaction_id"] for row in rows] == [str(t.transaction_id) for t in reversed(self.transactions)]
+        assert rows[0]["amount"] == "5.50"
+        assert rows[0]["quantity"] == "5"
+
+    def test_ndjson_export_matches_list_view(self, auth_client):
+        response = auth_client.get(self.url, {"format": "ndjson"})
+
+        assert response["Content-Type"] == "application/x-ndjson"
+        exported = [json.loads(line) for line in self.content(response).splitlines()]
+        listed = auth_client.get(reverse("transactions_list")).json()["transactions"]
+        assert exported == listed
+
+    def test_export_applies_filters(self, auth_client):
+        response = auth_client.get(
+            self.url, {"customer_id": self.customer_id, "from": "2025-07-03", "format": "ndjson"}
+        )
+
+        exported = [json.loads(line) for line in self.content(response).splitlines()]
+        assert [row["transaction_id"] for row in exported] == [str(self.transactions[3].transaction_id)]
+
+    @override_settings(TRANSACTIONS_EXPORT_CHUNK_SIZE=2)
+    def test_export_streams_in_chunks(self, auth_client):
+        response = auth_client.get(self.url)
+
+        chunks = list(response.streaming_content)
+        assert len(chunks) == 4
+        assert chunks[0].decode().strip() == "transaction_id,timestamp,amount,currency,customer_id,product_id,quantity"
+
+    def test_export_can_be_uploaded_again(self, auth_client):
+        content = self.content(auth_client.get(self.url))
+        Transaction.objects.all().delete()
+
+        result = ingest_rows(csv.DictReader(io.StringIO(content)))
+
+        assert result.inserted == 5
+        assert Transaction.objects.count() == 5
+
+    def test_unsupported_format(self, auth_client):
+        response = auth_client.get(self.url, {"format": "xml"})
+
+        assert response.status_code == 400
+        assert response.json() == {"error": "Unsupported format: xml"}
+
+    def test_no_auth_token(self, client):
+        assert client.get(self.url).status_code == 403
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="Server-side cursors require PostgreSQL")
+@pytest.mark.django_db(transaction=True)
+class TestExportCursor:
+
+    def test_first_chunk_is_sent_before_the_result_is_read(self, make_rows):
+        ingest_rows(make_rows(50))
+        chunks = export_chunks(Transaction.objects.order_by("-timestamp"), "ndjson", 10)
+
+        first = next(chunks)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT is_holdable FROM pg_cursors WHERE name LIKE '_django_curs_%%'")
+            # A cursor WITH HOLD is materialized when it is declared, a plain one is read as rows are fetched.
+            assert cursor.fetchall() == [(False,)]
+        assert first.count("\n") == 10
+        assert sum(chunk.count("\n") for chunk in chunks) == 40
@@ -0,0 +1,191 @@
+import io
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.urls import reverse
+
+from reports.models import DailyTransactionRollup
+from transactions.ingest import ingest_rows, parse_executor
+from transactions.models import Transaction
+
+
+@pytest.mark.django_db
+class TestIngestRows:
+
+    def test_inserts_all_valid_rows(self, make_rows):
+        rows = make_rows(25)
+        result = ingest_rows(rows, batch_size=10)
+
+        assert result.inserted == 25
+        assert result.errors == []
+        assert Transaction.objects.count() == 25
+
+    def test_invalid_rows_are_reported_with_line_numbers(self, make_rows):
+        rows = make_rows(12)
+        rows[3]["currency"] = "GBP"
+        rows[7]["amount"] = "not-a-number"
+
+        result = ingest_rows(rows, batch_size=5)
+
+        assert result.inserted == 10
+        assert [error["line"] for error in result.errors] == [5, 9]
+        assert result.errors[0]["row"] == rows[3]
+
+    def test_duplicate_rows_are_counted_separately_from_errors(self, make_rows):
+        rows = make_rows(6)
+        ingest_rows(rows[:2])
+        rows.append(dict(rows[4]))
+        rows[5]["currency"] = "GBP"
+
+        result = ingest_rows(rows, batch_size=3)
+
+        assert result.inserted == 3
+        assert result.duplicates == 3
+        assert [error["line"] for error in result.errors] == [7]
+        assert Transaction.objects.count() == 5
+
+    def test_rows_inserted_concurrently_are_counted_as_duplicates(self, make_rows, monkeypatch):
+        rows = make_rows(10)
+        ingest_rows(rows[2:4])
+        # Another upload inserts the rows after this batch checked for existing ids.
+        monkeypatch.setattr("transactions.ingest._skip_duplicates", lambda valid, result: valid)
+
+        result = ingest_rows(rows, backend="batch")
+
+        assert (result.inserted, result.duplicates, result.errors) == (8, 2, [])
+        assert Transaction.objects.count() == 10
+        assert DailyTransactionRollup.objects.aggregate(count=Sum("transaction_count"))["count"] == 10
+
+    def test_reupload_skips_existing_rows_without_errors(self, make_rows, django_assert_max_num_queries):
+        rows = make_rows(100)
+        ingest_rows(rows)
+
+        # Only the existence query per batch, nothing is inserted.
+        with django_assert_max_num_queries(4):
+            result = ingest_rows(rows, batch_size=25)
+
+        assert (result.inserted, result.duplicates, result.errors) == (0, 100, [])
+
+    def test_parallel_parsing_keeps_line_numbers(self, make_rows):
+        rows = make_rows(40)
+        rows[3]["currency"] = "GBP"
+        rows[31]["customer_id"] = "not-a-uuid"
+
+        result = ingest_rows(rows, batch_size=5, workers=2)
+
+        assert result.inserted == 38
+        assert [error["line"] for error in result.errors] == [5, 33]
+        assert Transaction.objects.count() == 38
+
+    def test_parsing_pool_is_reused_between_uploads(self, make_rows):
+        ingest_rows(make_rows(20), batch_size=5, workers=2)
+        executor = parse_executor(2)
+        processes = set(executor._processes)
+
+        ingest_rows(make_rows(20), batch_size=5, workers=2)
+
+        assert parse_executor(2) is executor
+        assert set(executor._processes) == processes
+        assert executor._mp_context.get_start_method() == "forkserver"
+
+    def test_broken_parsing_pool_is_replaced(self, make_rows):
+        ingest_rows(make_rows(10), batch_size=5, workers=2)
+        executor = parse_executor(2)
+        for process in executor._processes.values():
+            process.kill()
+            process.join()
+
+        with pytest.raises(BrokenProcessPool):
+            ingest_rows(make_rows(10), batch_size=5, workers=2)
+
+        assert ingest_rows(make_rows(10), batch_size=5, workers=2).inserted == 10
+        assert parse_executor(2) is not executor
+
+    def test_progress_is_reported_after_every_batch(self, make_rows):
+        rows = make_rows(5)
+        rows[1]["currency"] = "GBP"
+        progress = []
+
+        ingest_rows(rows, batch_size=2, on_progress=lambda result: progress.append((result.processed, result.inserted)))
+
+        assert progress == [(2, 1), (4, 3), (5, 4)]
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="Rollups are upserted per batch on PostgreSQL only")
+    def test_batch_size_defaults_to_setting(self, make_rows, settings, django_assert_max_num_queries):
+        settings.TRANSACTIONS_UPLOAD_BATCH_SIZE = 50
+        rows = make_rows(200)
+
+        # One duplicate check, one INSERT and one rollup upsert per batch, plus the SAVEPOINT/RELEASE pair.
+        with django_assert_max_num_queries(4 * 5):
+            result = ingest_rows(rows)
+
+        assert result.inserted == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY requires PostgreSQL")
+class TestCopyBackend:
+
+    def test_inserts_all_valid_rows(self, make_rows):
+        rows = make_rows(25)
+        result = ingest_rows(rows, backend="copy")
+
+        assert result.inserted == 25
+        assert result.errors == []
+        transaction = Transaction.objects.get(transaction_id=rows[0]["transaction_id"])
+        assert str(transaction.amount) == "100.00"
+        assert transaction.created_at is not None
+
+    def test_invalid_rows_are_reported_and_duplicates_counted(self, make_rows):
+        rows = make_rows(8)
+        ingest_rows(rows[:1], backend="copy")
+        rows[2]["quantity"] = "-1"
+        rows[5] = dict(rows[4])
+
+        result = ingest_rows(rows, backend="copy")
+
+        assert result.inserted == 5
+        assert result.duplicates == 2
+        assert [error["line"] for error in result.errors] == [4]
+        assert Transaction.objects.count() == 6
+
+    def test_parallel_parsing(self, make_rows):
+        rows = make_rows(30)
+        rows[20]["amount"] = "abc"
+
+        result = ingest_rows(rows, backend="copy", workers=3)
+
+        assert result.inserted == 29
+        assert [error["line"] for error in result.errors] == [22]
+
+    def test_import_command(self, make_rows, make_csv_file, tmp_path):
+        path = tmp_path / "transactions.csv"
+        path.write_bytes(make_csv_file(make_rows(10)).getvalue())
+        out = io.StringIO()
+
+        call_command("import_transactions", str(path), backend="copy", stdout=out)
+
+        assert "Inserted 10 transactions, 0 duplicates, 0 errors." in out.getvalue()
+        assert Transaction.objects.count() == 10
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="Rollups are upserted per batch on PostgreSQL only")
+class TestUploadQueryBudget:
+    ROWS = 2000
+
+    def test_upload_queries_scale_with_batches(
+        self, auth_client, settings, make_rows, make_csv_file, django_assert_max_num_queries
+    ):
+        settings.TRANSACTIONS_UPLOAD_BATCH_SIZE = 500
+        csv_file = make_csv_file(make_rows(self.ROWS))
+
+        # Wall-clock throughput is measured by `benchmarks/bench_ingest.py`, here only the query count per batch.
+        with django_assert_max_num_queries(self.ROWS // settings.TRANSACTIONS_UPLOAD_BATCH_SIZE * 5):
+            response = auth_client.post(reverse("upload_transactions_csv"), {"file": csv_file})
+
+        assert response.status_code == 201
+        assert response.json()["inserted"] == self.ROWS
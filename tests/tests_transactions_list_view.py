@@ -1,12 +1,17 @@
+import re
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
 from decimal import Decimal
 from random import choice, randint
 from uuid import uuid4
 
 import pytest
+from django.db import connection
 from django.urls import reverse
 from django.utils import timezone
 
 from transactions.models import Transaction
+from transactions.pagination import NEXT, PREVIOUS, encode_cursor, keyset_query
 
 
 @pytest.mark.django_db
@@ -53,3 +58,106 @@ class TestTransactionListView:
         assert page == data["current_page"]
         assert data["has_previous"] is True
         assert data["num_pages"] > 1
+
+    def test_cursor_pagination_walks_all_transactions(self, auth_client):
+        url = reverse("transactions_list")
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            data = auth_client.get(url, {"cursor": cursor}).json()
+            seen.extend(transaction["transaction_id"] for transaction in data["transactions"])
+            cursor = data["next_cursor"]
+
+        expected = sorted(self.transactions, key=lambda t: (t.timestamp, t.transaction_id), reverse=True)
+        assert seen == [str(t.transaction_id) for t in expected]
+
+    def test_cursor_pagination_previous_page(self, auth_client):
+        url = reverse("transactions_list")
+        first = auth_client.get(url, {"cursor": ""}).json()
+        second = auth_client.get(url, {"cursor": first["next_cursor"]}).json()
+
+        assert first["prev_cursor"] is None
+        previous = auth_client.get(url, {"cursor": second["prev_cursor"]}).json()
+        assert previous["transactions"] == first["transactions"]
+        assert previous["prev_cursor"] is None
+        assert previous["next_cursor"] == first["next_cursor"]
+
+    def test_cursor_pagination_skips_count_query(self, auth_client, django_assert_num_queries):
+        url = reverse("transactions_list")
+        cursor = auth_client.get(url, {"cursor": ""}).json()["next_cursor"]
+
+        with django_assert_num_queries(1):
+            response = auth_client.get(url, {"cursor": cursor, "customer_id": self.customers[0]})
+
+        assert response.status_code == 200
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="Checks a PostgreSQL query plan")
+    @pytest.mark.parametrize("direction", [NEXT, PREVIOUS])
+    def test_deep_cursor_is_an_index_condition(self, direction):
+        position = sorted(self.transactions, key=lambda t: (t.timestamp, t.transaction_id))[50]
+        queryset, _ = keyset_query(Transaction.objects.all(), encode_cursor(position, direction), 10)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Transaction._meta.db_table}")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        # Without a range bound the cursor is only a filter on rows read from the start of the index.
+        assert re.search(r"Index Cond: .*timestamp", plan)
+
+    def test_invalid_cursor(self, auth_client):
+        response = auth_client.get(reverse("transactions_list"), {"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+        assert response.json()["error"] == "Invalid cursor."
+
+
+@pytest.mark.django_db
+class TestTransactionListFilters:
+
+    def setup_method(self):
+        self.customer_id = uuid4()
+        self.start = datetime(2025, 7, 1, tzinfo=dt_timezone.utc)
+        self.transactions = [
+            Transaction.objects.create(
+                transaction_id=uuid4(),
+                timestamp=self.start + timedelta(hours=12 * i),
+                amount=Decimal(10 * (i + 1)),
+                currency="USD" if i % 2 else "EUR",
+                customer_id=self.customer_id,
+                product_id=uuid4(),
+                quantity=1,
+            )
+            for i in range(10)
+        ]
+
+    def get_ids(self, auth_client, **params):
+        response = auth_client.get(reverse("transactions_list"), params)
+        assert response.status_code == 200
+        return {transaction["transaction_id"] for transaction in response.json()["transactions"]}
+
+    def expected_ids(self, predicate):
+        return {str(t.transaction_id) for t in self.transactions if predicate(t)}
+
+    def test_date_range_is_inclusive_of_whole_days(self, auth_client):
+        ids = self.get_ids(auth_client, **{"from": "2025-07-02", "to": "2025-07-03"})
+        assert ids == self.expected_ids(lambda t: date(2025, 7, 2) <= t.timestamp.date() <= date(2025, 7, 3))
+        assert len(ids) == 4
+
+    def test_datetime_range_is_half_open(self, auth_client):
+        ids = self.get_ids(auth_client, **{"from": "2025-07-01T12:00:00+00:00", "to": "2025-07-02T12:00:00+00:00"})
+        assert ids == {str(self.transactions[1].transaction_id), str(self.transactions[2].transaction_id)}
+
+    def test_amount_and_currency_filters(self, auth_client):
+        ids = self.get_ids(auth_client, min_amount="30", max_amount="80", currency="usd")
+        assert ids == self.expected_ids(lambda t: 30 <= t.amount <= 80 and t.currency == "USD")
+
+    def test_invalid_filter_values_are_ignored(self, auth_client):
+        ids = self.get_ids(auth_client, min_amount="abc", **{"from": "not-a-date"})
+        assert len(ids) == 10
+
+    def test_filters_apply_to_cursor_pagination(self, auth_client):
+        response = auth_client.get(
+            reverse("transactions_list"), {"cursor": "", "from": "2025-07-04", "currency": "EUR"}
+        )
+        ids = {transaction["transaction_id"] for transaction in response.json()["transactions"]}
+        assert ids == self.expected_ids(lambda t: t.timestamp.date() >= date(2025, 7, 4) and t.currency == "EUR")
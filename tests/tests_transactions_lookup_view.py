@@ -0,0 +1,73 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from transactions.models import Transaction
+
+
+@pytest.mark.django_db
+class TestLookupTransactionsView:
+
+    def setup_method(self):
+        self.url = reverse("lookup_transactions")
+        self.transactions = [
+            Transaction.objects.create(
+                transaction_id=uuid4(),
+                timestamp=timezone.now(),
+                amount=Decimal("10.50"),
+                currency="EUR",
+                customer_id=uuid4(),
+                product_id=uuid4(),
+                quantity=3,
+            )
+            for _ in range(5)
+        ]
+
+    def post(self, client, payload):
+        return client.post(self.url, payload, content_type="application/json")
+
+    def test_lookup_returns_found_and_missing(self, auth_client, django_assert_num_queries):
+        missing_id = str(uuid4())
+        requested = [str(t.transaction_id) for t in reversed(self.transactions)] + [missing_id]
+
+        with django_assert_num_queries(1):
+            response = self.post(auth_client, {"transaction_ids": requested})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["transaction_id"] for t in data["transactions"]] == requested[:-1]
+        assert data["missing"] == [missing_id]
+
+    def test_lookup_matches_detail_serialization(self, auth_client):
+        transaction_id = self.transactions[0].transaction_id
+        detail = auth_client.get(reverse("transaction_detail", args=[transaction_id])).json()
+
+        data = self.post(auth_client, {"transaction_ids": [str(transaction_id), str(transaction_id)]}).json()
+
+        assert data["transactions"] == [detail]
+
+    def test_lookup_uses_detail_cache(self, auth_client, django_assert_num_queries):
+        ids = [str(t.transaction_id) for t in self.transactions]
+        self.post(auth_client, {"transaction_ids": ids})
+
+        with django_assert_num_queries(0):
+            data = self.post(auth_client, {"transaction_ids": ids}).json()
+
+        assert len(data["transactions"]) == 5
+
+    def test_lookup_rejects_too_many_ids(self, auth_client, settings):
+        settings.TRANSACTIONS_LOOKUP_MAX_IDS = 3
+        response = self.post(auth_client, {"transaction_ids": [str(t.transaction_id) for t in self.transactions]})
+
+        assert response.status_code == 400
+        assert response.json()["error"] == "At most 3 transaction ids can be requested at once."
+
+    @pytest.mark.parametrize("payload", [{"transaction_ids": ["not-a-uuid"]}, {"transaction_ids": "x"}, {}, []])
+    def test_lookup_rejects_invalid_body(self, auth_client, payload):
+        assert self.post(auth_client, payload).status_code == 400
+
+    def test_no_auth_token(self, client):
+        assert self.post(client, {"transaction_ids": []}).status_code == 403
@@ -0,0 +1,47 @@
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.http import JsonResponse
+from django.urls import reverse
+
+from transactions.models import Transaction
+from transactions.serializers import SERIALIZED_FIELDS, json_response, serialize_row, serialize_transaction
+
+
+@pytest.mark.django_db
+class TestRowSerializer:
+
+    def setup_method(self):
+        self.transaction = Transaction.objects.create(
+            timestamp=datetime(2025, 7, 7, 15, 47, 1, 221109, tzinfo=dt_timezone.utc),
+            amount=Decimal("1250.00"),
+            currency="EUR",
+            customer_id=uuid4(),
+            product_id=uuid4(),
+            quantity=12,
+        )
+
+    def test_row_and_model_serialization_match(self):
+        row = Transaction.objects.values_list(*SERIALIZED_FIELDS).get()
+
+        assert serialize_row(row) == serialize_transaction(Transaction.objects.get())
+
+    def test_json_response_is_byte_identical_to_json_response_class(self):
+        data = {"transactions": [serialize_transaction(self.transaction)], "count": 1, "next": None, "name": "zażółć"}
+
+        fast, default = json_response(data), JsonResponse(data)
+
+        assert fast.content == default.content
+        assert fast["Content-Type"] == default["Content-Type"]
+
+    def test_views_match_model_serialization(self, auth_client):
+        expected = JsonResponse(serialize_transaction(self.transaction)).content
+
+        detail = auth_client.get(reverse("transaction_detail", args=[self.transaction.transaction_id]))
+        listed = auth_client.get(reverse("transactions_list"))
+
+        assert detail.content == expected
+        assert expected in listed.content
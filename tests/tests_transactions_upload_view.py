@@ -1,5 +1,8 @@
+import bz2
 import csv
+import gzip
 import io
+import lzma
 from datetime import datetime
 from decimal import Decimal
 from io import BytesIO
@@ -61,6 +64,7 @@ class TestUploadTransactionsCSV:
         assert response.status_code == 201
         data = response.json()
         assert data["inserted"] == 1
+        assert data["duplicates"] == 0
         assert data["errors"] == []
 
         transaction = Transaction.objects.get(transaction_id=transaction_id)
@@ -69,3 +73,77 @@ class TestUploadTransactionsCSV:
         assert transaction.customer_id == self.customer_id
         assert transaction.product_id == self.product_id
         assert transaction.quantity == 2
+
+    def test_reupload_reports_duplicates(self, auth_client):
+        rows = [
+            {
+                "transaction_id": str(uuid4()),
+                "timestamp": datetime.now().isoformat(),
+                "amount": "10.00",
+                "currency": "USD",
+                "customer_id": str(self.customer_id),
+                "product_id": str(self.product_id),
+                "quantity": "1",
+            }
+            for _ in range(3)
+        ]
+        first = self.create_csv_file(rows[:2])
+        first.name = "transactions.csv"
+        auth_client.post(self.url, {"file": first})
+        second = self.create_csv_file(rows)
+        second.name = "transactions.csv"
+
+        response = auth_client.post(self.url, {"file": second})
+
+        assert response.status_code == 201
+        assert response.json() == {"inserted": 1, "duplicates": 2, "errors": []}
+        assert Transaction.objects.count() == 3
+
+    def compressed_upload(self, compress, name):
+        rows = [
+            {
+                "transaction_id": str(uuid4()),
+                "timestamp": datetime.now().isoformat(),
+                "amount": "10.00",
+                "currency": "USD",
+                "customer_id": str(self.customer_id),
+                "product_id": str(self.product_id),
+                "quantity": "1",
+            }
+            for _ in range(3)
+        ]
+        file = BytesIO(compress(self.create_csv_file(rows).getvalue().encode("utf-8")))
+        file.name = name
+        return file
+
+    @pytest.mark.parametrize(
+        "compress, name",
+        [
+            (gzip.compress, "transactions.csv.gz"),
+            (bz2.compress, "transactions.csv.bz2"),
+            (lzma.compress, "transactions.csv.xz"),
+            (gzip.compress, "transactions.csv"),
+        ],
+    )
+    def test_upload_compressed_csv(self, auth_client, compress, name):
+        response = auth_client.post(self.url, {"file": self.compressed_upload(compress, name)})
+
+        assert response.status_code == 201
+        assert response.json()["inserted"] == 3
+        assert Transaction.objects.count() == 3
+
+    def test_upload_corrupt_compressed_csv(self, auth_client):
+        file = self.compressed_upload(gzip.compress, "transactions.csv.gz")
+        file = BytesIO(file.getvalue()[:-20])
+        file.name = "transactions.csv.gz"
+
+        response = auth_client.post(self.url, {"file": file})
+
+        assert response.status_code == 400
+        assert response.json()["error"].startswith("Invalid compressed file")
+
+    def test_upload_compressed_non_csv(self, auth_client):
+        response = auth_client.post(self.url, {"file": self.compressed_upload(gzip.compress, "transactions.txt.gz")})
+
+        assert response.status_code == 400
+        assert response.json()["error"] == "File is not CSV."
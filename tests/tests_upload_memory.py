@@ -0,0 +1,46 @@
+import tracemalloc
+
+import pytest
+from django.test import RequestFactory
+
+from transactions.models import Transaction
+from transactions.views import upload_transactions_csv
+
+
+@pytest.mark.django_db
+class TestUploadMemory:
+
+    def peak_upload_memory(self, csv_file):
+        """
+        Returns the file size and the peak memory allocated while the view handles the upload of `csv_file`.
+
+        The request body is built before tracing starts, it stands in for the socket the server reads from.
+        """
+        size = len(csv_file.getvalue())
+        request = RequestFactory().post("/transactions/upload/", {"file": csv_file})
+
+        tracemalloc.start()
+        try:
+            response = upload_transactions_csv(request)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert response.status_code == 201
+        return size, peak
+
+    def test_peak_memory_does_not_grow_with_file_size(self, settings, make_rows, make_csv_file):
+        # Spool uploads to a temporary file like production-sized files, and keep batches small.
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 64 * 1024
+        settings.TRANSACTIONS_UPLOAD_BATCH_SIZE = 500
+        settings.TRANSACTIONS_INGEST_BACKEND = "batch"
+
+        self.peak_upload_memory(make_csv_file(make_rows(100)))  # Warms up imports and caches outside the measurement.
+        small_size, small_peak = self.peak_upload_memory(make_csv_file(make_rows(2000)))
+        large_size, large_peak = self.peak_upload_memory(make_csv_file(make_rows(20000)))
+
+        # Reading the whole file into memory would add its size, over 2.5 MB, to the peak. Streaming keeps
+        # it flat, the bound leaves room for allocator and interpreter noise.
+        assert large_size - small_size > 2_500_000
+        assert large_peak - small_peak < 1024 * 1024
+        assert Transaction.objects.count() == 22100
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "transaction_system.settings")
+# Under ASGI the read endpoints run natively async instead of in the thread pool, see `ASYNC_VIEWS`.
+os.environ.setdefault("ASYNC_VIEWS", "true")
 
 application = get_asgi_application()
@@ -0,0 +1,20 @@
+"""
+URL configuration used when `ASYNC_VIEWS` is enabled.
+
+Same routes as `transaction_system.urls`, the read endpoints are served by their async views.
+"""
+
+from django.contrib import admin
+from django.urls import URLPattern, include, path
+
+import reports.urls
+import transactions.urls
+from transaction_system.views import metrics_view, slow_queries_view
+
+urlpatterns: list[URLPattern] = [
+    path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
+    path("debug/slow-queries", slow_queries_view, name="slow_queries"),
+    path("transactions/", include(transactions.urls.async_urlpatterns)),
+    path("reports/", include(reports.urls.async_urlpatterns)),
+]
@@ -0,0 +1,176 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Metrics live in the memory of the process that records them, every worker exposes its own values on
+`/metrics` and the scraper adds them up, as with the Prometheus multi-target setup.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+INGEST_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600)
+
+REGISTRY: list["Metric"] = []
+
+
+def format_labels(names, values, extra=""):
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = sorted(self._values.items())
+            lines += self.render_values(values)
+        return lines
+
+    def render_values(self, values):
+        raise NotImplementedError
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def render_values(self, values):
+        return [f"{self.name}{format_labels(self.labels, key)} {format_value(value)}" for key, value in values]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *label_values, value):
+        # Buckets are stored non-cumulative, so an observation updates one slot, `render` adds them up.
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, *label_values):
+        entry = self._values.get(label_values)
+        return entry[2] if entry else 0
+
+    def render_values(self, values):
+        lines = []
+        for key, (buckets, total, count) in values:
+            cumulative = 0
+            for bound, observed in zip((*self.buckets, "+Inf"), buckets):
+                cumulative += observed
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, key)} {format_value(float(total))}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, key)} {count}")
+        return lines
+
+
+def render():
+    """
+    Returns every registered metric in the Prometheus text format.
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route, method and status.", ("route", "method", "status"))
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time until the view returned a response, by route.", ("route",)
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Size of non-streaming response bodies, by route.", ("route",), SIZE_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries per request, by route.", ("route",), QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Time spent executing database queries per request, by route.", ("route",)
+)
+INGEST_ROWS = Counter(
+    "transactions_ingest_rows_total",
+    "Ingested rows by backend and outcome (inserted, duplicate, error).",
+    ("backend", "outcome"),
+)
+INGEST_DURATION = Histogram(
+    "transactions_ingest_duration_seconds", "Duration of ingest runs, by backend.", ("backend",), INGEST_BUCKETS
+)
+
+
+class QueryStats:
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+# Query statistics of the request being handled. Context variables follow the request into the threads
+# `sync_to_async` runs the ORM in, so async views are counted as well.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def query_stats_wrapper(execute, sql, params, many, context):
+    stats = current_query_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+
+
+def install_query_stats(connection, **kwargs):
+    if query_stats_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_stats_wrapper)
+
+
+connection_created.connect(install_query_stats)
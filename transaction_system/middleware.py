@@ -1,17 +1,116 @@
+import threading
+import time
+from logging import getLogger
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
-from django.http import HttpResponseForbidden
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import OperationalError, connection
+from django.db.backends.signals import connection_created
+from django.http import HttpResponseForbidden, JsonResponse
+from django.urls import Resolver404, resolve
+
+from transaction_system import metrics, slow_queries
+
+logger = getLogger(__name__)
+
+# SQLSTATE of statements cancelled by `statement_timeout`.
+QUERY_CANCELED = "57014"
+
+
+class MetricsMiddleware:
+    """
+    Middleware that records request metrics per route, exposed on `/metrics`.
+
+    Records the request count, the time until the view returned, the response size and the number and
+    duration of database queries. The route label is the URL name, so the label set stays small. Queries
+    are counted by a connection execute wrapper, `DEBUG` is not needed.
+
+    Streaming responses are timed until the view returns them, their body size is not recorded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics.install_query_stats(connection)
+        stats = metrics.QueryStats()
+        token = metrics.current_query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_query_stats.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = metrics.QueryStats()
+        token = metrics.current_query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_query_stats.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    def record(self, request, response, duration, stats):
+        match = request.resolver_match
+        route = (match.url_name or match.route) if match else "unmatched"
+        metrics.REQUESTS.inc(route, request.method, str(response.status_code))
+        metrics.REQUEST_DURATION.observe(route, value=duration)
+        metrics.REQUEST_QUERIES.observe(route, value=stats.count)
+        metrics.REQUEST_DB_DURATION.observe(route, value=stats.duration)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(route, value=len(response.content))
 
 
 class AuthorizationTokenMiddleware:
     """
     Middleware that checks if the Authorization header is present
     and contains a valid token.
+
+    Supports both sync and async requests, so it does not force async views through a thread.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if (response := self.reject(request)) is not None:
+            return response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if (response := self.reject(request)) is not None:
+            return response
+        return await self.get_response(request)
+
+    def reject(self, request):
+        """
+        Returns a 403 response if the request is not authorized, otherwise None.
+        """
+        if request.path_info in settings.AUTH_EXEMPT_PATHS:
+            return None
+
         authorization_header = request.headers.get("Authorization")
 
         if not authorization_header:
@@ -29,4 +128,179 @@ class AuthorizationTokenMiddleware:
 
         if token != valid_token:
             return HttpResponseForbidden("Invalid token.")
-        return self.get_response(request)
+        return None
+
+
+class AdmissionControlMiddleware:
+    """
+    Middleware that applies the per-route limits from `ADMISSION_CONTROL`.
+
+    - Caps the number of requests a route serves at once in this process. Requests over the cap are not
+      queued, they get an immediate 503 with a `Retry-After` header, so a burst of slow reports cannot take
+      every worker and database connection away from the cheap endpoints.
+    - Sets the Postgres `statement_timeout` of the connection while the view runs. A query that runs over
+      it is cancelled and the request gets a 503 as well.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limits = settings.ADMISSION_CONTROL
+        self.semaphores = {
+            route: threading.BoundedSemaphore(limit["max_concurrent"])
+            for route, limit in self.limits.items()
+            if limit.get("max_concurrent")
+        }
+        # A request that has not touched the database yet gets its timeout when the connection is opened.
+        connection_created.connect(apply_statement_timeout)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        route = request.admission_route = self.route_name(request)
+        if route not in self.limits:
+            return self.get_response(request)
+
+        semaphore = self.semaphores.get(route)
+        if semaphore and not semaphore.acquire(blocking=False):
+            return self.overloaded(route)
+        try:
+            timeout = self.limits[route].get("statement_timeout_ms")
+            if not timeout:
+                return self.get_response(request)
+            set_statement_timeout(timeout)
+            try:
+                return self.get_response(request)
+            finally:
+                set_statement_timeout(None)
+        finally:
+            if semaphore:
+                semaphore.release()
+
+    async def __acall__(self, request):
+        route = request.admission_route = self.route_name(request)
+        if route not in self.limits:
+            return await self.get_response(request)
+
+        semaphore = self.semaphores.get(route)
+        if semaphore and not semaphore.acquire(blocking=False):
+            return self.overloaded(route)
+        try:
+            timeout = self.limits[route].get("statement_timeout_ms")
+            if not timeout:
+                return await self.get_response(request)
+            # The async ORM runs queries in the thread sensitive executor, set the timeout on that thread's connection.
+            await sync_to_async(set_statement_timeout)(timeout)
+            try:
+                return await self.get_response(request)
+            finally:
+                await sync_to_async(set_statement_timeout)(None)
+        finally:
+            if semaphore:
+                semaphore.release()
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, OperationalError) and getattr(exception.__cause__, "sqlstate", None) == QUERY_CANCELED:
+            route = getattr(request, "admission_route", None)
+            logger.warning(f"Query time budget exceeded on {route}: {request.get_full_path()}")
+            return self.unavailable("Query time budget exceeded, narrow the date range or retry later.")
+        return None
+
+    def route_name(self, request):
+        try:
+            return resolve(request.path_info, getattr(request, "urlconf", None)).url_name
+        except Resolver404:
+            return None
+
+    def overloaded(self, route):
+        logger.warning(f"Rejected request to {route}: concurrency limit reached")
+        return self.unavailable("Too many concurrent requests, retry later.")
+
+    def unavailable(self, message):
+        response = JsonResponse({"error": message}, status=503)
+        response["Retry-After"] = str(settings.ADMISSION_RETRY_AFTER)
+        return response
+
+
+def set_statement_timeout(timeout_ms):
+    """
+    Sets the Postgres `statement_timeout` of the current connection, or resets it to the server default.
+
+    Does not connect on its own. An open connection is updated right away, otherwise `apply_statement_timeout`
+    sets the timeout once the request opens one, so routes answered without a query never connect.
+    """
+    if connection.vendor != "postgresql":
+        return
+    connection.statement_timeout_ms = timeout_ms
+    if connection.connection is None:
+        return
+    if timeout_ms is None:
+        with connection.connection.cursor() as cursor:
+            cursor.execute("RESET statement_timeout")
+    else:
+        apply_statement_timeout(connection)
+
+
+def apply_statement_timeout(connection, **kwargs):
+    """
+    Applies the timeout stored by `set_statement_timeout`, also connected to `connection_created`.
+
+    Runs on the raw connection, like the session settings Django itself applies when connecting, so it does
+    not show up among the queries of the request.
+    """
+    timeout_ms = getattr(connection, "statement_timeout_ms", None)
+    if timeout_ms is None:
+        return
+    with connection.connection.cursor() as cursor:
+        cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+
+
+class SlowQueryMiddleware:
+    """
+    Middleware that records the statements of a request running longer than `SLOW_QUERY_THRESHOLD_MS`,
+    with the view that ran them and their EXPLAIN plan, see `transaction_system.slow_queries`.
+
+    Disabled unless the threshold is set.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+        slow_queries.slow_query_log.resize(settings.SLOW_QUERY_BUFFER_SIZE)
+        # Connections opened later, e.g. by the threads of async views, get the wrapper when they connect.
+        connection_created.connect(slow_queries.install_slow_query_wrapper)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        slow_queries.install_slow_query_wrapper(connection)
+        token = slow_queries.current_capture.set(slow_queries.Capture(self.threshold))
+        try:
+            return self.get_response(request)
+        finally:
+            slow_queries.current_capture.reset(token)
+
+    async def __acall__(self, request):
+        token = slow_queries.current_capture.set(slow_queries.Capture(self.threshold))
+        try:
+            return await self.get_response(request)
+        finally:
+            slow_queries.current_capture.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (capture := slow_queries.current_capture.get()) is not None:
+            capture.view = request.resolver_match.view_name
+        return None
@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "transaction_system.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -54,9 +55,14 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "transaction_system.middleware.AuthorizationTokenMiddleware",
+    "transaction_system.middleware.AdmissionControlMiddleware",
+    "transaction_system.middleware.SlowQueryMiddleware",
 ]
 
-ROOT_URLCONF = "transaction_system.urls"
+# Serve the list, detail and report endpoints with async views, `asgi.py` enables it by default.
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "false").lower() == "true"
+
+ROOT_URLCONF = "transaction_system.async_urls" if ASYNC_VIEWS else "transaction_system.urls"
 
 TEMPLATES = [
     {
@@ -90,6 +96,33 @@ DATABASES = {
     }
 }
 
+# SQLite is supported for local runs and benchmarks. The COPY ingest backend, partitioning, BRIN indexes and
+# statement timeouts need PostgreSQL and are skipped.
+if os.getenv("DATABASE_ENGINE", "postgresql") == "sqlite":
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.getenv("SQLITE_NAME", BASE_DIR / "db.sqlite3"),
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Entries are keyed by versions stored in the database (`reports.ReportVersion`), so a local memory cache
+    # never serves a report older than the last write of any process. Use e.g.
+    # django.core.cache.backends.redis.RedisCache to share report results between workers.
+    "reports": {
+        "BACKEND": os.getenv("REPORTS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("REPORTS_CACHE_LOCATION", "reports"),
+        "TIMEOUT": int(os.getenv("REPORTS_CACHE_TIMEOUT", "300")),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -127,6 +160,9 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Uploaded files, currently CSV files waiting for a background import job.
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", BASE_DIR / "media")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -134,6 +170,95 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 API_AUTH_TOKEN = os.getenv("API_AUTH_TOKEN")
 
+TRANSACTIONS_UPLOAD_BATCH_SIZE = int(os.getenv("TRANSACTIONS_UPLOAD_BATCH_SIZE", "1000"))
+
+# Processes parsing and validating uploaded rows, 1 parses in the request process.
+TRANSACTIONS_INGEST_WORKERS = int(os.getenv("TRANSACTIONS_INGEST_WORKERS", "1"))
+
+# "batch" (multi-row INSERTs through the ORM) or "copy" (PostgreSQL COPY into a staging table).
+TRANSACTIONS_INGEST_BACKEND = os.getenv("TRANSACTIONS_INGEST_BACKEND", "batch")
+
+# Store uploads and let `manage.py run_import_worker` import them, unless the request passes ?async=...
+TRANSACTIONS_UPLOAD_ASYNC = os.getenv("TRANSACTIONS_UPLOAD_ASYNC", "false").lower() == "true"
+
+# A running import job whose worker has not sent a heartbeat for this many seconds is taken over by another
+# worker, at most IMPORT_JOB_MAX_ATTEMPTS times.
+IMPORT_JOB_LEASE_SECONDS = float(os.getenv("IMPORT_JOB_LEASE_SECONDS", "300"))
+IMPORT_JOB_MAX_ATTEMPTS = int(os.getenv("IMPORT_JOB_MAX_ATTEMPTS", "3"))
+# Row errors published while a job runs, the complete list is stored when it finishes.
+IMPORT_JOB_PROGRESS_ERRORS = int(os.getenv("IMPORT_JOB_PROGRESS_ERRORS", "100"))
+
+# In-process LRU of transaction detail responses, 0 disables it. Entries expire after the TTL (seconds),
+# which bounds how long other worker processes can serve a transaction that was edited in the admin.
+TRANSACTIONS_DETAIL_CACHE_SIZE = int(os.getenv("TRANSACTIONS_DETAIL_CACHE_SIZE", "10000"))
+TRANSACTIONS_DETAIL_CACHE_TTL = float(os.getenv("TRANSACTIONS_DETAIL_CACHE_TTL", "300"))
+
+# Longest single record (in characters) the transactions/bulk/ endpoint buffers while parsing a body.
+TRANSACTIONS_BULK_MAX_RECORD_SIZE = int(os.getenv("TRANSACTIONS_BULK_MAX_RECORD_SIZE", str(64 * 1024)))
+
+# Maximum number of ids accepted by the transactions/lookup/ endpoint.
+TRANSACTIONS_LOOKUP_MAX_IDS = int(os.getenv("TRANSACTIONS_LOOKUP_MAX_IDS", "1000"))
+
+# Number of rows the transactions/export/ endpoint fetches from the database cursor at a time.
+TRANSACTIONS_EXPORT_CHUNK_SIZE = int(os.getenv("TRANSACTIONS_EXPORT_CHUNK_SIZE", "2000"))
+
+# Monthly partitions of the transaction table `manage.py create_transaction_partitions` keeps ahead of
+# the current month, rows of later months go to the default partition.
+TRANSACTIONS_PARTITION_MONTHS_AHEAD = int(os.getenv("TRANSACTIONS_PARTITION_MONTHS_AHEAD", "3"))
+
+# Access method of the `timestamp` and `created_at` indexes, "btree" or "brin" (PostgreSQL only). BRIN suits
+# data loaded in time order. Applied when the indexes are created, `manage.py rebuild_time_indexes` switches
+# an existing database.
+TRANSACTIONS_TIME_INDEX_TYPE = os.getenv("TRANSACTIONS_TIME_INDEX_TYPE", "btree")
+TRANSACTIONS_BRIN_PAGES_PER_RANGE = int(os.getenv("TRANSACTIONS_BRIN_PAGES_PER_RANGE", "32"))
+
+# Answer the summary reports from the daily rollups instead of scanning transactions.
+REPORTS_USE_ROLLUPS = os.getenv("REPORTS_USE_ROLLUPS", "true").lower() == "true"
+
+# Cache alias for report responses, entries are invalidated per customer/product on every write.
+REPORTS_CACHE_ALIAS = "reports"
+
+# Record request, database and ingest metrics and serve them on /metrics.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Serve /metrics without the API token, e.g. when only the scraper can reach the port.
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
+
+# Paths AuthorizationTokenMiddleware lets through without a token.
+AUTH_EXEMPT_PATHS = ["/metrics"] if METRICS_PUBLIC else []
+
+# Record statements slower than this many milliseconds with their EXPLAIN plan, 0 disables the capture.
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "0"))
+# Number of slow queries kept per process and served on /debug/slow-queries.
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+
+# Per-route limits applied by AdmissionControlMiddleware, keyed by URL name. `max_concurrent` caps the requests
+# a process serves at once (0 disables the cap), `statement_timeout_ms` is the Postgres statement_timeout
+# set while the view runs (0 disables it). Routes not listed are not limited.
+REPORTS_MAX_CONCURRENT = int(os.getenv("REPORTS_MAX_CONCURRENT", "4"))
+REPORTS_STATEMENT_TIMEOUT_MS = int(os.getenv("REPORTS_STATEMENT_TIMEOUT_MS", "5000"))
+TRANSACTIONS_LIST_MAX_CONCURRENT = int(os.getenv("TRANSACTIONS_LIST_MAX_CONCURRENT", "16"))
+TRANSACTIONS_LIST_STATEMENT_TIMEOUT_MS = int(os.getenv("TRANSACTIONS_LIST_STATEMENT_TIMEOUT_MS", "2000"))
+
+ADMISSION_CONTROL = {
+    "customer_summary": {
+        "max_concurrent": REPORTS_MAX_CONCURRENT,
+        "statement_timeout_ms": REPORTS_STATEMENT_TIMEOUT_MS,
+    },
+    "product_summary": {
+        "max_concurrent": REPORTS_MAX_CONCURRENT,
+        "statement_timeout_ms": REPORTS_STATEMENT_TIMEOUT_MS,
+    },
+    "transactions_list": {
+        "max_concurrent": TRANSACTIONS_LIST_MAX_CONCURRENT,
+        "statement_timeout_ms": TRANSACTIONS_LIST_STATEMENT_TIMEOUT_MS,
+    },
+}
+
+# Seconds sent in the Retry-After header of rejected requests.
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
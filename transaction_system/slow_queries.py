@@ -0,0 +1,137 @@
+"""
+Opt-in capture of slow SQL statements with their EXPLAIN plans.
+
+`SlowQueryMiddleware` marks the requests it handles, `slow_query_wrapper` times their statements and keeps
+the ones over `SLOW_QUERY_THRESHOLD_MS` in a bounded in-process ring buffer, served on `/debug/slow-queries`.
+"""
+
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from logging import getLogger
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = getLogger(__name__)
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+class SlowQueryLog:
+    """
+    Thread-safe ring buffer of the most recent slow queries of this process.
+    """
+
+    def __init__(self, maxlen):
+        self._entries: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def append(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self):
+        """
+        Returns the recorded queries, newest first.
+        """
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def resize(self, maxlen):
+        with self._lock:
+            if self._entries.maxlen != maxlen:
+                self._entries = deque(self._entries, maxlen=maxlen)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_BUFFER_SIZE)
+
+
+class Capture:
+    __slots__ = ("threshold", "view")
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.view = None
+
+
+# Set for requests handled by `SlowQueryMiddleware`, statements outside of them are not timed.
+current_capture: ContextVar[Capture | None] = ContextVar("current_capture", default=None)
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    capture = current_capture.get()
+    if capture is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - started
+    if duration >= capture.threshold:
+        record(context["connection"], sql, params, many, duration, capture.view)
+    return result
+
+
+def record(connection, sql, params, many, duration, view):
+    entry = {
+        "recorded_at": timezone.now().isoformat(),
+        "duration_ms": round(duration * 1000, 3),
+        "view": view,
+        "sql": sql,
+        "params": None if many else serialize_params(params),
+        "plan": None,
+    }
+    if settings.SLOW_QUERY_EXPLAIN and not many:
+        entry["plan"] = explain(connection, sql, params)
+    slow_query_log.append(entry)
+    logger.warning(f"Slow query ({entry['duration_ms']} ms) in {view}: {sql}")
+
+
+def serialize_params(params):
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: str(value) for key, value in params.items()}
+    return [str(value) for value in params]
+
+
+def explain(connection, sql, params):
+    """
+    Returns the plan of a statement without running it, or None where it cannot be explained.
+
+    Runs on a raw cursor of the same connection, so it sees the same transaction and session settings and is
+    neither logged nor timed itself. Inside a transaction it runs in a savepoint, a failing EXPLAIN must not
+    abort the caller's transaction.
+    """
+    if connection.vendor != "postgresql" or not sql.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+
+    savepoint = connection.in_atomic_block
+    # The raw cursor raises the driver's own exceptions, not Django's wrappers.
+    database_error = connection.Database.Error
+    try:
+        with connection.connection.cursor() as cursor:
+            if savepoint:
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE off, VERBOSE off) {sql}", params)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            except database_error as e:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                plan = f"EXPLAIN failed: {e}"
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    except database_error as e:
+        plan = f"EXPLAIN failed: {e}"
+    return plan
+
+
+def install_slow_query_wrapper(connection, **kwargs):
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
@@ -1,8 +1,12 @@
 from django.contrib import admin
 from django.urls import URLPattern, include, path
 
+from transaction_system.views import metrics_view, slow_queries_view
+
 urlpatterns: list[URLPattern] = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
+    path("debug/slow-queries", slow_queries_view, name="slow_queries"),
     path("transactions/", include("transactions.urls")),
     path("reports/", include("reports.urls")),
 ]
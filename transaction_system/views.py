@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from transaction_system.metrics import render
+from transaction_system.slow_queries import slow_query_log
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Returns the metrics of the process that serves the request in the Prometheus text format.
+
+    Responses:
+        200 OK:
+            Request latency, response size and database query histograms per route, and ingest row counters.
+
+    Notes:
+        - Requires the API token unless `METRICS_PUBLIC` is enabled.
+    """
+    return HttpResponse(render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@require_GET
+def slow_queries_view(request):
+    """
+    Returns the slow queries recorded by the process that serves the request, newest first.
+
+    Responses:
+        200 OK:
+            {
+                "threshold_ms": float,
+                "queries": [
+                    {
+                        "recorded_at": str (ISO 8601),
+                        "duration_ms": float,
+                        "view": str | null,
+                        "sql": str,
+                        "params": list | dict | null,
+                        "plan": str | null
+                    },
+                    ...
+                ]
+            }
+
+    Notes:
+        - Capture is enabled with `SLOW_QUERY_THRESHOLD_MS`, the list is empty otherwise.
+        - Always requires the API token, the recorded parameters may contain customer data.
+    """
+    return JsonResponse({"threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS, "queries": slow_query_log.entries()})
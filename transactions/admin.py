@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Transaction
+from .models import ImportJob, Transaction
 
 
 @admin.register(Transaction)
@@ -18,3 +18,11 @@ class TransactionAdmin(admin.ModelAdmin):
     search_fields = ("transaction_id", "customer_id", "product_id")
     list_filter = ("currency", "timestamp", "created_at")
     ordering = ("-timestamp",)
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ("job_id", "file_name", "status", "processed_rows", "inserted", "created_at", "finished_at")
+    list_filter = ("status", "created_at")
+    ordering = ("-created_at",)
+    readonly_fields = ("errors",)
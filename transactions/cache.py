@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU mapping whose entries expire `ttl` seconds after they were stored.
+
+    The cache lives in the memory of a single process. With several workers an eviction only reaches the
+    worker that handled the write, the TTL bounds how long the others may keep serving an older entry.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+            }
+
+
+# Serialized `TransactionDetailView` payloads keyed by transaction_id.
+detail_cache = LRUCache(settings.TRANSACTIONS_DETAIL_CACHE_SIZE, settings.TRANSACTIONS_DETAIL_CACHE_TTL)
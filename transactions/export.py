@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+
+from transactions.ingest import chunked
+from transactions.serializers import SERIALIZED_FIELDS, convert_row, serialize_row
+
+CSV_FORMAT = "csv"
+NDJSON_FORMAT = "ndjson"
+
+CONTENT_TYPES = {
+    CSV_FORMAT: "text/csv",
+    NDJSON_FORMAT: "application/x-ndjson",
+}
+
+
+def csv_chunks(rows, chunk_size):
+    """
+    Yields the CSV export, starting with the header, one string per `chunk_size` rows.
+
+    The columns are the ones the upload endpoint expects, so an export can be imported again.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(SERIALIZED_FIELDS)
+    yield buffer.getvalue()
+
+    for chunk in chunked(rows, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(convert_row(row) for row in chunk)
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(rows, chunk_size):
+    """
+    Yields the NDJSON export, one JSON object per line, one string per `chunk_size` rows.
+    """
+    for chunk in chunked(rows, chunk_size):
+        yield "".join(json.dumps(serialize_row(row)) + "\n" for row in chunk)
+
+
+def export_chunks(queryset, export_format, chunk_size):
+    """
+    Streams `queryset` in the given format.
+
+    Rows are read as tuples with `QuerySet.iterator()`, which uses a server-side cursor on PostgreSQL, so
+    memory use does not depend on the number of exported rows. The cursor is read inside a transaction:
+    in autocommit Django declares it WITH HOLD, and PostgreSQL then computes the whole result before the
+    first row is returned.
+
+    Args:
+        queryset: Filtered and ordered `Transaction` queryset.
+        export_format: `CSV_FORMAT` or `NDJSON_FORMAT`.
+        chunk_size: Number of rows fetched from the cursor and written per yielded string.
+    """
+    with transaction.atomic():
+        rows = queryset.values_list(*SERIALIZED_FIELDS).iterator(chunk_size=chunk_size)
+        if export_format == CSV_FORMAT:
+            yield from csv_chunks(rows, chunk_size)
+        else:
+            yield from ndjson_chunks(rows, chunk_size)
+
+
+async def aexport_chunks(queryset, export_format, chunk_size):
+    """
+    Async version of `export_chunks` for `StreamingHttpResponse` under ASGI.
+
+    Django consumes a sync iterator under ASGI with `sync_to_async(list)`, which reads the whole export
+    into memory before the first byte is sent. Each chunk is instead read with its own `sync_to_async`
+    call, all of them run on the same thread, so the cursor and its transaction stay on one connection.
+    """
+    chunks = export_chunks(queryset, export_format, chunk_size)
+    try:
+        while (chunk := await sync_to_async(next)(chunks, None)) is not None:
+            yield chunk
+    finally:
+        # Closes the cursor and ends the transaction when the client disconnects before the end.
+        await sync_to_async(chunks.close)()
@@ -0,0 +1,48 @@
+from decimal import Decimal, InvalidOperation
+
+from reports.utils import parse_date_range
+
+
+def parse_amount(value):
+    if not value:
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        return None
+
+
+def filter_transactions(queryset, request):
+    """
+    Applies the transaction filters from the request's query string.
+
+    Query Parameters:
+        customer_id (str, optional): UUID of the customer.
+        product_id (str, optional): UUID of the product.
+        from (str, optional): Start date in YYYY-MM-DD or ISO 8601 format, inclusive.
+        to (str, optional): End date in YYYY-MM-DD (inclusive) or ISO 8601 format (exclusive).
+        min_amount (str, optional): Minimum amount, inclusive.
+        max_amount (str, optional): Maximum amount, inclusive.
+        currency (str, optional): Currency code, e.g. USD.
+
+    Invalid dates and amounts are ignored, as in the reports.
+    """
+    if customer_id := request.GET.get("customer_id"):
+        queryset = queryset.filter(customer_id=customer_id)
+    if product_id := request.GET.get("product_id"):
+        queryset = queryset.filter(product_id=product_id)
+
+    start, end = parse_date_range(request)
+    if start:
+        queryset = queryset.filter(timestamp__gte=start)
+    if end:
+        queryset = queryset.filter(timestamp__lt=end)
+
+    if (min_amount := parse_amount(request.GET.get("min_amount"))) is not None:
+        queryset = queryset.filter(amount__gte=min_amount)
+    if (max_amount := parse_amount(request.GET.get("max_amount"))) is not None:
+        queryset = queryset.filter(amount__lte=max_amount)
+    if currency := request.GET.get("currency"):
+        queryset = queryset.filter(currency=currency.strip().upper())
+
+    return queryset
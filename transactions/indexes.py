@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Index
+
+BTREE = "btree"
+BRIN = "brin"
+
+
+def time_index_type(connection):
+    """
+    Returns the access method `TimeRangeIndex` uses on a connection, from `TRANSACTIONS_TIME_INDEX_TYPE`.
+
+    BRIN is a PostgreSQL feature, other databases always get a B-tree.
+    """
+    index_type = settings.TRANSACTIONS_TIME_INDEX_TYPE
+    if index_type not in (BTREE, BRIN):
+        raise ImproperlyConfigured(f"Unknown time index type '{index_type}'. Use '{BTREE}' or '{BRIN}'.")
+    if connection.vendor != "postgresql":
+        return BTREE
+    return index_type
+
+
+class TimeRangeIndex(Index):
+    """
+    Index on a time column whose access method is chosen per deployment when the index is created.
+
+    Rows arrive roughly in time order, so a BRIN index, which stores the min/max value of every block range,
+    answers range scans from a few pages and costs almost nothing to maintain during bulk loads. A B-tree
+    serves single-row lookups and scattered data better. The migrations stay the same for both, switching
+    an existing database is done with `manage.py rebuild_time_indexes`.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if time_index_type(schema_editor.connection) == BTREE:
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+        statement = super().create_sql(model, schema_editor, using=" USING brin", **kwargs)
+        # Summarize new block ranges in autovacuum, otherwise rows appended after the last vacuum are
+        # scanned for every range query.
+        with_params = f"pages_per_range = {settings.TRANSACTIONS_BRIN_PAGES_PER_RANGE}, autosummarize = on"
+        statement.parts["extra"] = f" WITH ({with_params}){statement.parts['extra']}"
+        return statement
+
+
+def time_range_indexes(model):
+    return [index for index in model._meta.indexes if isinstance(index, TimeRangeIndex)]
+
+
+def index_access_method(cursor, name):
+    """
+    Returns the access method ("btree", "brin", ...) of an existing PostgreSQL index, or None if it is missing.
+    """
+    cursor.execute(
+        "SELECT am.amname FROM pg_class idx JOIN pg_am am ON am.oid = idx.relam WHERE idx.oid = to_regclass(%s)",
+        [name],
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
@@ -0,0 +1,399 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from logging import getLogger
+
+import django
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from reports.cache import invalidate_reports
+from reports.rollups import aggregate_sql, apply_transactions, upsert_sql
+from transaction_system.metrics import INGEST_DURATION, INGEST_ROWS
+from transactions.models import TRANSACTION_FIELDS, Transaction
+from transactions.partitioning import SKIP_DUPLICATE_IDS
+
+logger = getLogger(__name__)
+
+BATCH_BACKEND = "batch"
+COPY_BACKEND = "copy"
+
+CUSTOMER_ID_INDEX = TRANSACTION_FIELDS.index("customer_id")
+PRODUCT_ID_INDEX = TRANSACTION_FIELDS.index("product_id")
+
+STAGING_TABLE = "transactions_staging"
+COPY_CHUNK_SIZE = 1000
+
+
+@dataclass
+class IngestResult:
+    processed: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add_error(self, line_number, row, error):
+        self.errors.append({"line": line_number, "row": row, "error": str(error)})
+        logger.error(f"Błąd podczas przetwarzania CSV w linii {line_number} | row={row} | error={error}")
+
+
+def numeric_value(row, field):
+    """
+    Returns `row[field]` when it is a number or a string, as read from a CSV file or a JSON record.
+
+    JSON booleans are rejected, `int(True)` would otherwise store them as 1.
+    """
+    value = row[field]
+    if isinstance(value, bool) or not isinstance(value, (str, int, Decimal)):
+        raise ValidationError(f"{field} must be a number or a string, not {type(value).__name__}.")
+    return value
+
+
+def parse_transaction(row):
+    """
+    Builds a validated, unsaved `Transaction` from a single CSV row or JSON record.
+
+    Uniqueness is not checked here, it is enforced when the batch is inserted.
+    """
+    if not isinstance(row, dict):
+        raise ValidationError("Record must be a JSON object.")
+    transaction_obj = Transaction(
+        transaction_id=uuid.UUID(row["transaction_id"]),
+        timestamp=datetime.fromisoformat(row["timestamp"]),
+        amount=Decimal(numeric_value(row, "amount")),
+        currency=row["currency"].strip().upper(),
+        customer_id=uuid.UUID(row["customer_id"]),
+        product_id=uuid.UUID(row["product_id"]),
+        quantity=int(numeric_value(row, "quantity")),
+    )
+    transaction_obj.full_clean(validate_unique=False)
+    return transaction_obj
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def parse_chunk(numbered_rows):
+    """
+    Parses and validates a chunk of `(line_number, row)` pairs.
+
+    Runs in pool worker processes, so it returns plain field values instead of model instances.
+
+    Returns:
+        List of `(line_number, row, values, error)`, where exactly one of `values` and `error` is set.
+    """
+    parsed = []
+    for line_number, row in numbered_rows:
+        try:
+            transaction_obj = parse_transaction(row)
+        except Exception as e:
+            parsed.append((line_number, row, None, str(e)))
+            continue
+        values = tuple(getattr(transaction_obj, name) for name in TRANSACTION_FIELDS)
+        parsed.append((line_number, row, values, None))
+    return parsed
+
+
+# Process pools parsing rows, by number of workers, see `parse_executor`.
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def parse_executor(workers):
+    """
+    Returns the process pool of this process with `workers` workers, starting it on first use.
+
+    The pool is reused by later uploads, so they don't pay for starting the workers and `django.setup()`.
+    Workers are started by a forkserver instead of forking the caller, which may run other threads, e.g. the
+    heartbeat of an import job, whose locks would be copied into the child in whatever state they are.
+    """
+    with _executors_lock:
+        if workers not in _executors:
+            _executors[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("forkserver"), initializer=django.setup
+            )
+        return _executors[workers]
+
+
+def parse_chunks(rows, chunk_size, workers=None, first_line=2):
+    """
+    Splits rows into chunks and parses them, in a `ProcessPoolExecutor` when more than one worker is configured.
+
+    Chunks are yielded in file order, so line numbers stay correct. At most two chunks per worker are
+    in flight, which keeps memory bounded for very large files. A pool broken by a dead worker is
+    discarded, the next call starts a new one.
+
+    Args:
+        rows: Iterable of dicts keyed by CSV header, in file order.
+        chunk_size: Number of rows per chunk.
+        workers: Number of worker processes, defaults to `TRANSACTIONS_INGEST_WORKERS`.
+        first_line: Number of the first row. Line 1 of a CSV file is the header, so its first row is line 2.
+    """
+    workers = workers or settings.TRANSACTIONS_INGEST_WORKERS
+    chunks = chunked(enumerate(rows, start=first_line), chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield parse_chunk(chunk)
+        return
+
+    executor = parse_executor(workers)
+    pending: deque = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(parse_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    except BrokenProcessPool:
+        with _executors_lock:
+            if _executors.get(workers) is executor:
+                del _executors[workers]
+        raise
+    finally:
+        # The pool outlives this call, chunks of an abandoned upload should not keep its workers busy.
+        for future in pending:
+            future.cancel()
+
+
+def build_transaction(values):
+    return Transaction(**dict(zip(TRANSACTION_FIELDS, values)))
+
+
+def ingest_rows(rows, batch_size=None, backend=None, on_progress=None, workers=None, first_line=2):
+    """
+    Validates and inserts transaction rows.
+
+    Args:
+        rows: Iterable of dicts keyed by CSV header, in file order.
+        batch_size: Number of rows per batch, defaults to `TRANSACTIONS_UPLOAD_BATCH_SIZE`.
+            Only used by the batch backend.
+        backend: "batch" or "copy", defaults to `TRANSACTIONS_INGEST_BACKEND`.
+        on_progress: Optional callable receiving the current `IngestResult` after every committed batch.
+            The copy backend commits once, so it only reports when the load is finished.
+        workers: Number of processes parsing rows, defaults to `TRANSACTIONS_INGEST_WORKERS`.
+        first_line: Line number errors of the first row are reported with, the first CSV row is line 2.
+
+    Returns:
+        IngestResult with the number of inserted and duplicate rows and per-line errors, ordered by line.
+    """
+    backend = backend or settings.TRANSACTIONS_INGEST_BACKEND
+    started = time.perf_counter()
+    if backend == BATCH_BACKEND:
+        result = ingest_rows_in_batches(rows, batch_size, on_progress, workers, first_line)
+    elif backend == COPY_BACKEND:
+        result = ingest_rows_with_copy(rows, workers, first_line)
+        if on_progress:
+            on_progress(result)
+    else:
+        raise ImproperlyConfigured(f"Unknown ingest backend '{backend}'. Use '{BATCH_BACKEND}' or '{COPY_BACKEND}'.")
+
+    INGEST_DURATION.observe(backend, value=time.perf_counter() - started)
+    INGEST_ROWS.inc(backend, "inserted", amount=result.inserted)
+    INGEST_ROWS.inc(backend, "duplicate", amount=result.duplicates)
+    INGEST_ROWS.inc(backend, "error", amount=len(result.errors))
+    return result
+
+
+def ingest_rows_in_batches(rows, batch_size=None, on_progress=None, workers=None, first_line=2):
+    """
+    Validates and inserts transaction rows in batches.
+
+    Every batch is inserted with a single multi-row INSERT inside its own database transaction.
+    Existing rows are never overwritten, so uploads cannot leave stale entries in the transaction detail cache.
+    Rows repeating a transaction_id of the file or of the table are skipped and counted as duplicates, found
+    with an in-memory set of the batch and one existence query per batch, so re-uploading an overlapping
+    file is cheap.
+    When a batch still hits a constraint violation it is rolled back and replayed row by row, so each failing
+    row is reported with its own line number.
+
+    Args:
+        rows: Iterable of dicts keyed by CSV header, in file order.
+        batch_size: Number of rows per batch, defaults to `TRANSACTIONS_UPLOAD_BATCH_SIZE`.
+        on_progress: Optional callable receiving the current `IngestResult` after every batch.
+        workers: Number of processes parsing rows, defaults to `TRANSACTIONS_INGEST_WORKERS`.
+        first_line: Line number errors of the first row are reported with.
+
+    Returns:
+        IngestResult with the number of inserted and duplicate rows and per-line errors.
+    """
+    batch_size = batch_size or settings.TRANSACTIONS_UPLOAD_BATCH_SIZE
+    result = IngestResult()
+
+    for batch in parse_chunks(rows, batch_size, workers, first_line):
+        first_error = len(result.errors)
+        valid = []
+        for line_number, row, values, error in batch:
+            if error is None:
+                valid.append((line_number, row, build_transaction(values)))
+            else:
+                result.add_error(line_number, row, error)
+
+        valid = _skip_duplicates(valid, result)
+        if valid:
+            _insert_batch(valid, result)
+        result.errors[first_error:] = sorted(result.errors[first_error:], key=lambda error: error["line"])
+        result.processed += len(batch)
+        if on_progress:
+            on_progress(result)
+
+    return result
+
+
+def _insert_batch(valid, result):
+    transactions = [transaction_obj for _, _, transaction_obj in valid]
+    try:
+        with transaction.atomic():
+            # Duplicates are already filtered out. If a concurrent upload inserted one of the ids in the
+            # meantime, the batch fails and the row by row retry counts it as a duplicate, so only rows that
+            # were really inserted reach the rollups.
+            Transaction.objects.bulk_create(transactions)
+            apply_transactions(transactions)
+            invalidate_reports({t.customer_id for t in transactions}, {t.product_id for t in transactions})
+        result.inserted += len(valid)
+    except IntegrityError:
+        logger.warning(f"Batch of {len(valid)} rows failed, retrying row by row")
+        _insert_rows_one_by_one(valid, result)
+
+
+def _skip_duplicates(valid, result):
+    """
+    Drops rows whose transaction_id repeats an earlier row of the batch or is already stored, counting them
+    in `result.duplicates`.
+
+    The stored ids of a batch are fetched with one query. Earlier batches of the file are already inserted,
+    so the query also finds repeats across batches, and the in-memory set only has to hold one batch.
+    Uniqueness itself is enforced by the database, through the id table maintained by a trigger on the
+    partitioned table (see `transactions.partitioning`). The check only reports duplicates up front, so a
+    batch with a repeated id is not sent to the database, rejected as a whole and retried row by row.
+    """
+    ids = [transaction_obj.transaction_id for _, _, transaction_obj in valid]
+    seen_ids = set(Transaction.objects.filter(transaction_id__in=ids).values_list("transaction_id", flat=True))
+    accepted = []
+    for line_number, row, transaction_obj in valid:
+        if transaction_obj.transaction_id in seen_ids:
+            result.duplicates += 1
+            continue
+        seen_ids.add(transaction_obj.transaction_id)
+        accepted.append((line_number, row, transaction_obj))
+    return accepted
+
+
+def _insert_rows_one_by_one(valid, result):
+    for line_number, row, transaction_obj in valid:
+        try:
+            with transaction.atomic():
+                # Uniqueness is left to the database, a taken id raises IntegrityError below.
+                transaction_obj.full_clean(validate_unique=False)
+                transaction_obj.save(force_insert=True)
+            result.inserted += 1
+        except IntegrityError as e:
+            if Transaction.objects.filter(transaction_id=transaction_obj.transaction_id).exists():
+                result.duplicates += 1
+            else:
+                result.add_error(line_number, row, e)
+        except Exception as e:
+            result.add_error(line_number, row, e)
+
+
+def ingest_rows_with_copy(rows, workers=None, first_line=2):
+    """
+    Validates rows in Python and streams them into a temporary staging table with PostgreSQL COPY,
+    then moves them into the transaction table with a single set-based INSERT ... SELECT.
+    The same statement adds the inserted rows to the report rollups.
+
+    The whole load runs in one database transaction. Rows that already exist in the table, or repeat a
+    transaction_id seen earlier in the file, are skipped by the merge and counted as duplicates.
+    """
+    if connection.vendor != "postgresql":
+        raise ImproperlyConfigured("The COPY ingest backend requires PostgreSQL.")
+
+    result = IngestResult()
+    staged = 0
+    customer_ids, product_ids = set(), set()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} ("
+            "line integer NOT NULL, transaction_id uuid NOT NULL, timestamp timestamptz NOT NULL, "
+            "amount numeric(12, 2) NOT NULL, currency varchar(3) NOT NULL, customer_id uuid NOT NULL, "
+            "product_id uuid NOT NULL, quantity integer NOT NULL"
+            ")"
+        )
+
+        columns = ", ".join(("line",) + TRANSACTION_FIELDS)
+        # Django's cursor wrapper does not expose COPY, so the underlying psycopg cursor is used.
+        with cursor.cursor.copy(f"COPY {STAGING_TABLE} ({columns}) FROM STDIN") as copy:
+            for chunk in parse_chunks(rows, COPY_CHUNK_SIZE, workers, first_line):
+                for line_number, row, values, error in chunk:
+                    result.processed += 1
+                    if error is not None:
+                        result.add_error(line_number, row, error)
+                        continue
+                    copy.write_row((line_number, *_copy_values(values)))
+                    staged += 1
+                    customer_ids.add(values[CUSTOMER_ID_INDEX])
+                    product_ids.add(values[PRODUCT_ID_INDEX])
+
+        # A concurrent upload may claim an id between the NOT EXISTS check and the insert, skip such rows.
+        cursor.execute("SELECT set_config(%s, 'on', true)", [SKIP_DUPLICATE_IDS])
+        cursor.execute(_merge_sql(), [timezone.get_current_timezone_name()])
+        duplicates = cursor.fetchone()[0]
+        cursor.execute("SELECT set_config(%s, 'off', true)", [SKIP_DUPLICATE_IDS])
+        # Dropped explicitly instead of ON COMMIT DROP, the load may run inside an outer transaction.
+        cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+        invalidate_reports(customer_ids, product_ids)
+
+    result.duplicates = duplicates
+    result.inserted = staged - duplicates
+    result.errors.sort(key=lambda error: error["line"])
+    return result
+
+
+def _copy_values(values):
+    transaction_id, timestamp, *rest = values
+    if timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    return (transaction_id, timestamp, *rest)
+
+
+def _merge_sql():
+    table = connection.ops.quote_name(Transaction._meta.db_table)
+    columns = ", ".join(TRANSACTION_FIELDS)
+    # The first occurrence of a transaction_id in the file wins, every other staged row (a later repeat
+    # or a row already in the table) is a duplicate, the statement returns their number. Existing ids are
+    # checked with NOT EXISTS, the partitioned table's primary key also contains the timestamp.
+    return f"""
+        WITH candidates AS (
+            SELECT DISTINCT ON (transaction_id) line, {columns}
+            FROM {STAGING_TABLE}
+            ORDER BY transaction_id, line
+        ),
+        inserted AS (
+            INSERT INTO {table} ({columns}, created_at)
+            SELECT {columns}, now() FROM candidates
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {table} existing WHERE existing.transaction_id = candidates.transaction_id
+            )
+            ON CONFLICT DO NOTHING
+            RETURNING {columns}
+        ),
+        rollups AS (
+            {upsert_sql(aggregate_sql("inserted"))}
+        )
+        SELECT (SELECT count(*) FROM {STAGING_TABLE}) - (SELECT count(*) FROM inserted)
+    """
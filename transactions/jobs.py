@@ -0,0 +1,138 @@
+import threading
+from datetime import timedelta
+from logging import getLogger
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from transactions.ingest import ingest_rows
+from transactions.models import ImportJob
+from transactions.uploads import csv_rows
+
+logger = getLogger(__name__)
+
+
+def claim_next_job():
+    """
+    Marks the oldest pending job as running and returns it, or None when the queue is empty.
+
+    A running job whose heartbeat is older than `IMPORT_JOB_LEASE_SECONDS` belonged to a worker that died,
+    it is claimed again like a pending job. Uploads are idempotent, so rows its batches already committed are
+    counted as duplicates. A job that lost its worker `IMPORT_JOB_MAX_ATTEMPTS` times is marked as failed.
+
+    `SELECT ... FOR UPDATE SKIP LOCKED` lets several workers poll the same table without picking the same job.
+    """
+    now = timezone.now()
+    stale = Q(
+        status=ImportJob.STATUS_RUNNING, heartbeat_at__lt=now - timedelta(seconds=settings.IMPORT_JOB_LEASE_SECONDS)
+    )
+    with transaction.atomic():
+        ImportJob.objects.filter(stale, attempts__gte=settings.IMPORT_JOB_MAX_ATTEMPTS).update(
+            status=ImportJob.STATUS_FAILED,
+            failure_reason="The import worker stopped responding too many times.",
+            finished_at=now,
+        )
+        job = (
+            ImportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=ImportJob.STATUS_PENDING) | stale)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        if job.status == ImportJob.STATUS_RUNNING:
+            logger.warning(f"Import job {job.job_id} lost its worker, running it again")
+        job.status = ImportJob.STATUS_RUNNING
+        job.started_at = now
+        job.heartbeat_at = now
+        job.attempts += 1
+        job.save(update_fields=["status", "started_at", "heartbeat_at", "attempts"])
+    return job
+
+
+class Heartbeat(threading.Thread):
+    """
+    Refreshes the `heartbeat_at` of a running job in the background, also while a single long batch or
+    COPY load is running. Updates go through the thread's own database connection and commit immediately.
+    """
+
+    def __init__(self, job_id, interval):
+        super().__init__(name=f"import-job-heartbeat-{job_id}", daemon=True)
+        self.job_id = job_id
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                ImportJob.objects.filter(job_id=self.job_id).update(heartbeat_at=timezone.now())
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_job(job):
+    """
+    Imports the stored CSV file of a claimed job, publishing progress after every committed batch.
+
+    Progress updates write the counters and the error count. The list of row errors is rewritten only when a
+    batch adds errors and at most its first `IMPORT_JOB_PROGRESS_ERRORS` entries, the full list is stored once
+    the job finishes.
+    """
+    published_errors = 0
+
+    def report_progress(result):
+        nonlocal published_errors
+        progress = {
+            "processed_rows": result.processed,
+            "inserted": result.inserted,
+            "duplicates": result.duplicates,
+            "error_count": len(result.errors),
+            "heartbeat_at": timezone.now(),
+        }
+        if published_errors < min(len(result.errors), settings.IMPORT_JOB_PROGRESS_ERRORS):
+            progress["errors"] = result.errors[: settings.IMPORT_JOB_PROGRESS_ERRORS]
+            published_errors = len(progress["errors"])
+        ImportJob.objects.filter(job_id=job.job_id).update(**progress)
+
+    heartbeat = Heartbeat(job.job_id, settings.IMPORT_JOB_LEASE_SECONDS / 3)
+    heartbeat.start()
+    try:
+        with job.file.open("rb") as stored_file:
+            result = ingest_rows(csv_rows(stored_file), on_progress=report_progress)
+    except Exception as e:
+        logger.exception(f"Import job {job.job_id} failed")
+        job.status = ImportJob.STATUS_FAILED
+        job.failure_reason = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "failure_reason", "finished_at"])
+        return job
+    finally:
+        heartbeat.stop()
+
+    job.status = ImportJob.STATUS_SUCCEEDED
+    job.processed_rows = result.processed
+    job.inserted = result.inserted
+    job.duplicates = result.duplicates
+    job.errors = result.errors
+    job.error_count = len(result.errors)
+    job.finished_at = timezone.now()
+    job.file.delete(save=False)
+    job.save(
+        update_fields=[
+            "status",
+            "processed_rows",
+            "inserted",
+            "duplicates",
+            "errors",
+            "error_count",
+            "finished_at",
+            "file",
+        ]
+    )
+    return job
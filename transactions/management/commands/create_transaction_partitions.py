@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from transactions.partitioning import add_months, ensure_partitions, is_partitioned, month_start
+
+
+class Command(BaseCommand):
+    help = "Creates the monthly partitions of the transaction table ahead of time, run it e.g. daily from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.TRANSACTIONS_PARTITION_MONTHS_AHEAD,
+            help="Number of months after the current one to create partitions for.",
+        )
+        parser.add_argument("--from", dest="from_month", help="First month to create a partition for, YYYY-MM.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Partitioning requires PostgreSQL.")
+        if options["months_ahead"] < 0:
+            raise CommandError("--months-ahead must not be negative.")
+
+        current = month_start(timezone.now().date())
+        try:
+            first_month = (
+                month_start(datetime.strptime(options["from_month"], "%Y-%m")) if options["from_month"] else current
+            )
+        except ValueError:
+            raise CommandError(f"Invalid month '{options['from_month']}', use YYYY-MM.")
+        last_month = add_months(current, options["months_ahead"])
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not is_partitioned(cursor):
+                raise CommandError("The transaction table is not partitioned, run the migrations first.")
+            created = ensure_partitions(cursor, first_month, last_month)
+
+        for name in created:
+            self.stdout.write(f"Created {name}")
+        self.stdout.write(self.style.SUCCESS(f"Created {len(created)} partitions."))
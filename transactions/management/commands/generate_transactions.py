@@ -0,0 +1,58 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from transactions.ingest import BATCH_BACKEND, COPY_BACKEND
+from transactions.synthetic import generate_rows, load_rows, parse_currency_mix, write_csv
+
+
+class Command(BaseCommand):
+    help = "Generates synthetic transactions with skewed customer/product distributions and loads them in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000, help="Number of transactions.")
+        parser.add_argument("--customers", type=int, default=1000, help="Number of distinct customers.")
+        parser.add_argument("--products", type=int, default=500, help="Number of distinct products.")
+        parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent, 0 for a uniform distribution.")
+        parser.add_argument("--days", type=int, default=365, help="Length of the time span in days.")
+        parser.add_argument("--end", default="2025-08-01", help="Day the time span ends at (exclusive), YYYY-MM-DD.")
+        parser.add_argument("--currencies", default="USD=0.7,EUR=0.3", help="Currency mix, e.g. USD=0.7,EUR=0.3.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, the same seed gives the same rows.")
+        parser.add_argument("--backend", choices=[BATCH_BACKEND, COPY_BACKEND], default=BATCH_BACKEND)
+        parser.add_argument("--batch-size", type=int, default=10000, help="Rows inserted per transaction.")
+        parser.add_argument("--csv", help="Write the rows to this CSV file instead of loading them.")
+
+    def handle(self, *args, **options):
+        try:
+            currency_mix = parse_currency_mix(options["currencies"])
+            end = timezone.make_aware(datetime.combine(datetime.strptime(options["end"], "%Y-%m-%d"), time.min))
+        except ValueError as e:
+            raise CommandError(str(e))
+        if min(options["rows"], options["customers"], options["products"], options["days"]) < 1:
+            raise CommandError("--rows, --customers, --products and --days must be positive.")
+
+        rows = generate_rows(
+            options["rows"],
+            customers=options["customers"],
+            products=options["products"],
+            skew=options["skew"],
+            days=options["days"],
+            end=end,
+            currency_mix=currency_mix,
+            seed=options["seed"],
+        )
+
+        if options["csv"]:
+            with open(options["csv"], "w", newline="", encoding="utf-8") as csv_file:
+                written = write_csv(rows, csv_file)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {written} transactions to {options['csv']}."))
+            return
+
+        def on_progress(inserted):
+            self.stdout.write(f"{inserted}/{options['rows']} transactions inserted")
+
+        inserted = load_rows(
+            rows, backend=options["backend"], batch_size=options["batch_size"], on_progress=on_progress
+        )
+        self.stdout.write(self.style.SUCCESS(f"Inserted {inserted} transactions."))
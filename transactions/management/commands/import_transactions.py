@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from transactions.ingest import BATCH_BACKEND, COPY_BACKEND, ingest_rows
+from transactions.uploads import csv_rows
+
+
+class Command(BaseCommand):
+    help = "Imports transactions from a CSV file, optionally compressed, with the same format as the upload endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the CSV file.")
+        parser.add_argument(
+            "--backend",
+            choices=[BATCH_BACKEND, COPY_BACKEND],
+            help="Ingest backend, defaults to TRANSACTIONS_INGEST_BACKEND.",
+        )
+        parser.add_argument("--batch-size", type=int, help="Rows per batch for the batch backend.")
+        parser.add_argument("--workers", type=int, help="Parser processes, defaults to TRANSACTIONS_INGEST_WORKERS.")
+
+    def handle(self, *args, **options):
+        with open(options["path"], "rb") as csv_file:
+            result = ingest_rows(
+                csv_rows(csv_file),
+                batch_size=options["batch_size"],
+                backend=options["backend"],
+                workers=options["workers"],
+            )
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inserted {result.inserted} transactions, {result.duplicates} duplicates, {len(result.errors)} errors."
+            )
+        )
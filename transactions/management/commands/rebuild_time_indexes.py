@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from transactions.indexes import index_access_method, time_index_type, time_range_indexes
+from transactions.models import Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreates the time range indexes of the transaction table whose access method differs from "
+        "TRANSACTIONS_TIME_INDEX_TYPE. The table is locked against writes while an index is rebuilt."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Index access methods can only be changed on PostgreSQL.")
+
+        index_type = time_index_type(connection)
+        rebuilt = 0
+        for index in time_range_indexes(Transaction):
+            with transaction.atomic(), connection.cursor() as cursor:
+                current = index_access_method(cursor, index.name)
+                if current == index_type:
+                    self.stdout.write(f"{index.name} is already {index_type}")
+                    continue
+                with connection.schema_editor() as schema_editor:
+                    if current is not None:
+                        schema_editor.remove_index(Transaction, index)
+                    schema_editor.add_index(Transaction, index)
+            self.stdout.write(f"Rebuilt {index.name} as {index_type}")
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} indexes."))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from transactions.jobs import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Runs queued CSV import jobs. Several workers can run side by side."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when there are no pending jobs.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+
+            self.stdout.write(f"Running import job {job.job_id} ({job.file_name})")
+            job = run_job(job)
+            self.stdout.write(
+                f"Import job {job.job_id} {job.status}: inserted {job.inserted}, duplicates {job.duplicates}, "
+                f"errors {len(job.errors)}"
+            )
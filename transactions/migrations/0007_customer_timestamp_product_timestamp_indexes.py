@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0006_importjob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["customer_id", "timestamp"], name="transaction_custome_bf8a66_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["product_id", "timestamp"], name="transaction_product_decb82_idx"),
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="transaction_custome_a08692_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="transaction_product_f7931b_idx",
+        ),
+    ]
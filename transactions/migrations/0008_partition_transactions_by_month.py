@@ -0,0 +1,35 @@
+from django.db import migrations
+
+from transactions import partitioning
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if not partitioning.is_partitioned(cursor):
+            partitioning.convert_to_partitioned(cursor)
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if partitioning.is_partitioned(cursor):
+            partitioning.convert_to_plain(cursor)
+
+
+class Migration(migrations.Migration):
+    """
+    Rebuilds the transaction table as a table partitioned by month on `timestamp`.
+
+    Only the database changes, the model state keeps `transaction_id` as primary key.
+    """
+
+    dependencies = [
+        ("transactions", "0007_customer_timestamp_product_timestamp_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:44
+
+import transactions.indexes
+from django.db import migrations, models
+
+TIMESTAMP_INDEX = "transaction_timesta_20dac7_idx"
+
+
+def rebuild_timestamp_index(index, apps, schema_editor):
+    """
+    Recreates the timestamp index only if its access method differs from the one `index` creates, e.g. when
+    TRANSACTIONS_TIME_INDEX_TYPE is "brin". The default B-tree is kept as it is.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    target = transactions.indexes.BTREE
+    if isinstance(index, transactions.indexes.TimeRangeIndex):
+        target = transactions.indexes.time_index_type(connection)
+    with connection.cursor() as cursor:
+        if transactions.indexes.index_access_method(cursor, TIMESTAMP_INDEX) == target:
+            return
+    Transaction = apps.get_model("transactions", "Transaction")
+    schema_editor.remove_index(Transaction, index)
+    schema_editor.add_index(Transaction, index)
+
+
+def forwards(apps, schema_editor):
+    index = transactions.indexes.TimeRangeIndex(fields=["timestamp"], name=TIMESTAMP_INDEX)
+    rebuild_timestamp_index(index, apps, schema_editor)
+
+
+def backwards(apps, schema_editor):
+    rebuild_timestamp_index(models.Index(fields=["timestamp"], name=TIMESTAMP_INDEX), apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+    """
+    Turns the timestamp index into a `TimeRangeIndex`. The existing B-tree is only rebuilt when the
+    configured access method differs, so applying the migration does not lock the table by default.
+    """
+
+    dependencies = [
+        ("transactions", "0008_partition_transactions_by_month"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name="transaction",
+                    name=TIMESTAMP_INDEX,
+                ),
+                migrations.AddIndex(
+                    model_name="transaction",
+                    index=transactions.indexes.TimeRangeIndex(fields=["timestamp"], name=TIMESTAMP_INDEX),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(forwards, backwards),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=transactions.indexes.TimeRangeIndex(fields=["created_at"], name="transaction_created_67ce7b_idx"),
+        ),
+    ]
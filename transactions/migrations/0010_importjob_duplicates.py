@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0009_time_range_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="duplicates",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
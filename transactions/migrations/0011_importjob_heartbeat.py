@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0010_importjob_duplicates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+from transactions import partitioning
+
+
+def enforce_unique_ids(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if partitioning.is_partitioned(cursor) and not partitioning.has_unique_ids(cursor):
+            partitioning.enforce_unique_ids(cursor)
+
+
+def drop_unique_ids(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        partitioning.drop_unique_ids(cursor)
+
+
+class Migration(migrations.Migration):
+    """
+    Enforces unique transaction ids on tables partitioned before `convert_to_partitioned` did it.
+    """
+
+    dependencies = [
+        ("transactions", "0011_importjob_heartbeat"),
+    ]
+
+    operations = [
+        migrations.RunPython(enforce_unique_ids, drop_unique_ids),
+    ]
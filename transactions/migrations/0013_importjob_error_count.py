@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0012_unique_partitioned_transaction_ids"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="error_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -4,6 +4,11 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.dateparse import parse_datetime
 
+from transactions.indexes import TimeRangeIndex
+
+# Columns of a transaction as they appear in uploaded files, the API and bulk `values_list` queries.
+TRANSACTION_FIELDS = ("transaction_id", "timestamp", "amount", "currency", "customer_id", "product_id", "quantity")
+
 
 class Transaction(models.Model):
     CURRENCY_CHOICES = [
@@ -30,9 +35,12 @@ class Transaction(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=["customer_id"]),
-            models.Index(fields=["product_id"]),
-            models.Index(fields=["timestamp"]),
+            # Serve "filter by customer/product, newest first" and its time ranges from a single index scan.
+            models.Index(fields=["customer_id", "timestamp"]),
+            models.Index(fields=["product_id", "timestamp"]),
+            # B-tree or BRIN depending on TRANSACTIONS_TIME_INDEX_TYPE.
+            TimeRangeIndex(fields=["timestamp"]),
+            TimeRangeIndex(fields=["created_at"]),
         ]
 
     def __str__(self):
@@ -50,3 +58,45 @@ class Transaction(models.Model):
             if parsed is None:
                 raise ValidationError({"timestamp": f"Invalid datetime format: {self.timestamp}"})
             self.timestamp = parsed
+
+
+class ImportJob(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file = models.FileField(upload_to="imports/", blank=True)
+    file_name = models.CharField(max_length=255)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+
+    processed_rows = models.PositiveIntegerField(default=0)
+    inserted = models.PositiveIntegerField(default=0)
+    duplicates = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    error_count = models.PositiveIntegerField(default=0)
+    failure_reason = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed by the worker while the job runs, a stale heartbeat lets another worker take the job over.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} - {self.file_name} ({self.status})"
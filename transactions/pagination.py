@@ -0,0 +1,139 @@
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+NEXT = "next"
+PREVIOUS = "prev"
+
+KEYSET_ORDERING = ("-timestamp", "-transaction_id")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+def encode_cursor(transaction_obj, direction):
+    payload = [transaction_obj.timestamp.isoformat(), str(transaction_obj.transaction_id), direction]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, transaction_id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        position = (datetime.fromisoformat(timestamp), uuid.UUID(transaction_id))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    if direction not in (NEXT, PREVIOUS):
+        raise InvalidCursor(f"Invalid cursor direction: {direction}")
+    return position, direction
+
+
+def keyset_query(queryset, cursor, page_size):
+    """
+    Returns the slice of `queryset` that holds the page at `cursor`, and the cursor's direction.
+
+    The slice fetches one row more than `page_size`, `keyset_result` uses it to tell whether there are more rows.
+
+    Raises:
+        InvalidCursor: If the cursor cannot be decoded.
+    """
+    if cursor is None:
+        return queryset.order_by(*KEYSET_ORDERING)[: page_size + 1], None
+
+    (timestamp, transaction_id), direction = decode_cursor(cursor)
+
+    # The plain range bound on `timestamp` becomes an index condition, so the scan starts at the cursor. The
+    # OR condition alone is only a filter, evaluated on every row from the start of the index.
+    if direction == NEXT:
+        older = Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, transaction_id__lt=transaction_id)
+        queryset = queryset.filter(older, timestamp__lte=timestamp)
+        return queryset.order_by(*KEYSET_ORDERING)[: page_size + 1], direction
+
+    # Walk backwards in ascending order from the cursor, `keyset_result` restores newest-first order.
+    newer = Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, transaction_id__gt=transaction_id)
+    queryset = queryset.filter(newer, timestamp__gte=timestamp)
+    return queryset.order_by("timestamp", "transaction_id")[: page_size + 1], direction
+
+
+def keyset_result(rows, direction, page_size):
+    """
+    Builds the `KeysetPage` from the rows fetched with `keyset_query`.
+    """
+    has_more = len(rows) > page_size
+
+    if direction is None:
+        rows = rows[:page_size]
+        return KeysetPage(rows, encode_cursor(rows[-1], NEXT) if has_more else None, None)
+
+    if direction == NEXT:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1], NEXT) if has_more else None
+        prev_cursor = encode_cursor(rows[0], PREVIOUS) if rows else None
+        return KeysetPage(rows, next_cursor, prev_cursor)
+
+    rows = rows[:page_size][::-1]
+    next_cursor = encode_cursor(rows[-1], NEXT) if rows else None
+    prev_cursor = encode_cursor(rows[0], PREVIOUS) if has_more else None
+    return KeysetPage(rows, next_cursor, prev_cursor)
+
+
+def keyset_page(queryset, cursor, page_size):
+    """
+    Returns one page of `queryset` ordered newest first, positioned by an opaque cursor.
+
+    The cursor holds the (timestamp, transaction_id) of the last row seen, so the next page is a range
+    condition on the ordering columns instead of an OFFSET, and costs the same however deep it is.
+
+    Args:
+        queryset: Filtered `Transaction` queryset, its ordering is replaced.
+        cursor: Cursor from a previous page, or None for the first page.
+        page_size: Maximum number of rows on the page.
+
+    Raises:
+        InvalidCursor: If the cursor cannot be decoded.
+    """
+    rows, direction = keyset_query(queryset, cursor, page_size)
+    return keyset_result(list(rows), direction, page_size)
+
+
+async def akeyset_page(queryset, cursor, page_size):
+    """
+    Async version of `keyset_page`.
+    """
+    rows, direction = keyset_query(queryset, cursor, page_size)
+    return keyset_result([row async for row in rows], direction, page_size)
+
+
+async def apaginate(queryset, page_number, page_size):
+    """
+    Returns the `Page` of `queryset` with the given number, counting and fetching its rows with the async ORM.
+
+    `Paginator` only queries through `count` and the page slice, so the count is filled in up front and the
+    slice is evaluated before the page is returned.
+
+    Args:
+        page_number: Page number as an int or a string, or "last", as accepted by `ListView`.
+
+    Raises:
+        InvalidPage: If the page number is not a number or is out of range.
+    """
+    paginator = Paginator(queryset, page_size)
+    paginator.count = await queryset.acount()
+    if page_number == "last":
+        page_number = paginator.num_pages
+    page = paginator.page(page_number)
+    page.object_list = [row async for row in page.object_list]
+    return page
@@ -0,0 +1,222 @@
+"""
+Monthly range partitioning of the transaction table on PostgreSQL.
+
+The table is partitioned by `timestamp`, one partition per calendar month plus a default partition that
+takes rows outside the created months. PostgreSQL requires the partition key in the primary key, so the
+table's primary key is (transaction_id, timestamp). The model keeps `transaction_id` as its primary key.
+
+Uniqueness of transaction ids across partitions is enforced by the small unpartitioned `ID_TABLE`, which
+row triggers on the transaction table keep in sync: an insert claims the id there, in the same transaction,
+and fails with a unique violation if another row holds it. TRUNCATE of the transaction table empties it,
+dropping or truncating a single partition does not, delete the partition's ids from it as well.
+"""
+
+import re
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+
+from django.utils import timezone
+
+TABLE = "transactions_transaction"
+DEFAULT_PARTITION = f"{TABLE}_default"
+PRIMARY_KEY = f"{TABLE}_pkey"
+ID_TABLE = f"{TABLE}_id"
+ID_FUNCTION = f"{TABLE}_claim_id"
+# Session setting that makes the insert trigger skip rows with a taken id instead of raising, used by the
+# ingest backends, which count skipped rows as duplicates.
+SKIP_DUPLICATE_IDS = "transactions.skip_duplicate_ids"
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y_%m}"
+
+
+def is_partitioned(cursor):
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE])
+    row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def existing_partitions(cursor):
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(%s)",
+        [TABLE],
+    )
+    return {name for (name,) in cursor.fetchall()}
+
+
+def create_month_partition(cursor, month):
+    """
+    Creates the partition of one month, moving rows of that month out of the default partition first.
+
+    PostgreSQL refuses to attach a partition while the default partition holds rows of its range, so the
+    partition is created detached, filled from the default partition and then attached.
+    """
+    name = partition_name(month)
+    start, end = bounds(month)
+    cursor.execute(f'CREATE TABLE "{name}" (LIKE "{TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+        f'INSERT INTO "{name}" SELECT * FROM moved',
+        [start, end],
+    )
+    if has_unique_ids(cursor):
+        # Deleting from the default partition released the ids of the moved rows, the new partition is not
+        # attached yet and has no triggers.
+        cursor.execute(f'INSERT INTO "{ID_TABLE}" (transaction_id) SELECT transaction_id FROM "{name}"')
+    cursor.execute(f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)', [start, end])
+
+
+def bounds(month):
+    """
+    Returns the partition range of a month, cut in UTC so partitions do not depend on the server time zone.
+    """
+    following = add_months(month, 1)
+    start = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    return start, datetime(following.year, following.month, 1, tzinfo=dt_timezone.utc)
+
+
+def ensure_partitions(cursor, first_month, last_month):
+    """
+    Creates the missing monthly partitions from `first_month` to `last_month`, both included.
+
+    Returns:
+        Names of the created partitions.
+    """
+    existing = existing_partitions(cursor)
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        if partition_name(month) not in existing:
+            create_month_partition(cursor, month)
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def has_unique_ids(cursor):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [ID_TABLE])
+    return cursor.fetchone()[0]
+
+
+def enforce_unique_ids(cursor):
+    """
+    Creates `ID_TABLE` from the ids in the transaction table and the triggers that keep it in sync.
+
+    Fails with a unique violation if the table already holds a transaction_id twice.
+    """
+    cursor.execute(f'CREATE TABLE "{ID_TABLE}" (transaction_id uuid PRIMARY KEY)')
+    cursor.execute(f'INSERT INTO "{ID_TABLE}" (transaction_id) SELECT transaction_id FROM "{TABLE}"')
+    cursor.execute(f"""
+        CREATE FUNCTION "{ID_FUNCTION}"() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                TRUNCATE "{ID_TABLE}";
+                RETURN NULL;
+            ELSIF TG_OP = 'DELETE' THEN
+                DELETE FROM "{ID_TABLE}" WHERE transaction_id = OLD.transaction_id;
+                RETURN OLD;
+            END IF;
+            INSERT INTO "{ID_TABLE}" (transaction_id) VALUES (NEW.transaction_id) ON CONFLICT DO NOTHING;
+            IF FOUND THEN
+                RETURN NEW;
+            ELSIF current_setting('{SKIP_DUPLICATE_IDS}', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            RAISE unique_violation USING
+                MESSAGE = format('duplicate transaction_id %s', NEW.transaction_id),
+                TABLE = '{TABLE}',
+                CONSTRAINT = '{ID_TABLE}_pkey';
+        END
+        $$
+    """)
+    # BEFORE row triggers also run when an UPDATE moves a row to another partition, as a delete followed by
+    # an insert, which keeps the id claimed.
+    cursor.execute(
+        f'CREATE TRIGGER "{ID_FUNCTION}" BEFORE INSERT OR DELETE ON "{TABLE}" '
+        f'FOR EACH ROW EXECUTE FUNCTION "{ID_FUNCTION}"()'
+    )
+    cursor.execute(
+        f'CREATE TRIGGER "{ID_FUNCTION}_truncate" AFTER TRUNCATE ON "{TABLE}" '
+        f'FOR EACH STATEMENT EXECUTE FUNCTION "{ID_FUNCTION}"()'
+    )
+
+
+def drop_unique_ids(cursor):
+    cursor.execute(f'DROP TRIGGER IF EXISTS "{ID_FUNCTION}" ON "{TABLE}"')
+    cursor.execute(f'DROP TRIGGER IF EXISTS "{ID_FUNCTION}_truncate" ON "{TABLE}"')
+    cursor.execute(f'DROP FUNCTION IF EXISTS "{ID_FUNCTION}"()')
+    cursor.execute(f'DROP TABLE IF EXISTS "{ID_TABLE}"')
+
+
+def index_definitions(cursor, table):
+    """
+    Returns the CREATE INDEX statements of a table's indexes, without its primary key, rewritten for `TABLE`.
+    """
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s AND indexname <> %s",
+        [table, PRIMARY_KEY],
+    )
+    on_table = re.compile(rf"ON (ONLY )?\S*{re.escape(table)} ")
+    return [on_table.sub(f'ON "{TABLE}" ', indexdef) for (indexdef,) in cursor.fetchall()]
+
+
+def convert_to_partitioned(cursor, months_ahead=3, months_back=24):
+    """
+    Rebuilds the transaction table as a partitioned table, with partitions for the months holding data and
+    `months_ahead` months after the current one.
+
+    Partitions are created at most `months_back` months before the current one, rows outside the created
+    months (e.g. a few mistyped timestamps far in the past or future) stay in the default partition.
+    `manage.py create_transaction_partitions --from` creates older months later. Copies every row, run it
+    in a maintenance window on large tables.
+    """
+    old = f"{TABLE}_unpartitioned"
+    cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{old}"')
+    indexes = index_definitions(cursor, old)
+    cursor.execute(
+        f'CREATE TABLE "{TABLE}" (LIKE "{old}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        'PARTITION BY RANGE ("timestamp")'
+    )
+    cursor.execute(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{TABLE}" DEFAULT')
+
+    cursor.execute(f"""SELECT min("timestamp" AT TIME ZONE 'UTC'), max("timestamp" AT TIME ZONE 'UTC') FROM "{old}\"""")
+    first, last = cursor.fetchone()
+    current = month_start(timezone.now().date())
+    first_month = max(month_start(first.date()) if first else current, add_months(current, -months_back))
+    last_month = add_months(current, months_ahead)
+    ensure_partitions(cursor, min(first_month, current), last_month)
+
+    cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{old}"')
+    cursor.execute(f'DROP TABLE "{old}"')
+    cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{PRIMARY_KEY}" PRIMARY KEY (transaction_id, "timestamp")')
+    for indexdef in indexes:
+        cursor.execute(indexdef)
+    enforce_unique_ids(cursor)
+
+
+def convert_to_plain(cursor):
+    """
+    Rebuilds the partitioned transaction table as a single table with `transaction_id` as primary key.
+    """
+    old = f"{TABLE}_partitioned"
+    drop_unique_ids(cursor)
+    cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{old}"')
+    indexes = index_definitions(cursor, old)
+    cursor.execute(f'CREATE TABLE "{TABLE}" (LIKE "{old}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{old}"')
+    cursor.execute(f'DROP TABLE "{old}" CASCADE')
+    cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{PRIMARY_KEY}" PRIMARY KEY (transaction_id)')
+    for indexdef in indexes:
+        cursor.execute(indexdef)
@@ -0,0 +1,56 @@
+import json
+from datetime import datetime
+
+from django.http import HttpResponse
+
+from transactions.models import TRANSACTION_FIELDS
+
+# Columns to fetch with `values_list(*SERIALIZED_FIELDS)`, in the order `convert_row` converts them.
+SERIALIZED_FIELDS = TRANSACTION_FIELDS
+
+
+def _unchanged(value):
+    return value
+
+
+# Turns each model value into a JSON/CSV primitive.
+FIELD_CONVERTERS = {
+    "transaction_id": str,
+    "timestamp": datetime.isoformat,
+    "amount": str,
+    "currency": _unchanged,
+    "customer_id": str,
+    "product_id": str,
+    "quantity": _unchanged,
+}
+ROW_CONVERTERS = tuple(FIELD_CONVERTERS[name] for name in SERIALIZED_FIELDS)
+
+
+def convert_row(row):
+    """
+    Converts a `values_list(*SERIALIZED_FIELDS)` row to JSON/CSV primitives, in `SERIALIZED_FIELDS` order.
+    """
+    return tuple(convert(value) for convert, value in zip(ROW_CONVERTERS, row))
+
+
+def serialize_row(row):
+    """
+    Returns the API representation of a `values_list(*SERIALIZED_FIELDS)` row.
+
+    Works on plain tuples, no model instance is built, and every value is already a JSON primitive.
+    """
+    return dict(zip(SERIALIZED_FIELDS, convert_row(row)))
+
+
+def serialize_transaction(obj):
+    return serialize_row([getattr(obj, name) for name in SERIALIZED_FIELDS])
+
+
+def json_response(data, status=200):
+    """
+    Returns `data` as a JSON response, byte-identical to `JsonResponse(data)`.
+
+    `data` must only contain JSON primitives. That lets `json.dumps` use its shared C encoder instead of
+    building a `DjangoJSONEncoder` on every call.
+    """
+    return HttpResponse(json.dumps(data), content_type="application/json", status=status)
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from transactions.cache import detail_cache
+from transactions.models import Transaction
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def evict_cached_detail(sender, instance, **kwargs):
+    detail_cache.delete(instance.transaction_id)
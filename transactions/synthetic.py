@@ -0,0 +1,157 @@
+import csv
+import random
+import uuid
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from reports.rollups import rebuild_rollups
+from transactions.ingest import BATCH_BACKEND, COPY_BACKEND, build_transaction, chunked
+from transactions.models import TRANSACTION_FIELDS, Transaction
+
+DEFAULT_CURRENCY_MIX = {"USD": 0.7, "EUR": 0.3}
+QUANTITY_WEIGHTS = (40, 25, 12, 8, 5, 4, 3, 1, 1, 1)
+
+
+def parse_currency_mix(value):
+    """
+    Parses a currency mix such as `USD=0.7,EUR=0.3` into a `{currency: weight}` dict.
+
+    Raises:
+        ValueError: If the value is malformed or names a currency the model does not accept.
+    """
+    allowed = {code for code, _ in Transaction.CURRENCY_CHOICES}
+    mix = {}
+    for part in value.split(","):
+        currency, _, weight = part.partition("=")
+        currency = currency.strip().upper()
+        if currency not in allowed:
+            raise ValueError(f"Currency {currency!r} is not allowed. Allowed currencies: {sorted(allowed)}")
+        mix[currency] = float(weight)
+    if not mix or min(mix.values()) < 0 or sum(mix.values()) <= 0:
+        raise ValueError(f"Invalid currency mix: {value}")
+    return mix
+
+
+def zipf_cum_weights(count, skew):
+    """
+    Cumulative weights of a Zipf distribution over `count` items, `skew` 0 gives a uniform distribution.
+    """
+    return list(accumulate(1 / (rank**skew) for rank in range(1, count + 1)))
+
+
+def generate_rows(
+    rows, customers=1000, products=500, skew=1.1, days=365, end=None, currency_mix=None, seed=0, chunk_size=10000
+):
+    """
+    Yields synthetic transactions as value tuples in `TRANSACTION_FIELDS` order.
+
+    Customers and products are drawn from Zipf distributions, so a few of them own most of the transactions
+    as in production. Timestamps are spread uniformly over the `days` before `end`. The output only depends
+    on the arguments, the same seed always produces the same rows, ids included.
+
+    Args:
+        rows: Number of transactions.
+        customers: Number of distinct customer ids.
+        products: Number of distinct product ids.
+        skew: Zipf exponent of the customer and product distributions.
+        days: Length of the time span in days.
+        end: Aware datetime the span ends at, defaults to midnight of 2025-08-01 in the current time zone.
+        currency_mix: `{currency: weight}`, defaults to `DEFAULT_CURRENCY_MIX`.
+        seed: Random seed.
+        chunk_size: Number of rows drawn at once.
+    """
+    rng = random.Random(seed)
+    end = end or timezone.make_aware(datetime.combine(datetime(2025, 8, 1), time.min))
+    span = timedelta(days=days).total_seconds()
+    start = end - timedelta(days=days)
+    currency_mix = currency_mix or DEFAULT_CURRENCY_MIX
+
+    customer_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(customers)]
+    product_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(products)]
+    customer_weights = zipf_cum_weights(customers, skew)
+    product_weights = zipf_cum_weights(products, skew)
+    currencies, currency_weights = list(currency_mix), list(accumulate(currency_mix.values()))
+    quantities, quantity_weights = range(1, len(QUANTITY_WEIGHTS) + 1), list(accumulate(QUANTITY_WEIGHTS))
+
+    remaining = rows
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        remaining -= size
+        drawn = zip(
+            rng.choices(customer_ids, cum_weights=customer_weights, k=size),
+            rng.choices(product_ids, cum_weights=product_weights, k=size),
+            rng.choices(currencies, cum_weights=currency_weights, k=size),
+            rng.choices(quantities, cum_weights=quantity_weights, k=size),
+        )
+        for customer_id, product_id, currency, quantity in drawn:
+            # Microsecond offsets, so timestamps do not depend on float rounding of the span.
+            timestamp = start + timedelta(microseconds=rng.randrange(int(span * 1_000_000)))
+            amount = Decimal(max(1, round(rng.lognormvariate(8.5, 1.2)))).scaleb(-2)
+            yield (
+                uuid.UUID(int=rng.getrandbits(128), version=4),
+                timestamp,
+                amount,
+                currency,
+                customer_id,
+                product_id,
+                quantity,
+            )
+
+
+def write_csv(rows, file):
+    """
+    Writes value tuples as a CSV file in the upload format, returns the number of rows written.
+    """
+    writer = csv.writer(file)
+    writer.writerow(TRANSACTION_FIELDS)
+    written = 0
+    for values in rows:
+        transaction_id, timestamp, amount, currency, customer_id, product_id, quantity = values
+        writer.writerow((transaction_id, timestamp.isoformat(), amount, currency, customer_id, product_id, quantity))
+        written += 1
+    return written
+
+
+def load_rows(rows, backend=BATCH_BACKEND, batch_size=10000, on_progress=None):
+    """
+    Inserts generated value tuples without validation, then rebuilds the rollups of the days they fall on.
+
+    Generated rows are valid by construction, so they skip the per-row `full_clean()` of the ingest pipeline.
+    Each batch is committed on its own, with `bulk_create` or a COPY straight into the transaction table.
+
+    Returns:
+        Number of rows inserted.
+    """
+    if backend == COPY_BACKEND and connection.vendor != "postgresql":
+        raise ValueError("The COPY backend requires PostgreSQL.")
+
+    inserted = 0
+    first_day = last_day = None
+    table = connection.ops.quote_name(Transaction._meta.db_table)
+    columns = ", ".join((*TRANSACTION_FIELDS, "created_at"))
+
+    for batch in chunked(rows, batch_size):
+        with transaction.atomic():
+            if backend == COPY_BACKEND:
+                created_at = timezone.now()
+                with connection.cursor() as cursor, cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                    for values in batch:
+                        copy.write_row((*values, created_at))
+            else:
+                Transaction.objects.bulk_create([build_transaction(values) for values in batch])
+
+        inserted += len(batch)
+        days = [timezone.localdate(values[1]) for values in batch]
+        first_day = min(first_day or min(days), min(days))
+        last_day = max(last_day or max(days), max(days))
+        if on_progress:
+            on_progress(inserted)
+
+    if inserted:
+        # Also invalidates every cached report.
+        rebuild_rollups(first_day, last_day)
+    return inserted
@@ -0,0 +1,185 @@
+import bz2
+import codecs
+import csv
+import gzip
+import io
+import json
+import lzma
+
+CSV_EXTENSIONS = (".csv", ".csv.gz", ".csv.bz2", ".csv.xz")
+
+# Leading bytes of the compressed formats, and the function opening such a file for streaming decompression.
+COMPRESSION_FORMATS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+
+# Raised while reading a truncated or corrupt compressed file.
+DECOMPRESSION_ERRORS = (EOFError, OSError, lzma.LZMAError)
+
+
+def is_csv_name(name):
+    return name.lower().endswith(CSV_EXTENSIONS)
+
+
+def decompressed(binary_file):
+    """
+    Returns a binary file that reads `binary_file` decompressed when it starts with the magic bytes of gzip,
+    bzip2 or xz, and `binary_file` itself otherwise.
+
+    The format is detected from the content, not the file name. Decompression happens as the returned file
+    is read, the inflated data is never held in memory or on disk as a whole.
+    """
+    magic = binary_file.read(6)
+    binary_file.seek(0)
+    for prefix, open_compressed in COMPRESSION_FORMATS:
+        if magic.startswith(prefix):
+            return open_compressed(binary_file, "rb")
+    return binary_file
+
+
+def csv_rows(binary_file):
+    """
+    Returns a `csv.DictReader` over a binary CSV file, optionally gzip, bzip2 or xz compressed, that is read,
+    decompressed and decoded incrementally.
+
+    `io.TextIOWrapper` decodes the file one buffer at a time, so memory stays flat however large the file is.
+    Works for uploaded files, whether Django kept them in memory or spooled them to a temporary file, and for
+    stored files opened in binary mode.
+    """
+    return csv.DictReader(io.TextIOWrapper(decompressed(binary_file), encoding="utf-8", newline=""))
+
+
+class InvalidJSONBody(ValueError):
+    pass
+
+
+def text_chunks(stream, chunk_size):
+    """
+    Reads a binary stream, e.g. the request, in chunks and yields them decoded as UTF-8, a leading byte order
+    mark is skipped.
+
+    Raises:
+        InvalidJSONBody: If the stream is not valid UTF-8.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    final = False
+    while not final:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        try:
+            text = decoder.decode(chunk, final=final)
+        except UnicodeDecodeError as e:
+            raise InvalidJSONBody(f"Body is not valid UTF-8: {e.reason}.")
+        if text:
+            yield text
+
+
+def json_records(stream, max_record_size, chunk_size=64 * 1024):
+    """
+    Yields the records of a JSON array or of NDJSON (one JSON value per line) read incrementally from a binary
+    stream, only one chunk and the record being parsed are held in memory.
+
+    A body starting with "[" is parsed as an array, anything else as NDJSON, where blank lines are skipped.
+    Numbers are kept as the strings they were written as, the same as values read from a CSV file.
+
+    Raises:
+        InvalidJSONBody: If the body is not valid JSON, or a record is longer than `max_record_size` characters.
+    """
+    chunks = text_chunks(stream, chunk_size)
+    buffer = ""
+    for buffer in chunks:
+        if buffer.strip():
+            break
+    buffer = buffer.lstrip()
+    if buffer.startswith("["):
+        yield from _array_records(buffer[1:], chunks, max_record_size)
+    else:
+        yield from _ndjson_records(buffer, chunks, max_record_size)
+
+
+def _decoder():
+    return json.JSONDecoder(parse_float=str, parse_int=str)
+
+
+def _ndjson_records(buffer, chunks, max_record_size):
+    decoder = _decoder()
+    index = 0
+    position = 0
+    while True:
+        newline = buffer.find("\n", position)
+        if newline == -1:
+            if len(buffer) - position > max_record_size:
+                raise InvalidJSONBody(f"Record {index} is longer than {max_record_size} characters.")
+            chunk = next(chunks, None)
+            if chunk is not None:
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            newline = len(buffer)
+
+        line = buffer[position:newline]
+        position = newline + 1
+        if len(line) > max_record_size:
+            raise InvalidJSONBody(f"Record {index} is longer than {max_record_size} characters.")
+        if line.strip():
+            try:
+                yield decoder.decode(line)
+            except json.JSONDecodeError as e:
+                raise InvalidJSONBody(f"Invalid JSON in record {index}: {e}")
+            index += 1
+        if position > len(buffer):
+            return
+
+
+def _array_records(buffer, chunks, max_record_size):
+    decoder = _decoder()
+    index = 0
+    position = 0
+    expect_value = True
+    while True:
+        # Skip whitespace and the separators between values, reading more of the body when the buffer runs out.
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position == len(buffer):
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise InvalidJSONBody("Unterminated JSON array.")
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        if buffer[position] == "]":
+            if index and expect_value:
+                raise InvalidJSONBody(f"Expected a value after the comma following record {index - 1}.")
+            position += 1
+            if buffer[position:].strip() or any(chunk.strip() for chunk in chunks):
+                raise InvalidJSONBody("Unexpected data after the JSON array.")
+            return
+        if not expect_value:
+            if buffer[position] != ",":
+                raise InvalidJSONBody(f"Expected ',' or ']' after record {index - 1}.")
+            position += 1
+            expect_value = True
+            continue
+
+        # A value is only accepted when something follows it in the buffer, so a number split between two
+        # chunks is never decoded half-read. Every valid array ends with "]".
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            end, error = None, e
+        if end is None or end == len(buffer):
+            if len(buffer) - position > max_record_size:
+                raise InvalidJSONBody(f"Record {index} is longer than {max_record_size} characters.")
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise InvalidJSONBody(f"Invalid JSON in record {index}: {error if end is None else 'unexpected end'}")
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        if end - position > max_record_size:
+            raise InvalidJSONBody(f"Record {index} is longer than {max_record_size} characters.")
+        yield record
+        index += 1
+        position = end
+        expect_value = False
@@ -1,9 +1,38 @@
 from django.urls import URLPattern, path
 
-from .views import TransactionDetailView, TransactionListView, upload_transactions_csv
+from .views import (
+    AsyncTransactionDetailView,
+    AsyncTransactionListView,
+    ImportJobDetailView,
+    TransactionDetailView,
+    TransactionListView,
+    aexport_transactions,
+    bulk_ingest_transactions,
+    detail_cache_stats,
+    export_transactions,
+    lookup_transactions,
+    upload_transactions_csv,
+)
 
 urlpatterns: list[URLPattern] = [
     path("upload/", upload_transactions_csv, name="upload_transactions_csv"),
+    path("bulk/", bulk_ingest_transactions, name="bulk_ingest_transactions"),
+    path("imports/<uuid:job_id>/", ImportJobDetailView.as_view(), name="import_job_detail"),
     path("", TransactionListView.as_view(), name="transactions_list"),
+    path("export/", export_transactions, name="export_transactions"),
+    path("lookup/", lookup_transactions, name="lookup_transactions"),
+    path("cache-stats/", detail_cache_stats, name="transaction_detail_cache_stats"),
     path("<uuid:transaction_id>/", TransactionDetailView.as_view(), name="transaction_detail"),
 ]
+
+# Served by `transaction_system.async_urls` when `ASYNC_VIEWS` is enabled.
+async_urlpatterns: list[URLPattern] = [
+    path("upload/", upload_transactions_csv, name="upload_transactions_csv"),
+    path("bulk/", bulk_ingest_transactions, name="bulk_ingest_transactions"),
+    path("imports/<uuid:job_id>/", ImportJobDetailView.as_view(), name="import_job_detail"),
+    path("", AsyncTransactionListView.as_view(), name="transactions_list"),
+    path("export/", aexport_transactions, name="export_transactions"),
+    path("lookup/", lookup_transactions, name="lookup_transactions"),
+    path("cache-stats/", detail_cache_stats, name="transaction_detail_cache_stats"),
+    path("<uuid:transaction_id>/", AsyncTransactionDetailView.as_view(), name="transaction_detail"),
+]
@@ -1,21 +1,47 @@
-import csv
-import io
+import json
 import uuid
-from datetime import datetime
-from decimal import Decimal
 from logging import getLogger
 
-from django.http import Http404, JsonResponse
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import ListView
 
-from transactions.models import Transaction
+from transactions.cache import detail_cache
+from transactions.export import CONTENT_TYPES, aexport_chunks, export_chunks
+from transactions.filters import filter_transactions
+from transactions.ingest import IngestResult, ingest_rows
+from transactions.models import ImportJob, Transaction
+from transactions.pagination import KEYSET_ORDERING, InvalidCursor, akeyset_page, apaginate, keyset_page
+from transactions.serializers import SERIALIZED_FIELDS, json_response, serialize_row
+from transactions.uploads import DECOMPRESSION_ERRORS, InvalidJSONBody, csv_rows, is_csv_name, json_records
 
 logger = getLogger(__name__)
 
 
+def page_data(page):
+    return {
+        "count": page.paginator.count,
+        "num_pages": page.paginator.num_pages,
+        "current_page": page.number,
+        "has_next": page.has_next(),
+        "has_previous": page.has_previous(),
+        "transactions": [serialize_row(row) for row in page.object_list],
+    }
+
+
+def keyset_page_data(page):
+    return {
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+        "transactions": [serialize_row(row) for row in page.object_list],
+    }
+
+
 class TransactionListView(ListView):
     """
     Returns a paginated list of transactions with optional filtering.
@@ -23,10 +49,19 @@ class TransactionListView(ListView):
     Query Parameters:
         customer_id (str, optional): UUID of the customer to filter transactions.
         product_id (str, optional): UUID of the product to filter transactions.
+        from (str, optional): Start date in YYYY-MM-DD or ISO 8601 format, inclusive.
+        to (str, optional): End date in YYYY-MM-DD (inclusive) or ISO 8601 format (exclusive).
+        min_amount (str, optional): Minimum amount, inclusive.
+        max_amount (str, optional): Maximum amount, inclusive.
+        currency (str, optional): Currency code, e.g. USD.
         page (int, optional): Page number for pagination.
+        cursor (str, optional): Switches to cursor pagination. Pass an empty value for the first page,
+            then `next_cursor` or `prev_cursor` from the previous response.
 
     Pagination:
         Default page size: 50 transactions per page.
+        Transactions are ordered newest first. Cursor pagination does not count rows and every page
+        costs the same, use it to walk through long histories.
 
     Response (200 OK):
         {
@@ -48,43 +83,65 @@ class TransactionListView(ListView):
                 ...
             ]
         }
+
+    Response (200 OK), with cursor:
+        {
+            "next_cursor": str | null,
+            "prev_cursor": str | null,
+            "transactions": [...]
+        }
+
+    Response (400 Bad Request):
+        {
+            "error": "Invalid cursor."
+        }
     """
 
     model = Transaction
     paginate_by = 50
 
     def get_queryset(self):
-        queryset = Transaction.objects.all().order_by("-timestamp")
+        queryset = Transaction.objects.order_by(*KEYSET_ORDERING).values_list(*SERIALIZED_FIELDS, named=True)
+        return filter_transactions(queryset, self.request)
 
-        if customer_id := self.request.GET.get("customer_id"):
-            queryset = queryset.filter(customer_id=customer_id)
-        if product_id := self.request.GET.get("product_id"):
-            queryset = queryset.filter(product_id=product_id)
+    def get(self, request, *args, **kwargs):
+        if "cursor" not in request.GET:
+            return super().get(request, *args, **kwargs)
 
-        return queryset
+        try:
+            page = keyset_page(self.get_queryset(), request.GET["cursor"] or None, self.paginate_by)
+        except InvalidCursor as e:
+            logger.warning(str(e))
+            return JsonResponse({"error": "Invalid cursor."}, status=400)
+
+        return json_response(keyset_page_data(page))
 
     def render_to_response(self, context, **response_kwargs):
-        page = context["page_obj"]
-        data = {
-            "count": page.paginator.count,
-            "num_pages": page.paginator.num_pages,
-            "current_page": page.number,
-            "has_next": page.has_next(),
-            "has_previous": page.has_previous(),
-            "transactions": [
-                {
-                    "transaction_id": str(obj.transaction_id),
-                    "timestamp": obj.timestamp.isoformat(),
-                    "amount": str(obj.amount),
-                    "currency": obj.currency,
-                    "customer_id": str(obj.customer_id),
-                    "product_id": str(obj.product_id),
-                    "quantity": obj.quantity,
-                }
-                for obj in page.object_list
-            ],
-        }
-        return JsonResponse(data, **response_kwargs)
+        return json_response(page_data(context["page_obj"]), **response_kwargs)
+
+
+class AsyncTransactionListView(TransactionListView):
+    """
+    Async version of `TransactionListView`, served when `ASYNC_VIEWS` is enabled.
+
+    Accepts the same query parameters and returns the same responses, rows are counted and fetched with
+    the async ORM.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        if "cursor" in request.GET:
+            try:
+                page = await akeyset_page(self.get_queryset(), request.GET["cursor"] or None, self.paginate_by)
+            except InvalidCursor as e:
+                logger.warning(str(e))
+                return JsonResponse({"error": "Invalid cursor."}, status=400)
+            return json_response(keyset_page_data(page))
+
+        try:
+            page = await apaginate(self.get_queryset(), request.GET.get(self.page_kwarg) or 1, self.paginate_by)
+        except InvalidPage as e:
+            raise Http404(f"Invalid page: {e}")
+        return json_response(page_data(page))
 
 
 class TransactionDetailView(View):
@@ -107,24 +164,314 @@ class TransactionDetailView(View):
 
     Response (404 Not Found):
         Returned if the transaction with the specified UUID does not exist.
+
+    Notes:
+        - Responses are kept in an in-process LRU cache (`TRANSACTIONS_DETAIL_CACHE_SIZE`/`_TTL`),
+          misses fall through to the database. Missing transactions are not cached.
     """
 
     def get(self, request, *args, **kwargs):
         transaction_id = kwargs["transaction_id"]
+        if (data := detail_cache.get(transaction_id)) is not None:
+            return json_response(data)
+
         try:
-            transaction = Transaction.objects.get(transaction_id=transaction_id)
+            row = Transaction.objects.values_list(*SERIALIZED_FIELDS).get(transaction_id=transaction_id)
         except Transaction.DoesNotExist:
             logger.warning(f"Transaction with id={transaction_id} not found")
             raise Http404("Transaction not found")
 
+        data = serialize_row(row)
+        detail_cache.set(transaction_id, data)
+        return json_response(data)
+
+
+class AsyncTransactionDetailView(View):
+    """
+    Async version of `TransactionDetailView`, served when `ASYNC_VIEWS` is enabled.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        transaction_id = kwargs["transaction_id"]
+        if (data := detail_cache.get(transaction_id)) is not None:
+            return json_response(data)
+
+        try:
+            row = await Transaction.objects.values_list(*SERIALIZED_FIELDS).aget(transaction_id=transaction_id)
+        except Transaction.DoesNotExist:
+            logger.warning(f"Transaction with id={transaction_id} not found")
+            raise Http404("Transaction not found")
+
+        data = serialize_row(row)
+        detail_cache.set(transaction_id, data)
+        return json_response(data)
+
+
+@require_GET
+def export_transactions(request):
+    """
+    Streams all transactions matching the filters as CSV or NDJSON.
+
+    Query Parameters:
+        format (str, optional): `csv` (default) or `ndjson`.
+        customer_id, product_id, from, to, min_amount, max_amount, currency: Same filters as the list view.
+
+    Response (200 OK):
+        CSV with a `transaction_id,timestamp,amount,currency,customer_id,product_id,quantity` header,
+        or one JSON object per line with the same fields as the list view. Transactions are ordered newest first.
+
+    Response (400 Bad Request):
+        {
+            "error": "Unsupported format: <format>"
+        }
+
+    Notes:
+        - Rows are read from a server-side cursor in chunks of `TRANSACTIONS_EXPORT_CHUNK_SIZE` and sent as
+          they are read, the response starts right away and memory use does not grow with the export size.
+    """
+    return export_response(request, export_chunks)
+
+
+@require_GET
+async def aexport_transactions(request):
+    """
+    Async version of `export_transactions`, served when `ASYNC_VIEWS` is enabled.
+
+    Accepts the same query parameters and returns the same responses, the streaming body is an async
+    iterator so ASGI sends each chunk as it is read.
+    """
+    return export_response(request, aexport_chunks)
+
+
+def export_response(request, chunks):
+    export_format = request.GET.get("format", "csv").lower()
+    if export_format not in CONTENT_TYPES:
+        return JsonResponse({"error": f"Unsupported format: {export_format}"}, status=400)
+
+    queryset = filter_transactions(Transaction.objects.order_by(*KEYSET_ORDERING), request)
+    response = StreamingHttpResponse(
+        chunks(queryset, export_format, settings.TRANSACTIONS_EXPORT_CHUNK_SIZE),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    response["Content-Disposition"] = f'attachment; filename="transactions.{export_format}"'
+    return response
+
+
+@csrf_exempt
+@require_POST
+def lookup_transactions(request):
+    """
+    Returns many transactions by their UUIDs in a single call.
+
+    Request:
+        JSON body:
+            {
+                "transaction_ids": [str, ...]   # At most `TRANSACTIONS_LOOKUP_MAX_IDS` UUIDs
+            }
+
+    Response (200 OK):
+        {
+            "transactions": [
+                {
+                    "transaction_id": str,
+                    "timestamp": str (ISO 8601),
+                    "amount": str,
+                    "currency": str,
+                    "customer_id": str,
+                    "product_id": str,
+                    "quantity": int
+                },
+                ...
+            ],
+            "missing": [str, ...]
+        }
+
+    Response (400 Bad Request):
+        {
+            "error": str
+        }
+
+    Notes:
+        - Transactions are returned in request order, repeated ids are returned once.
+        - Ids found in the detail cache are served from it, the rest are fetched with a single
+          `WHERE transaction_id IN (...)` query and added to the cache.
+    """
+    try:
+        payload = json.loads(request.body)
+        raw_ids = payload["transaction_ids"]
+    except (ValueError, TypeError, KeyError):
+        return JsonResponse({"error": "Body must be a JSON object with a transaction_ids list."}, status=400)
+    if not isinstance(raw_ids, list):
+        return JsonResponse({"error": "transaction_ids must be a list."}, status=400)
+
+    max_ids = settings.TRANSACTIONS_LOOKUP_MAX_IDS
+    if len(raw_ids) > max_ids:
+        return JsonResponse({"error": f"At most {max_ids} transaction ids can be requested at once."}, status=400)
+
+    try:
+        transaction_ids = list(dict.fromkeys(uuid.UUID(str(raw_id)) for raw_id in raw_ids))
+    except ValueError as e:
+        return JsonResponse({"error": f"Invalid transaction id: {e}"}, status=400)
+
+    found = {}
+    for transaction_id in transaction_ids:
+        if (data := detail_cache.get(transaction_id)) is not None:
+            found[transaction_id] = data
+
+    if uncached := [transaction_id for transaction_id in transaction_ids if transaction_id not in found]:
+        for row in Transaction.objects.filter(transaction_id__in=uncached).values_list(*SERIALIZED_FIELDS):
+            found[row[0]] = data = serialize_row(row)
+            detail_cache.set(row[0], data)
+
+    return json_response(
+        {
+            "transactions": [found[transaction_id] for transaction_id in transaction_ids if transaction_id in found],
+            "missing": [str(transaction_id) for transaction_id in transaction_ids if transaction_id not in found],
+        }
+    )
+
+
+@require_GET
+def detail_cache_stats(request):
+    """
+    Returns the transaction detail cache counters of the process that serves the request.
+
+    Response (200 OK):
+        {
+            "size": int,
+            "maxsize": int,
+            "ttl": float,
+            "hits": int,
+            "misses": int,
+            "evictions": int,
+            "hit_ratio": float | null
+        }
+    """
+    return JsonResponse(detail_cache.stats())
+
+
+@csrf_exempt
+@require_POST
+def bulk_ingest_transactions(request):
+    """
+    Creates transactions from structured records sent as the request body, without a CSV round trip.
+
+    Request:
+        Body with either a JSON array of transaction objects, or NDJSON with one transaction object per line:
+            {
+                "transaction_id": str,
+                "timestamp": str (ISO 8601),
+                "amount": str | number,
+                "currency": str,
+                "customer_id": str,
+                "product_id": str,
+                "quantity": int | str
+            }
+
+    Response (201 Created):
+        {
+            "received": int,        # Number of records in the body
+            "inserted": int,
+            "duplicates": int,      # Records skipped because their transaction_id already exists or repeats
+            "errors": [             # One entry per rejected record, accepted records are only counted
+                {
+                    "index": int,   # Position of the record in the body, from 0
+                    "record": dict,
+                    "error": str
+                },
+                ...
+            ]
+        }
+
+    Response (400 Bad Request):
+        {
+            "error": str,           # The body is not valid JSON from this point on
+            "received": int,        # Counts and errors of the records that were stored before the error,
+            "inserted": int,        # in batches committed by the batch backend, always 0 with COPY, which
+            "duplicates": int,      # loads the whole body in one transaction
+            "errors": [...]
+        }
+
+    Notes:
+        - Records are validated and inserted by the same pipeline as CSV uploads, in batches of
+          `TRANSACTIONS_UPLOAD_BATCH_SIZE` by the `TRANSACTIONS_INGEST_BACKEND` backend.
+        - The body is read and parsed as a stream, so its size is not limited by `DATA_UPLOAD_MAX_MEMORY_SIZE`.
+          A single record may be at most `TRANSACTIONS_BULK_MAX_RECORD_SIZE` characters long.
+        - Numbers are read as written, amounts are not rounded through floats.
+    """
+    records = json_records(request, settings.TRANSACTIONS_BULK_MAX_RECORD_SIZE)
+    committed = IngestResult()
+
+    def record_progress(result):
+        nonlocal committed
+        committed = result
+
+    try:
+        result = ingest_rows(records, first_line=0, on_progress=record_progress)
+    except InvalidJSONBody as e:
+        return JsonResponse({"error": str(e), **bulk_ingest_summary(committed)}, status=400)
+    return JsonResponse(bulk_ingest_summary(result), status=201)
+
+
+def bulk_ingest_summary(result):
+    return {
+        "received": result.processed,
+        "inserted": result.inserted,
+        "duplicates": result.duplicates,
+        "errors": [
+            {"index": error["line"], "record": error["row"], "error": error["error"]} for error in result.errors
+        ],
+    }
+
+
+class ImportJobDetailView(View):
+    """
+    Returns the progress of a background CSV import started with `upload/?async=true`.
+
+    Path Parameters:
+        job_id (str): UUID of the import job.
+
+    Response (200 OK):
+        {
+            "job_id": str,
+            "file_name": str,
+            "status": str,              # pending | running | succeeded | failed
+            "processed_rows": int,
+            "inserted": int,
+            "duplicates": int,          # Rows whose transaction_id already existed or repeated in the file
+            "errors": [{"line": int, "row": dict, "error": str}, ...],  # First IMPORT_JOB_PROGRESS_ERRORS while running
+            "error_count": int,
+            "failure_reason": str,
+            "created_at": str (ISO 8601),
+            "started_at": str | null (ISO 8601),
+            "finished_at": str | null (ISO 8601)
+        }
+
+    Response (404 Not Found):
+        Returned if the job with the specified UUID does not exist.
+    """
+
+    def get(self, request, *args, **kwargs):
+        job_id = kwargs["job_id"]
+        try:
+            job = ImportJob.objects.get(job_id=job_id)
+        except ImportJob.DoesNotExist:
+            logger.warning(f"Import job with id={job_id} not found")
+            raise Http404("Import job not found")
+
         data = {
-            "transaction_id": str(transaction.transaction_id),
-            "timestamp": transaction.timestamp.isoformat(),
-            "amount": str(transaction.amount),
-            "currency": transaction.currency,
-            "customer_id": str(transaction.customer_id),
-            "product_id": str(transaction.product_id),
-            "quantity": transaction.quantity,
+            "job_id": str(job.job_id),
+            "file_name": job.file_name,
+            "status": job.status,
+            "processed_rows": job.processed_rows,
+            "inserted": job.inserted,
+            "duplicates": job.duplicates,
+            "errors": job.errors,
+            "error_count": job.error_count,
+            "failure_reason": job.failure_reason,
+            "created_at": job.created_at.isoformat(),
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
         }
         return JsonResponse(data)
 
@@ -137,7 +484,12 @@ def upload_transactions_csv(request):
 
     Request:
         Multipart form-data with a single field:
-            file: CSV file containing transaction data.
+            file: CSV file containing transaction data, optionally compressed with gzip, bzip2 or xz
+                (`.csv`, `.csv.gz`, `.csv.bz2` or `.csv.xz`).
+
+    Query Parameters:
+        async (bool, optional): Store the file and import it in the background worker instead of
+            inside the request. Defaults to `TRANSACTIONS_UPLOAD_ASYNC`.
 
     CSV Format:
         The CSV must contain the following headers:
@@ -152,6 +504,7 @@ def upload_transactions_csv(request):
     Response (201 Created):
         {
             "inserted": int,        # Number of successfully inserted transactions
+            "duplicates": int,      # Rows skipped because their transaction_id already exists or repeats in the file
             "errors": [
                 {
                     "line": int,
@@ -162,6 +515,13 @@ def upload_transactions_csv(request):
             ]
         }
 
+    Response (202 Accepted), in async mode:
+        {
+            "job_id": str,
+            "status": "pending",
+            "status_url": str       # Poll for progress, see `ImportJobDetailView`
+        }
+
     Response (400 Bad Request):
         {
             "error": "No file provided."
@@ -170,52 +530,49 @@ def upload_transactions_csv(request):
         {
             "error": "File is not CSV."
         }
+        or
+        {
+            "error": "Invalid compressed file: <reason>"
+        }
 
     Notes:
         - Each valid row in the CSV will be inserted as a `Transaction` record.
+        - Rows are validated and inserted by the `TRANSACTIONS_INGEST_BACKEND` backend: batches of
+          `TRANSACTIONS_UPLOAD_BATCH_SIZE` rows with a single multi-row INSERT each ("batch"),
+          or a PostgreSQL COPY into a staging table merged with one INSERT ... SELECT ("copy").
         - Rows with errors will be logged and returned in the `errors` array with details.
+        - Uploads are idempotent: rows whose transaction_id already exists, or appeared earlier in the file,
+          are skipped and only counted in `duplicates`, so an overlapping file can be uploaded again.
         - CSV processing continues even if some rows fail, inserting as many valid rows as possible.
+        - The file is read and parsed incrementally, memory use does not grow with the file size.
+        - Compression is detected from the file's first bytes and the file is decompressed while it is parsed.
+          When a compressed file turns out to be corrupt, batches inserted before the corrupt part are kept.
     """
     if "file" not in request.FILES:
         return JsonResponse({"error": "No file provided."}, status=400)
 
     csv_file = request.FILES["file"]
-    if not csv_file.name.endswith(".csv"):
+    if not is_csv_name(csv_file.name):
         return JsonResponse({"error": "File is not CSV."}, status=400)
 
-    decoded_file = csv_file.read().decode("utf-8")
-    io_string = io.StringIO(decoded_file)
-    reader = csv.DictReader(io_string)
-
-    transactions_inserted = 0
-    errors = []
-    line_number = 1
-
-    for row in reader:
-        line_number += 1
-        try:
-            transaction_id = uuid.UUID(row["transaction_id"])
-            timestamp = datetime.fromisoformat(row["timestamp"])
-            amount = Decimal(row["amount"])
-            currency = row["currency"].strip().upper()
-            customer_id = uuid.UUID(row["customer_id"])
-            product_id = uuid.UUID(row["product_id"])
-            quantity = int(row["quantity"])
-
-            transaction = Transaction(
-                transaction_id=transaction_id,
-                timestamp=timestamp,
-                amount=amount,
-                currency=currency,
-                customer_id=customer_id,
-                product_id=product_id,
-                quantity=quantity,
-            )
-            transaction.full_clean()
-            transaction.save()
-            transactions_inserted += 1
-        except Exception as e:
-            errors.append({"line": line_number, "row": row, "error": str(e)})
-            logger.error(f"Błąd podczas przetwarzania CSV w linii {line_number} | row={row} | error={e}")
-
-    return JsonResponse({"inserted": transactions_inserted, "errors": errors}, status=201)
+    run_async = request.GET.get("async", str(settings.TRANSACTIONS_UPLOAD_ASYNC)).lower() in ("1", "true")
+    if run_async:
+        job = ImportJob.objects.create(file=csv_file, file_name=csv_file.name)
+        return JsonResponse(
+            {
+                "job_id": str(job.job_id),
+                "status": job.status,
+                "status_url": reverse("import_job_detail", args=[job.job_id]),
+            },
+            status=202,
+        )
+
+    try:
+        result = ingest_rows(csv_rows(csv_file))
+    except DECOMPRESSION_ERRORS as e:
+        logger.warning(f"Upload of {csv_file.name} failed to decompress: {e}")
+        return JsonResponse({"error": f"Invalid compressed file: {e}"}, status=400)
+
+    return JsonResponse(
+        {"inserted": result.inserted, "duplicates": result.duplicates, "errors": result.errors}, status=201
+    )